@@ -7,8 +7,15 @@ import os
 from llama_index.readers.file.flat.base import FlatReader
 
 from lightspeed_rag_content import utils
+from lightspeed_rag_content.file_selection import (
+    DEFAULT_DISTRO,
+    FileSelector,
+    read_exclude_file,
+    topic_map_files,
+)
 from lightspeed_rag_content.metadata_processor import MetadataProcessor
 from lightspeed_rag_content.document_processor import DocumentProcessor
+from lightspeed_rag_content.progress import Progress
 
 logging.basicConfig(
     level=logging.WARNING,
@@ -54,6 +61,36 @@ if __name__ == "__main__":
     parser.add_argument(
         "-v", "--ocp-version", help="OCP version", default=OCP_DOCS_VERSION
     )
+    parser.add_argument(
+        "--ocp-versions",
+        nargs="+",
+        default=None,
+        help="Build a single index for these OCP versions, the folder must "
+        "contain a subfolder per version",
+    )
+    parser.add_argument(
+        "--topic-map",
+        default=None,
+        help="Only load the documents listed by this topic map, {version} is "
+        "replaced by the OCP version",
+    )
+    parser.add_argument(
+        "--distro",
+        default=DEFAULT_DISTRO,
+        help="Distro of the topics loaded from the topic map",
+    )
+    parser.add_argument(
+        "--exclude-file",
+        default=None,
+        help="File with glob patterns of the documents not to load, "
+        "e.g. config/exclude.conf",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=0,
+        help="Skip the documents larger than this size in bytes",
+    )
     args = parser.parse_args()
     print(f"Arguments used: {args}")
 
@@ -69,23 +106,49 @@ if __name__ == "__main__":
     if RUNBOOKS_ROOT_DIR.endswith("/"):
         RUNBOOKS_ROOT_DIR = RUNBOOKS_ROOT_DIR[:-1]
 
-    # Instantiate Metadata Processor
-    print("Instantiate Metadata Processor")
-    metadata_processor = OpenshiftDocsMetadata(
-        EMBEDDINGS_ROOT_DIR, args.ocp_version)
-
     runbooks_metadata_processor = OpenshiftRunbooksMetadata(RUNBOOKS_ROOT_DIR)
 
+    exclude = read_exclude_file(args.exclude_file) if args.exclude_file else None
+
     # Instantiate Document Processor
     print("Instantiate Document Processor")
     document_processor = DocumentProcessor(
         args.chunk, args.overlap, args.model_name, args.model_dir, args.workers,
         args.vector_store_type, args.index.replace("-", "_"),
+        args.embedding_backend, args.onnx_file,
+        args.checkpoint_batch_size, args.resume, args.pipelined,
+        args.dimension_reduction, args.reduced_dimension, args.binary_index,
+        args.export_format, publish=args.publish,
+        compact_nodes=args.compact_nodes, document_index=args.document_index,
+        progress=Progress(args.progress_file, args.progress_format,
+                          args.progress_interval),
+        reproducible=args.reproducible,
     )
 
-    # Process OpenShift documents
-    print("Process OpenShift documents")
-    document_processor.process(args.folder, metadata=metadata_processor)
+    # Process OpenShift documents, chunks shared by several versions are
+    # stored once
+    for version in args.ocp_versions or [args.ocp_version]:
+        print(f"Process OpenShift {version} documents")
+        docs_dir = EMBEDDINGS_ROOT_DIR
+        if args.ocp_versions:
+            docs_dir = os.path.join(EMBEDDINGS_ROOT_DIR, version)
+        metadata_processor = OpenshiftDocsMetadata(docs_dir, version)
+        # Select the files up front, instead of loading the whole folder
+        selector = None
+        if args.topic_map or exclude or args.max_file_size:
+            topic_files = None
+            if args.topic_map:
+                topic_files = topic_map_files(
+                    args.topic_map.format(version=version), args.distro)
+            selector = FileSelector(topic_files, exclude=exclude,
+                                    max_size=args.max_file_size)
+        document_processor.process(
+            docs_dir,
+            metadata=metadata_processor,
+            version=version if args.ocp_versions else None,
+            selector=selector)
+        for stage in document_processor.pipeline_metrics:
+            print(f"Pipeline stage metrics: {stage}")
 
     # Process Runbooks
     print("Process Runbooks")
@@ -94,6 +157,8 @@ if __name__ == "__main__":
         metadata=runbooks_metadata_processor,
         required_exts=[".md",],
         file_extractor={".md": FlatReader()})
+    for stage in document_processor.pipeline_metrics:
+        print(f"Pipeline stage metrics: {stage}")
 
     # Save to the output directory
     document_processor.save(args.index, PERSIST_FOLDER)
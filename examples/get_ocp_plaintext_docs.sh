@@ -1,17 +1,27 @@
 #!/bin/bash
 set -eou pipefail
 
-OCP_VERSION=$1
+# One or more OCP versions, converted by a single run sharing its workers
+OCP_VERSIONS=("$@")
 
-trap "rm -rf openshift-docs" EXIT
+trap "rm -rf openshift-docs-*" EXIT
 
-rm -rf ocp-product-docs-plaintext/${OCP_VERSION}
+JOBS=()
+for OCP_VERSION in "${OCP_VERSIONS[@]}"; do
+    rm -rf ocp-product-docs-plaintext/${OCP_VERSION} openshift-docs-${OCP_VERSION}
+    git clone --single-branch --branch enterprise-${OCP_VERSION} https://github.com/openshift/openshift-docs.git openshift-docs-${OCP_VERSION}
+    JOBS+=(-j openshift-docs-${OCP_VERSION}:openshift-docs-${OCP_VERSION}/_topic_maps/_topic_map.yml:openshift-enterprise:ocp-product-docs-plaintext/${OCP_VERSION}:scripts/asciidoctor-text/${OCP_VERSION}/attributes.yaml)
+done
 
-git clone --single-branch --branch enterprise-${OCP_VERSION} https://github.com/openshift/openshift-docs.git
+python scripts/asciidoctor-text/convert-it-all.py "${JOBS[@]}"
 
-python scripts/asciidoctor-text/convert-it-all.py -i openshift-docs -t openshift-docs/_topic_maps/_topic_map.yml \
-    -d openshift-enterprise -o ocp-product-docs-plaintext/${OCP_VERSION} -a scripts/asciidoctor-text/${OCP_VERSION}/attributes.yaml
+for OCP_VERSION in "${OCP_VERSIONS[@]}"; do
+    # Keep the topic map, the embeddings can then be generated for its files only.
+    # It is kept out of ocp-product-docs-plaintext, whose folders are the versions.
+    mkdir -p ocp-product-docs-topic-maps
+    cp openshift-docs-${OCP_VERSION}/_topic_maps/_topic_map.yml ocp-product-docs-topic-maps/${OCP_VERSION}.yml
 
-for f in $(cat config/exclude.conf); do
-    rm ocp-product-docs-plaintext/${OCP_VERSION}/$f
+    for f in $(cat config/exclude.conf); do
+        rm ocp-product-docs-plaintext/${OCP_VERSION}/$f
+    done
 done
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Utility script to compare chunking and index settings."""
+
+import itertools
+import json
+import logging
+import os
+
+from llama_index.readers.file.flat.base import FlatReader
+
+from generate_embeddings_openshift import (
+    OCP_DOCS_VERSION,
+    OpenshiftDocsMetadata,
+    OpenshiftRunbooksMetadata,
+)
+from lightspeed_rag_content import utils
+from lightspeed_rag_content.document_processor import DocumentProcessor
+from lightspeed_rag_content.sweep import Sweep, parse_index_type
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+
+if __name__ == "__main__":
+    parser = utils.get_common_arg_parser()
+    parser.add_argument("-r", "--runbooks", help="Runbooks folder path")
+    parser.add_argument(
+        "-v", "--ocp-version", help="OCP version", default=OCP_DOCS_VERSION
+    )
+    parser.add_argument(
+        "--chunk-sizes", type=int, nargs="+", default=[380],
+        help="Chunk sizes to compare"
+    )
+    parser.add_argument(
+        "--overlaps", type=int, nargs="+", default=[0],
+        help="Chunk overlaps to compare"
+    )
+    parser.add_argument(
+        "--index-types", nargs="+", default=["flat"],
+        help="Index types to compare: flat, binary, pca:<dim> or "
+        "matryoshka:<dim>"
+    )
+    parser.add_argument(
+        "--queries",
+        help="JSON file with a list of {\"query\": ..., \"expected\": [...]}, "
+        "expected being paths of relevant documents relative to the folders"
+    )
+    parser.add_argument(
+        "-k", "--top-k", type=int, default=5,
+        help="Number of results used to measure the recall"
+    )
+    parser.add_argument(
+        "--sweep-workers", type=int, default=None,
+        help="Number of chunking settings processed concurrently"
+    )
+    args = parser.parse_args()
+    print(f"Arguments used: {args}")
+
+    for index_type in args.index_types:
+        parse_index_type(index_type)
+
+    EMBEDDINGS_ROOT_DIR = os.path.abspath(args.folder)
+
+    queries = []
+    if args.queries:
+        with open(args.queries) as file:
+            queries = json.load(file)
+
+    document_processor = DocumentProcessor(
+        args.chunk_sizes[0], args.overlaps[0], args.model_name,
+        args.model_dir, args.workers,
+        embedding_backend=args.embedding_backend, onnx_file=args.onnx_file,
+    )
+    sweep = Sweep(document_processor, queries, args.top_k,
+                  args.sweep_workers)
+
+    # Documents are loaded and their URLs checked once for all settings
+    print("Load OpenShift documents")
+    sweep.add_documents(
+        EMBEDDINGS_ROOT_DIR,
+        OpenshiftDocsMetadata(EMBEDDINGS_ROOT_DIR, args.ocp_version))
+    if args.runbooks:
+        print("Load Runbooks")
+        RUNBOOKS_ROOT_DIR = os.path.abspath(args.runbooks)
+        sweep.add_documents(
+            RUNBOOKS_ROOT_DIR,
+            OpenshiftRunbooksMetadata(RUNBOOKS_ROOT_DIR),
+            required_exts=[".md",],
+            file_extractor={".md": FlatReader()})
+
+    results = sweep.run(
+        list(itertools.product(args.chunk_sizes, args.overlaps)),
+        args.index_types)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        with open(os.path.join(args.output, "sweep.json"), "w") as file:
+            file.write(report)
+    print(report)
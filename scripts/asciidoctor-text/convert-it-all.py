@@ -6,17 +6,37 @@ import argparse
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 import yaml
 
 
+@dataclass
+class Job:
+    """Conversion of the assemblies of a topic map for a distro."""
+
+    input_dir: str
+    topic_map: str
+    distro: str
+    output_dir: str
+    attributes: str | None = None
+    converted: int = 0
+    failures: list[tuple[str, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+
 def node_in_distro(node: dict, distro: str) -> bool:
     """Check if a node is in a distro."""
     return node.get("Distros", "") == "" or distro in node.get("Distros", "").split(",")
 
 
-def process_node(node: dict, distro: str, dir: str = "", file_list: list = []) -> list:
+def process_node(
+    node: dict, distro: str, dir: str = "", file_list: list | None = None
+) -> list:
     """Process YAML node from the topic map."""
+    file_list = [] if file_list is None else file_list
     currentdir = dir
     if "Topics" in node:
         if node_in_distro(node, distro):
@@ -31,6 +51,129 @@ def process_node(node: dict, distro: str, dir: str = "", file_list: list = []) -
     return file_list
 
 
+def parse_job(spec: str) -> Job:
+    """Parse a INPUT_DIR:TOPIC_MAP:DISTRO:OUTPUT_DIR[:ATTRIBUTES] job specification."""
+    parts = spec.split(":")
+    if len(parts) not in (4, 5):
+        raise argparse.ArgumentTypeError(
+            f"Invalid job {spec}, expected INPUT_DIR:TOPIC_MAP:DISTRO:OUTPUT_DIR[:ATTRIBUTES]"
+        )
+    return Job(*parts)
+
+
+class SharedInputs:
+    """Topic maps and attribute files, each parsed once for all the jobs."""
+
+    def __init__(self) -> None:
+        """Start without any parsed topic map or attribute file."""
+        self._topic_maps: dict[str, list[dict]] = {}
+        self._files: dict[tuple[str, str], list[str]] = {}
+        self._attributes: dict[str | None, list[str]] = {None: []}
+
+    def files(self, topic_map: str, distro: str) -> list[str]:
+        """Return the files of a topic map in a distro, without extension."""
+        path = os.path.normpath(os.path.join(os.getcwd(), topic_map))
+        if path not in self._topic_maps:
+            with open(path, "r") as fin:
+                self._topic_maps[path] = [
+                    node for node in yaml.safe_load_all(fin) if node
+                ]
+        if (path, distro) not in self._files:
+            file_list: list[str] = []
+            for node in self._topic_maps[path]:
+                file_list = process_node(node, distro, file_list=file_list)
+            self._files[path, distro] = file_list
+        return self._files[path, distro]
+
+    def attributes(self, attributes: str | None) -> list[str]:
+        """Return the asciidoctor options setting the attributes of a file."""
+        if attributes is not None:
+            attributes = os.path.normpath(os.path.join(os.getcwd(), attributes))
+        if attributes not in self._attributes:
+            with open(attributes, "r") as fin:
+                values = yaml.safe_load(fin)
+            attribute_list: list[str] = []
+            for key, value in values.items():
+                attribute_list = [*attribute_list, "-a", key + "=%s" % value]
+            self._attributes[attributes] = attribute_list
+        return self._attributes[attributes]
+
+
+def convert(command: list[str]) -> tuple[str | None, float]:
+    """Run a conversion, return its error output if it failed and when it ended."""
+    result = subprocess.run(  # noqa: S603
+        command, check=False, capture_output=True, text=True
+    )
+    error = None
+    if result.returncode != 0:
+        output = result.stderr or result.stdout
+        error = output.strip() or f"exit code {result.returncode}"
+    return error, time.perf_counter()
+
+
+def run_jobs(jobs: list[Job], workers: int) -> None:
+    """Convert the files of all the jobs with a shared pool of workers.
+
+    Every conversion is an asciidoctor process, the threads of the pool only
+    wait for them. Files of all the jobs are queued at once, so the workers
+    stay busy until the last file of the largest job is converted.
+    """
+    shared = SharedInputs()
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    converter_file = os.path.join(script_dir, "text-converter.rb")
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for job in jobs:
+            attribute_list = shared.attributes(job.attributes)
+            output_dir = os.path.normpath(job.output_dir)
+            os.makedirs(output_dir, exist_ok=True)
+            input_dir = os.path.normpath(job.input_dir)
+            for filename in shared.files(job.topic_map, job.distro):
+                output_file = os.path.join(output_dir, filename + ".txt")
+                os.makedirs(
+                    os.path.dirname(os.path.realpath(output_file)), exist_ok=True
+                )
+                input_file = os.path.join(input_dir, filename + ".adoc")
+                print("Processing: " + input_file)
+                command = [
+                    "asciidoctor",
+                    *attribute_list,
+                    "-r",
+                    converter_file,
+                    "-b",
+                    "text",
+                    "-o",
+                    output_file,
+                    "--trace",
+                    "--quiet",
+                    input_file,
+                ]
+                futures.append((job, input_file, executor.submit(convert, command)))
+
+        for job, input_file, future in futures:
+            error, end = future.result()
+            if error is None:
+                job.converted += 1
+            else:
+                print(f"Failed: {input_file}\n{error}")
+                job.failures.append((input_file, error))
+            job.seconds = max(job.seconds, end - start)
+
+
+def print_summary(jobs: list[Job]) -> None:
+    """Print the converted and failed files of every job."""
+    print("Summary:")
+    for job in jobs:
+        print(
+            f"{job.output_dir} ({job.distro}): {job.converted} converted, "
+            f"{len(job.failures)} failed, done after {job.seconds:.1f}s"
+        )
+        for input_file, _ in job.failures:
+            print(f"  failed: {input_file}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="This command converts the openshift-docs assemblies to plain text.",
@@ -40,68 +183,60 @@ if __name__ == "__main__":
     parser.add_argument(
         "--input-dir",
         "-i",
-        required=True,
         help="The input directory for the openshift-docs repo",
     )
-    parser.add_argument("--topic-map", "-t", required=True, help="The topic map file")
+    parser.add_argument("--topic-map", "-t", help="The topic map file")
     parser.add_argument(
         "--distro",
         "-d",
-        required=True,
         help="OpenShift distro the docs are for, ex. openshift-enterprise",
     )
+    parser.add_argument("--output-dir", "-o", help="The output directory for text")
     parser.add_argument(
-        "--output-dir", "-o", required=True, help="The output directory for text"
+        "--attributes", "-a", help="An optional file containing attributes"
     )
     parser.add_argument(
-        "--attributes", "-a", help="An optional file containing attributes"
+        "--job",
+        "-j",
+        action="append",
+        type=parse_job,
+        default=[],
+        metavar="INPUT_DIR:TOPIC_MAP:DISTRO:OUTPUT_DIR[:ATTRIBUTES]",
+        help="A conversion to run instead of, or in addition to, the one of the options "
+        "above, can be repeated. All the conversions share the worker pool and every topic "
+        "map is parsed once",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of conversions run concurrently, the number of CPUs by default",
     )
 
     args = parser.parse_args(sys.argv[1:])
 
-    attribute_list: list = []
-    if args.attributes is not None:
-        attributes = os.path.normpath(os.path.join(os.getcwd(), args.attributes))
-        with open(attributes, "r") as fin:
-            attributes = yaml.safe_load(fin)
-        for key, value in attributes.items():
-            attribute_list = [*attribute_list, "-a", key + "=%s" % value]
-
-    topic_map = os.path.normpath(os.path.join(os.getcwd(), args.topic_map))
-    with open(topic_map, "r") as fin:
-        topic_map = yaml.safe_load_all(fin)
-        mega_file_list: list = []
-        for map in topic_map:
-            file_list: list = []
-            file_list = process_node(map, args.distro, file_list=file_list)
-            mega_file_list = mega_file_list + file_list
-
-    output_dir = os.path.normpath(args.output_dir)
-    os.makedirs(output_dir, exist_ok=True)
-    input_dir = os.path.normpath(args.input_dir)
-    script_dir = os.path.dirname(os.path.realpath(__file__))
+    jobs = list(args.job)
+    job_options = [args.input_dir, args.topic_map, args.distro, args.output_dir]
+    if all(job_options):
+        jobs.insert(
+            0,
+            Job(
+                input_dir=args.input_dir,
+                topic_map=args.topic_map,
+                distro=args.distro,
+                output_dir=args.output_dir,
+                attributes=args.attributes,
+            ),
+        )
+    elif any(job_options) or args.attributes:
+        parser.error(
+            "--input-dir, --topic-map, --distro and --output-dir are all required"
+        )
+    if not jobs:
+        parser.error(
+            "No conversion, give --input-dir, --topic-map, --distro and --output-dir or --job"
+        )
 
-    for filename in mega_file_list:
-        output_file = os.path.join(output_dir, filename + ".txt")
-        os.makedirs(os.path.dirname(os.path.realpath(output_file)), exist_ok=True)
-        input_file = os.path.join(input_dir, filename + ".adoc")
-        converter_file = os.path.join(script_dir, "text-converter.rb")
-        print("Processing: " + input_file)
-        command = ["asciidoctor"]
-        command = command + attribute_list
-        command = [
-            *command,
-            "-r",
-            converter_file,
-            "-b",
-            "text",
-            "-o",
-            output_file,
-            "--trace",
-            "--quiet",
-            input_file,
-        ]
-        result = subprocess.run(command, check=False)  # noqa: S603
-        if result.returncode != 0:
-            print(result)
-            print(result.stdout)
+    run_jobs(jobs, max(1, args.workers))
+    print_summary(jobs)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Utility script to benchmark the build of vector databases."""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from lightspeed_rag_content.benchmark import (
+    check_budget,
+    generate_corpus,
+    node_memory,
+    parameter_grid,
+    run_benchmark,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build indexes of a synthetic corpus for a grid of settings and "
+        "report the build times as JSON"
+    )
+    parser.add_argument("-o", "--output", default=None, help="JSON file of the results")
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Directory of the corpus and of the indexes, temporary if not set",
+    )
+    parser.add_argument(
+        "--num-files", type=int, default=100, help="Number of documents"
+    )
+    parser.add_argument(
+        "--num-runbooks", type=int, default=10, help="Number of runbooks"
+    )
+    parser.add_argument(
+        "--paragraphs", type=int, default=8, help="Paragraphs per document"
+    )
+    parser.add_argument(
+        "--sentences", type=int, default=5, help="Sentences per paragraph"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=2, help="Depth of the document tree"
+    )
+    parser.add_argument("--fanout", type=int, default=4, help="Subfolders per folder")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the corpus generator"
+    )
+    parser.add_argument(
+        "-md",
+        "--model-dir",
+        default=None,
+        help="Local embedding model, a deterministic stub is used if not set",
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[0], help="Numbers of loading threads"
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[0], help="Embedding batch sizes"
+    )
+    parser.add_argument(
+        "--chunk-sizes",
+        type=int,
+        nargs="+",
+        default=[380],
+        help="Chunk sizes in tokens",
+    )
+    parser.add_argument(
+        "--overlap", type=int, default=0, help="Chunk overlap in tokens"
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Process the documents in concurrent stages",
+    )
+    parser.add_argument(
+        "--compact-nodes",
+        action="store_true",
+        help="Keep the nodes in a compact node store",
+    )
+    parser.add_argument(
+        "--node-memory",
+        action="store_true",
+        help="Also measure the memory of the embedded nodes as objects and in a compact node "
+        "store, extrapolated to a million nodes",
+    )
+    parser.add_argument(
+        "--embed-dim",
+        type=int,
+        default=768,
+        help="Dimension of the embeddings of the node memory measure",
+    )
+    parser.add_argument(
+        "--ping-seconds",
+        type=float,
+        default=0.0,
+        help="Simulated latency of the URL checks",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of builds of every combination"
+    )
+    parser.add_argument(
+        "--budget",
+        default=None,
+        help="JSON file with min-nodes-per-second, max-total-seconds or max-index-bytes "
+        "limits, the script fails if a build breaks them",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = args.work_dir or tmp_dir
+        corpus = generate_corpus(
+            os.path.join(work_dir, "corpus"),
+            num_files=args.num_files,
+            num_runbooks=args.num_runbooks,
+            paragraphs=args.paragraphs,
+            sentences=args.sentences,
+            depth=args.depth,
+            fanout=args.fanout,
+            seed=args.seed,
+        )
+        grid = parameter_grid(
+            chunk_size=args.chunk_sizes,
+            workers=args.workers,
+            embed_batch_size=args.batch_sizes,
+        )
+        results = []
+        for i, params in enumerate(grid * args.repeat):
+            result = run_benchmark(
+                corpus,
+                os.path.join(work_dir, f"index-{i}"),
+                chunk_overlap=args.overlap,
+                pipelined=args.pipelined,
+                compact_nodes=args.compact_nodes,
+                model_dir=args.model_dir,
+                ping_seconds=args.ping_seconds,
+                **params,
+            )
+            print(
+                f"chunk-size {result['chunk-size']}, workers {result['workers']}, "
+                f"embed-batch-size {result['embed-batch-size']}: {result['nodes']} nodes in "
+                f"{result['total-seconds']:.3f}s, {result['nodes-per-second']:.1f} nodes/s",
+                file=sys.stderr,
+            )
+            results.append(result)
+
+        report_data = {"corpus": corpus, "results": results}
+        if args.node_memory:
+            memory = [
+                node_memory(corpus, chunk_size, args.overlap, args.embed_dim)
+                for chunk_size in args.chunk_sizes
+            ]
+            for measure in memory:
+                print(
+                    f"chunk-size {measure['chunk-size']}: "
+                    f"{measure['objects-bytes-per-million'] / 2**30:.2f} GiB per million nodes "
+                    f"as objects, {measure['store-bytes-per-million'] / 2**30:.2f} GiB stored, "
+                    f"{measure['saving-ratio']:.0%} saved",
+                    file=sys.stderr,
+                )
+            report_data["node-memory"] = memory
+
+    report = json.dumps(report_data, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+
+    if args.budget:
+        with open(args.budget) as file:
+            violations = check_budget(results, json.load(file))
+        for violation in violations:
+            print(f"Budget violation: {violation}", file=sys.stderr)
+        if violations:
+            sys.exit(1)
@@ -3,16 +3,17 @@
 import argparse
 import os
 
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from scipy.spatial.distance import cosine, euclidean
 
+from lightspeed_rag_content.embeddings import EMBEDDING_BACKENDS, get_embedding_model
+
 
 class ResponseValidation:
     """Validate LLM response."""
 
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, embedding_backend: str = "torch"):
         """Initialize."""
-        self._embedding_model = HuggingFaceEmbedding(model_path)
+        self._embedding_model = get_embedding_model(model_path, embedding_backend)
 
     def get_similarity_score(self, q1: str, q2: str) -> None:
         """Calculate similarity score between two strings."""
@@ -47,9 +48,17 @@ if __name__ == "__main__":
     )
     parser.add_argument("-q1", "--query1", required=True, help="Query 1")
     parser.add_argument("-q2", "--query2", required=True, help="Query 2")
+    parser.add_argument(
+        "--embedding-backend",
+        default="torch",
+        choices=EMBEDDING_BACKENDS,
+        help="Runtime used to embed the queries",
+    )
     args = parser.parse_args()
 
     os.environ["TRANSFORMERS_CACHE"] = args.model_path
     os.environ["TRANSFORMERS_OFFLINE"] = "1"
 
-    ResponseValidation(args.model_path).get_similarity_score(args.query1, args.query2)
+    ResponseValidation(args.model_path, args.embedding_backend).get_similarity_score(
+        args.query1, args.query2
+    )
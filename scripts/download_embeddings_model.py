@@ -3,9 +3,60 @@
 
 import argparse
 import os
+import shutil
 
 from huggingface_hub import snapshot_download
-import shutil
+
+from lightspeed_rag_content.embeddings import (
+    ONNX_DIR,
+    ONNX_MODEL_FILE,
+    ONNX_QUANTIZED_MODEL_FILE,
+    check_embedding_parity,
+    get_embedding_model,
+)
+
+
+def quantize_onnx_model(model_dir: str) -> None:
+    """Write an int8 dynamically-quantized copy of the ONNX model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        os.path.join(model_dir, ONNX_DIR, ONNX_MODEL_FILE),
+        os.path.join(model_dir, ONNX_DIR, ONNX_QUANTIZED_MODEL_FILE),
+        weight_type=QuantType.QInt8,
+    )
+
+
+def verify_onnx_parity(model_dir: str, onnx_files: list[str], tolerance: float) -> None:
+    """Check that the ONNX models produce the same vectors as the torch model."""
+    reference = get_embedding_model(model_dir, "torch")
+    for onnx_file in onnx_files:
+        candidate = get_embedding_model(model_dir, "onnx", onnx_file)
+        distance = check_embedding_parity(reference, candidate, tolerance)
+        print(f"{onnx_file}: maximum cosine distance to the torch model is {distance}")
+
+
+def prepare(model_dir: str, verify_parity: bool, tolerance: float) -> None:
+    """Write the prepared artifact of the model and report its load time."""
+    import time
+
+    from lightspeed_rag_content.prepared_model import prepare_model
+
+    settings = prepare_model(model_dir)
+    print(f"Prepared the model, embedding dimension {settings['dimension']}")
+
+    # The first load imports the modeling code, only the next ones are timed
+    reference = get_embedding_model(model_dir, "torch")
+    for backend in ["torch", "prepared"]:
+        start = time.perf_counter()
+        model = get_embedding_model(model_dir, backend)
+        print(
+            f"Load time of the {backend} model: {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+    if verify_parity:
+        distance = check_embedding_parity(reference, model, tolerance)
+        print(f"prepared: maximum cosine distance to the torch model is {distance}")
+
 
 if __name__ == "__main__":
 
@@ -16,6 +67,33 @@ if __name__ == "__main__":
         "-l", "--local-dir", required=True, help="Directory to download model to"
     )
     parser.add_argument("-r", "--hf-repo-id", required=True, help="Model repo id")
+    parser.add_argument(
+        "--keep-onnx",
+        action="store_true",
+        help="Keep the ONNX export of the model, needed by the onnx embedding backend",
+    )
+    parser.add_argument(
+        "--quantize-onnx",
+        action="store_true",
+        help="Create an int8-quantized ONNX model (implies --keep-onnx)",
+    )
+    parser.add_argument(
+        "--prepare",
+        action="store_true",
+        help="Also write a prepared artifact, loaded with memory-mapped weights by the "
+        "prepared embedding backend",
+    )
+    parser.add_argument(
+        "--verify-parity",
+        action="store_true",
+        help="Compare the ONNX and prepared models against the torch model",
+    )
+    parser.add_argument(
+        "--parity-tolerance",
+        type=float,
+        default=0.01,
+        help="Maximum cosine distance allowed between the ONNX and the torch vectors",
+    )
     args = parser.parse_args()
 
     os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
@@ -37,6 +115,18 @@ if __name__ == "__main__":
     # remove pytorch_model.bin, load the model from model.safetensors
     os.remove(os.path.join(args.local_dir, "pytorch_model.bin"))
 
-    # remove onnx and openvino models
-    shutil.rmtree(os.path.join(args.local_dir, "onnx"))
-    shutil.rmtree(os.path.join(args.local_dir, "openvino"))
\ No newline at end of file
+    # remove openvino models and, unless requested, the onnx models
+    shutil.rmtree(os.path.join(args.local_dir, "openvino"))
+    onnx_files = [ONNX_MODEL_FILE]
+    if args.quantize_onnx:
+        quantize_onnx_model(args.local_dir)
+        onnx_files.append(ONNX_QUANTIZED_MODEL_FILE)
+    elif not args.keep_onnx:
+        shutil.rmtree(os.path.join(args.local_dir, ONNX_DIR))
+        onnx_files = []
+
+    if args.verify_parity and onnx_files:
+        verify_onnx_parity(args.local_dir, onnx_files, args.parity_tolerance)
+
+    if args.prepare:
+        prepare(args.local_dir, args.verify_parity, args.parity_tolerance)
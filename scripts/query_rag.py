@@ -2,57 +2,485 @@
 
 import argparse
 import os
+import statistics
+import time
 
+import faiss
 from llama_index.core import Settings, load_index_from_storage
 from llama_index.core.llms.utils import resolve_llm
+from llama_index.core.schema import QueryBundle
 from llama_index.core.storage.storage_context import StorageContext
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.faiss import FaissVectorStore
 
+from lightspeed_rag_content.binary_index import (
+    RESCORE_MULTIPLIER,
+    BinaryRescoreRetriever,
+    FloatVectorsRetriever,
+    load_binary_index,
+    load_float_vectors,
+)
+from lightspeed_rag_content.dimension_reduction import (
+    TransformedEmbedding,
+    load_transform,
+)
+from lightspeed_rag_content.document_index import (
+    TOP_DOCUMENTS,
+    DocumentRetriever,
+    load_document_index,
+)
+from lightspeed_rag_content.embeddings import (
+    EMBEDDING_BACKENDS,
+    embedding_dimension,
+    get_embedding_model,
+)
+from lightspeed_rag_content.federated import (
+    NORMALIZATIONS,
+    FederatedIndex,
+    FederatedRetriever,
+    federated_index,
+)
+from lightspeed_rag_content.pgvector_search import (
+    ANN_METHODS,
+    PgVectorRetriever,
+    PgVectorSearch,
+)
+from lightspeed_rag_content.query_cache import (
+    CachedQueryEmbedding,
+    LRUCache,
+    cached_retrieve,
+    index_fingerprint,
+    result_cache_key,
+    search_key,
+)
+from lightspeed_rag_content.versions import VersionFilteredRetriever
+
+
+def load_federated_index(spec: str, top_k: int) -> FederatedIndex:
+    """Load the index of a DB_PATH:INDEX_ID[:WEIGHT[:TOP_K]] specification."""
+    db_path, index_id, *options = spec.split(":")
+    weight = float(options[0]) if options else 1.0
+    index_top_k = int(options[1]) if len(options) > 1 else top_k
+    return federated_index(index_id, db_path, index_id, index_top_k, weight)
+
+
+def print_latency(name: str, latencies: list[float]) -> None:
+    """Print statistics of search latencies given in seconds."""
+    print(
+        f"{name} search latency: mean {statistics.mean(latencies) * 1000:.3f} ms, "
+        f"max {max(latencies) * 1000:.3f} ms over {len(latencies)} queries"
+    )
+
+
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Utility script for querying RAG database")
+    parser = argparse.ArgumentParser(
+        description="Utility script for querying RAG database"
+    )
     parser.add_argument(
         "-p",
         "--db-path",
-        required=True,
         help="path to the vector db",
     )
-    parser.add_argument("-x", "--product-index", required=True, help="product index")
-    parser.add_argument("-m", "--model-path", required=True, help="path to the embedding model")
-    parser.add_argument("-q", "--query", type=str, required=True, help="query to run")
+    parser.add_argument("-x", "--product-index", help="product index")
+    parser.add_argument(
+        "-m", "--model-path", required=True, help="path to the embedding model"
+    )
+    parser.add_argument(
+        "-q",
+        "--query",
+        type=str,
+        action="append",
+        required=True,
+        help="query to run, can be repeated",
+    )
     parser.add_argument("-k", "--top-k", type=int, default=1, help="similarity_top_k")
     parser.add_argument("-n", "--node", help="retrieve node")
     parser.add_argument(
-        "-t", "--threshold", type=float, default=0.0, help="Minimal score for top node retrieved"
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.0,
+        help="Minimal score for top node retrieved",
+    )
+    parser.add_argument(
+        "--embedding-backend",
+        default="torch",
+        choices=EMBEDDING_BACKENDS,
+        help="Runtime used to embed the query",
+    )
+    parser.add_argument(
+        "--onnx-file",
+        default=None,
+        help="ONNX file of the model used with the onnx backend",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory persisting the query embedding and result caches between runs",
+    )
+    parser.add_argument(
+        "--embedding-cache-size",
+        type=int,
+        default=1024,
+        help="Maximum number of cached query embeddings, 0 disables the cache",
+    )
+    parser.add_argument(
+        "--result-cache-size",
+        type=int,
+        default=0,
+        help="Maximum number of cached query results, 0 (default) disables the cache",
+    )
+    parser.add_argument(
+        "--search-mode",
+        default="float",
+        choices=["float", "binary", "document"],
+        help="binary preselects candidates in the binary index by Hamming distance, then "
+        "rescores them against the float vectors. document searches the nearest documents "
+        "in the document index, then the chunks of these documents only. Both report their "
+        "recall and latency compared to the exact float search",
+    )
+    parser.add_argument(
+        "--rescore-multiplier",
+        type=int,
+        default=RESCORE_MULTIPLIER,
+        help="Number of binary search candidates rescored per requested node",
+    )
+    parser.add_argument(
+        "--top-documents",
+        type=int,
+        default=TOP_DOCUMENTS,
+        help="Number of documents whose chunks are searched by the document search mode",
+    )
+    parser.add_argument(
+        "--max-per-document",
+        type=int,
+        default=0,
+        help="Maximum number of nodes of a document returned by the document search mode, "
+        "0 (default) for no limit",
+    )
+    parser.add_argument(
+        "--version",
+        default=None,
+        help="Only retrieve nodes of this version from a multi-version index",
+    )
+    parser.add_argument(
+        "--federated",
+        action="append",
+        default=None,
+        metavar="DB_PATH:INDEX_ID[:WEIGHT[:TOP_K]]",
+        help="Search several indexes concurrently instead of --db-path and --product-index, "
+        "can be repeated. The results of an index are weighted by WEIGHT (default 1) and it "
+        "returns TOP_K nodes (default --top-k)",
+    )
+    parser.add_argument(
+        "--normalization",
+        default="minmax",
+        choices=NORMALIZATIONS,
+        help="Normalization of the scores of every index before merging federated results",
+    )
+    parser.add_argument(
+        "--vector-store-type",
+        default="faiss",
+        choices=["faiss", "postgres"],
+        help="postgres searches the table built for --product-index, the connection is set by "
+        "the POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_PORT and "
+        "POSTGRES_DATABASE environment variables",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=4,
+        help="Maximum number of PostgreSQL connections",
+    )
+    parser.add_argument(
+        "--ef-search",
+        type=int,
+        default=None,
+        help="hnsw.ef_search of the PostgreSQL searches",
+    )
+    parser.add_argument(
+        "--probes",
+        type=int,
+        default=None,
+        help="ivfflat.probes of the PostgreSQL searches",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Search all the queries in a single PostgreSQL statement",
+    )
+    parser.add_argument(
+        "--create-ann-index",
+        default=None,
+        choices=ANN_METHODS,
+        help="Create this ANN index of the PostgreSQL table if it has none, before searching",
     )
     args = parser.parse_args()
+    if args.vector_store_type == "postgres":
+        if (
+            args.federated
+            or args.search_mode != "float"
+            or args.version
+            or args.node
+            or args.result_cache_size
+        ):
+            parser.error(
+                "postgres does not support --federated, the binary and document search modes, "
+                "--version, --node and the result cache"
+            )
+        if args.db_path is None or args.product_index is None:
+            # The output folder of the build holds the transform of the
+            # embeddings stored in the table, if any
+            parser.error(
+                "--db-path, the output folder of the build, and --product-index are "
+                "required with postgres"
+            )
+    elif args.batch or args.create_ann_index:
+        parser.error("--batch and --create-ann-index require postgres")
+    elif args.federated:
+        if (
+            args.search_mode != "float"
+            or args.version
+            or args.node
+            or args.result_cache_size
+        ):
+            parser.error(
+                "--federated does not support the binary and document search modes, "
+                "--version, --node and the result cache"
+            )
+        if args.db_path is not None:
+            # The transform of --db-path would be applied on top of the
+            # transform of every federated index
+            parser.error("--db-path is not supported with --federated")
+    elif args.db_path is None or args.product_index is None:
+        parser.error("--db-path and --product-index are required without --federated")
+    if args.version is not None and args.search_mode != "float":
+        parser.error("--version is only supported by the float search mode")
 
     os.environ["TRANSFORMERS_CACHE"] = args.model_path
     os.environ["TRANSFORMERS_OFFLINE"] = "1"
 
-    Settings.llm = resolve_llm(None)
-    Settings.embed_model = HuggingFaceEmbedding(model_name=args.model_path)
+    def cache_path(name: str) -> str | None:
+        """Return the path of a persisted cache, None without --cache-dir."""
+        return os.path.join(args.cache_dir, name) if args.cache_dir else None
 
-    storage_context = StorageContext.from_defaults(
-        vector_store=FaissVectorStore.from_persist_dir(args.db_path),
-        persist_dir=args.db_path,
+    embedding_cache = None
+    result_cache = None
+    start = time.perf_counter()
+    embed_model = get_embedding_model(
+        args.model_path, args.embedding_backend, args.onnx_file
     )
-    vector_index = load_index_from_storage(
-        storage_context=storage_context,
-        index_id=args.product_index,
+    print(
+        f"Embedding model load time: {(time.perf_counter() - start) * 1000:.1f} ms "
+        f"({args.embedding_backend} backend)"
     )
-    if args.node is not None:
-        print(storage_context.docstore.get_node(args.node))
+    if args.embedding_cache_size > 0:
+        embedding_cache = LRUCache(
+            args.embedding_cache_size, cache_path("query_embeddings.json")
+        )
+        embed_model = CachedQueryEmbedding(
+            embed_model, embedding_cache, args.embedding_backend, args.onnx_file
+        )
+    # Queries must be reduced like the embeddings stored in the index
+    transform = load_transform(args.db_path) if args.db_path else None
+    if transform is not None:
+        embed_model = TransformedEmbedding(embed_model, transform)
+    if args.result_cache_size > 0:
+        result_cache = LRUCache(
+            args.result_cache_size, cache_path("query_results.json")
+        )
+
+    Settings.llm = resolve_llm(None)
+    Settings.embed_model = embed_model
+
+    exact_retriever = None
+    pg_search = None
+    if args.vector_store_type == "postgres":
+        # Tables are named after the index by generate_embeddings_openshift.py,
+        # PgVectorSearch lowercases and prefixes them like PGVectorStore
+        pg_search = PgVectorSearch(
+            args.product_index.replace("-", "_"),
+            args.pool_size,
+            args.ef_search,
+            args.probes,
+        )
+        # A table of reduced embeddings is only searched with the transform
+        table_dimension = pg_search.dimension()
+        query_dimension = embedding_dimension(embed_model)
+        if table_dimension is not None and table_dimension != query_dimension:
+            pg_search.close()
+            parser.error(
+                f"The table stores embeddings of dimension {table_dimension}, the "
+                f"queries are embedded with dimension {query_dimension}, check that "
+                "--db-path is the output folder of the build"
+            )
+        if args.create_ann_index:
+            pg_search.create_index(args.create_ann_index)
+        retriever = PgVectorRetriever(pg_search, embed_model, args.top_k)
+        docstore = None
+        fingerprint = ""
+    elif args.federated:
+        # Every index is reduced by its own transform, if any
+        retriever = FederatedRetriever(
+            [load_federated_index(spec, args.top_k) for spec in args.federated],
+            embed_model,
+            args.top_k,
+            args.normalization,
+        )
+        docstore = None
+        fingerprint = ""
+    else:
+        if args.search_mode == "binary":
+            # FAISS reads a flat index in full, the binary mode searches the
+            # memory-mapped float vectors instead, only reading the pages of
+            # the rescored candidates
+            float_vectors = load_float_vectors(args.db_path)
+            vector_store = FaissVectorStore(
+                faiss_index=faiss.IndexFlatIP(float_vectors.shape[1])
+            )
+        else:
+            vector_store = FaissVectorStore.from_persist_dir(args.db_path)
+        storage_context = StorageContext.from_defaults(
+            vector_store=vector_store,
+            persist_dir=args.db_path,
+        )
+        vector_index = load_index_from_storage(
+            storage_context=storage_context,
+            index_id=args.product_index,
+        )
+        if args.node is not None:
+            print(storage_context.docstore.get_node(args.node))
+            exit(0)
+
+        if args.version is not None:
+            retriever = VersionFilteredRetriever(vector_index, args.version, args.top_k)
+        else:
+            retriever = vector_index.as_retriever(similarity_top_k=args.top_k)
+        if args.search_mode == "binary":
+            exact_retriever = FloatVectorsRetriever(
+                vector_index, float_vectors, args.top_k
+            )
+            retriever = BinaryRescoreRetriever(
+                vector_index,
+                load_binary_index(args.db_path),
+                float_vectors,
+                args.top_k,
+                args.rescore_multiplier,
+            )
+        elif args.search_mode == "document":
+            exact_retriever = retriever
+            retriever = DocumentRetriever(
+                vector_index,
+                load_document_index(args.db_path),
+                args.top_k,
+                args.top_documents,
+                args.max_per_document,
+            )
+
+        docstore = storage_context.docstore
+        fingerprint = index_fingerprint(args.db_path)
+
+    # Results of the searches with other settings are cached apart
+    if args.search_mode == "binary":
+        mode_key = search_key("binary", args.rescore_multiplier)
+    elif args.search_mode == "document":
+        mode_key = search_key("document", args.top_documents, args.max_per_document)
     else:
-        retriever = vector_index.as_retriever(similarity_top_k=args.top_k)
-        nodes = retriever.retrieve(args.query)
+        mode_key = search_key(args.search_mode)
+    latencies: list[float] = []
+    exact_latencies: list[float] = []
+    recalls: list[float] = []
+    # Number of distinct documents in the results of every query
+    documents: list[int] = []
+    exact_documents: list[int] = []
+    failed = False
+    batch_results = None
+    if args.batch:
+        embeddings = [embed_model.get_query_embedding(query) for query in args.query]
+        start = time.perf_counter()
+        batch_results = pg_search.search_batch(embeddings, args.top_k)
+        elapsed = time.perf_counter() - start
+        print(
+            f"Batched search latency: {elapsed * 1000:.3f} ms for {len(args.query)} queries, "
+            f"{elapsed * 1000 / len(args.query):.3f} ms per query"
+        )
+    for i, query in enumerate(args.query):
+        if batch_results is not None:
+            nodes = batch_results[i]
+        else:
+            # Embed the query once, the latencies only measure the search
+            query_bundle = QueryBundle(
+                query, embedding=embed_model.get_query_embedding(query)
+            )
+            cache_key = result_cache_key(
+                args.product_index,
+                fingerprint,
+                query,
+                args.top_k,
+                mode_key,
+                args.version,
+            )
+            start = time.perf_counter()
+            if result_cache is None:
+                nodes = retriever.retrieve(query_bundle)
+            else:
+                nodes = cached_retrieve(
+                    retriever,
+                    query_bundle,
+                    docstore,
+                    result_cache,
+                    cache_key,
+                    args.version,
+                )
+            latencies.append(time.perf_counter() - start)
+
+        if exact_retriever is not None:
+            start = time.perf_counter()
+            exact_nodes = exact_retriever.retrieve(query_bundle)
+            exact_latencies.append(time.perf_counter() - start)
+            exact_ids = {n.node.node_id for n in exact_nodes}
+            found_ids = {n.node.node_id for n in nodes}
+            recalls.append(
+                len(exact_ids & found_ids) / len(exact_ids) if exact_ids else 1.0
+            )
+            documents.append(len({n.node.ref_doc_id for n in nodes}))
+            exact_documents.append(len({n.node.ref_doc_id for n in exact_nodes}))
+
         if len(nodes) == 0:
-            print(f"No nodes retrieved for query: {args.query}")
-            exit(1)
+            print(f"No nodes retrieved for query: {query}")
+            failed = True
+            continue
         if args.threshold > 0.0 and nodes[0].score < args.threshold:
             print(
-                f"Score {nodes[0].score} of the top retrieved node for query '{args.query}' didn't cross the minimal threshold {args.threshold}."
+                f"Score {nodes[0].score} of the top retrieved node for query '{query}' didn't cross the minimal threshold {args.threshold}."
             )
-            exit(1)
+            failed = True
+            continue
         for n in nodes:
             print(n)
+
+    if latencies:
+        name = "Postgres" if pg_search is not None else args.search_mode.capitalize()
+        print_latency(name, latencies)
+    if exact_retriever is not None:
+        print_latency("Float", exact_latencies)
+        print(
+            f"Recall@{args.top_k} of the {args.search_mode} search: "
+            f"{statistics.mean(recalls):.3f}"
+        )
+        print(
+            f"Distinct documents per query: {statistics.mean(documents):.2f} "
+            f"({statistics.mean(exact_documents):.2f} with the float search)"
+        )
+
+    for name, cache in [("Query embedding", embedding_cache), ("Result", result_cache)]:
+        if cache is not None:
+            cache.save()
+            print(f"{name} cache: {cache.stats()}")
+
+    if pg_search is not None:
+        pg_search.close()
+    if isinstance(retriever, FederatedRetriever):
+        retriever.close()
+
+    if failed:
+        exit(1)
@@ -0,0 +1,129 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+from typing import Any, List, Tuple
+
+import faiss
+from llama_index.core.schema import TextNode
+import numpy as np
+
+# Formats of the dataset, an Arrow IPC file can be memory-mapped and read
+# without copies, a Parquet file is smaller but must be decoded
+EXPORT_FORMATS = ("arrow", "parquet")
+DATASET_FILES = {"arrow": "nodes.arrow", "parquet": "nodes.parquet"}
+
+# Prefix of the columns holding the node metadata
+METADATA_PREFIX = "metadata."
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow, which is an optional dependency."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError(
+            "Exporting the nodes requires the pyarrow package, "
+            "install it with: pip install pyarrow") from e
+    return pyarrow
+
+
+def _metadata_column(pa: Any, values: List[Any]) -> Any:
+    """Create the column of a metadata key, JSON encoded if not uniform."""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if value is None else json.dumps(value)
+                         for value in values])
+
+
+def write_dataset(nodes: List[TextNode], persist_dir: str,
+                  export_format: str, index_id: str) -> str:
+    """Write the embedded nodes as an Arrow or Parquet dataset.
+
+    The dataset has a node_id and a text column, a column per metadata key
+    and an embedding column of fixed-size float32 lists.
+
+    Returns the path of the dataset.
+    """
+    pa = _import_pyarrow()
+    if export_format not in EXPORT_FORMATS:
+        raise RuntimeError(f"Unknown export format: {export_format}")
+
+    embeddings = np.array([node.embedding for node in nodes],
+                          dtype=np.float32)
+    dimension = embeddings.shape[1] if len(nodes) else 0
+    columns = {
+        "node_id": pa.array([node.node_id for node in nodes], pa.string()),
+        "text": pa.array([node.text for node in nodes], pa.string()),
+    }
+    keys = sorted({key for node in nodes for key in node.metadata})
+    for key in keys:
+        columns[METADATA_PREFIX + key] = _metadata_column(
+            pa, [node.metadata.get(key) for node in nodes])
+    columns["embedding"] = pa.FixedSizeListArray.from_arrays(
+        pa.array(embeddings.reshape(-1), pa.float32()), dimension)
+    table = pa.table(columns).replace_schema_metadata(
+        {"index-id": index_id, "embedding-dimension": str(dimension)})
+
+    path = os.path.join(persist_dir, DATASET_FILES[export_format])
+    if export_format == "arrow":
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    return path
+
+
+def read_dataset(path: str) -> Any:
+    """Read a dataset, memory-mapping it.
+
+    The columns of an Arrow file reference the mapped file, no data is
+    copied.
+    """
+    pa = _import_pyarrow()
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, memory_map=True)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def embeddings_array(table: Any) -> np.ndarray:
+    """Return the embedding column of a dataset as a NumPy matrix.
+
+    The matrix is a view of the column when it has a single chunk.
+    """
+    column = table.column("embedding").combine_chunks()
+    dimension = column.type.list_size
+    return column.values.to_numpy(zero_copy_only=True).reshape(-1, dimension)
+
+
+def build_faiss_index(path: str) -> Tuple[faiss.IndexFlatIP, List[str]]:
+    """Build a FAISS index from the embeddings of a dataset.
+
+    Returns the index and the IDs of the nodes, in the order of their
+    vectors in the index.
+    """
+    table = read_dataset(path)
+    embeddings = embeddings_array(table)
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    return index, table.column("node_id").to_pylist()
@@ -0,0 +1,306 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import itertools
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.schema import TextNode
+from llama_index.readers.file.flat.base import FlatReader
+import numpy as np
+
+from lightspeed_rag_content.document_processor import DocumentProcessor
+from lightspeed_rag_content.metadata_processor import MetadataProcessor
+from lightspeed_rag_content.node_store import NodeStore
+
+# Words of the synthetic documents
+VOCABULARY = (
+    "openshift cluster node pod container image operator route service "
+    "deployment namespace project volume storage network ingress egress "
+    "secret config map the a is of to and in for with on by from install "
+    "update upgrade configure create delete scale monitor alert log metric "
+    "user role binding policy quota limit request api server etcd machine"
+).split()
+
+# Limits enforced by check_budget()
+BUDGET_KEYS = ("min-nodes-per-second", "max-total-seconds", "max-index-bytes")
+
+
+def _words(rng: np.random.Generator, count: int) -> str:
+    return " ".join(rng.choice(VOCABULARY, count))
+
+
+def _paragraph(rng: np.random.Generator, sentences: int) -> str:
+    return " ".join(_words(rng, int(rng.integers(6, 20))).capitalize() + "."
+                    for _ in range(sentences))
+
+
+def generate_corpus(output_dir: str, num_files: int = 100,
+                    num_runbooks: int = 10, paragraphs: int = 8,
+                    sentences: int = 5, depth: int = 2, fanout: int = 4,
+                    seed: int = 0) -> Dict:
+    """Write a synthetic documentation tree and runbooks.
+
+    Plaintext documents, starting with a title line like the converted OCP
+    documentation, are spread over a tree of the given depth and fanout in
+    output_dir/docs. Markdown runbooks are written to output_dir/runbooks.
+    The same arguments always produce the same files.
+
+    Returns the paths of both directories and the size of the corpus.
+    """
+    rng = np.random.default_rng(seed)
+    docs_dir = os.path.join(output_dir, "docs")
+    runbooks_dir = os.path.join(output_dir, "runbooks")
+    total_bytes = 0
+
+    def write(path: str, content: str) -> None:
+        nonlocal total_bytes
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+        total_bytes += len(content)
+
+    for i in range(num_files):
+        subdirs = [f"dir{(i // fanout ** level) % fanout}"
+                   for level in range(depth)]
+        body = "\n\n".join(_paragraph(rng, sentences)
+                           for _ in range(paragraphs))
+        write(os.path.join(docs_dir, *subdirs, f"doc{i}.txt"),
+              f"# {_words(rng, 4).title()}\n\n{body}\n")
+
+    for i in range(num_runbooks):
+        sections = "\n\n".join(
+            f"## {section}\n\n{_paragraph(rng, sentences)}"
+            for section in ["Meaning", "Impact", "Diagnosis", "Mitigation"])
+        write(os.path.join(runbooks_dir, f"Alert{i}.md"),
+              f"# Alert{i}\n\n{sections}\n")
+
+    return {"docs-dir": docs_dir, "runbooks-dir": runbooks_dir,
+            "files": num_files, "runbooks": num_runbooks,
+            "bytes": total_bytes}
+
+
+class StubEmbedding(BaseEmbedding):
+    """Deterministic embedding model derived from a hash of the text.
+
+    It makes the cost of embedding negligible, so that a benchmark measures
+    the rest of the build.
+    """
+
+    embed_dim: int = 384
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "StubEmbedding"
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8],
+                              "little")
+        vector = np.random.default_rng(seed).standard_normal(self.embed_dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class BenchmarkMetadata(MetadataProcessor):
+    """Metadata processor of a synthetic corpus, without network access.
+
+    Pinging a URL takes ping_seconds, to simulate the cost of the checks.
+    """
+
+    def __init__(self, root_dir: str, ping_seconds: float = 0.0):
+        super().__init__()
+        self.root_dir = root_dir
+        self.ping_seconds = ping_seconds
+
+    def url_function(self, file_path: str) -> str:
+        return ("https://docs.example.com/"
+                + os.path.relpath(file_path, self.root_dir))
+
+    def ping_url(self, url: str) -> bool:
+        if self.ping_seconds:
+            time.sleep(self.ping_seconds)
+        return True
+
+
+def parameter_grid(**parameters: List) -> List[Dict]:
+    """Return every combination of the values of the parameters."""
+    names = list(parameters)
+    return [dict(zip(names, values))
+            for values in itertools.product(*parameters.values())]
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def run_benchmark(corpus: Dict, output_dir: str, chunk_size: int = 380,
+                  chunk_overlap: int = 0, workers: int = 0,
+                  embed_batch_size: int = 0, pipelined: bool = False,
+                  model_dir: str | None = None,
+                  ping_seconds: float = 0.0,
+                  compact_nodes: bool = False) -> Dict:
+    """Build an index of a generated corpus and measure the build.
+
+    Args:
+        corpus: result of generate_corpus()
+        output_dir: directory of the index
+        chunk_size: size of the chunks, in tokens
+        chunk_overlap: overlap of the chunks, in tokens
+        workers: number of threads loading the documents, 0 for the default
+        embed_batch_size: number of chunks embedded at once, 0 for the
+            default of the model
+        pipelined: process the documents in concurrent stages
+        model_dir: local embedding model, the StubEmbedding if None
+        ping_seconds: simulated latency of the URL checks
+        compact_nodes: keep the nodes in a NodeStore during the build
+
+    Returns the parameters and the measurements of the build.
+    """
+    start = time.perf_counter()
+    processor = DocumentProcessor(
+        chunk_size, chunk_overlap, model_dir or "stub", model_dir, workers,
+        pipelined=pipelined, embed_model=None if model_dir else StubEmbedding(),
+        embed_batch_size=embed_batch_size, compact_nodes=compact_nodes)
+    setup_end = time.perf_counter()
+
+    processor.process(
+        corpus["docs-dir"],
+        metadata=BenchmarkMetadata(corpus["docs-dir"], ping_seconds))
+    processor.process(
+        corpus["runbooks-dir"],
+        metadata=BenchmarkMetadata(corpus["runbooks-dir"], ping_seconds),
+        required_exts=[".md"],
+        file_extractor={".md": FlatReader()})
+    process_end = time.perf_counter()
+
+    processor.save("benchmark", output_dir)
+    end = time.perf_counter()
+
+    nodes = len(processor.nodes)
+    build_seconds = end - setup_end
+    return {
+        "chunk-size": chunk_size,
+        "chunk-overlap": chunk_overlap,
+        "workers": workers,
+        "embed-batch-size": embed_batch_size,
+        "pipelined": pipelined,
+        "compact-nodes": compact_nodes,
+        "embedding-model": model_dir or "stub",
+        "files": processor.num_embedded_files,
+        "nodes": nodes,
+        "setup-seconds": setup_end - start,
+        "process-seconds": process_end - setup_end,
+        "save-seconds": end - process_end,
+        "total-seconds": build_seconds,
+        "nodes-per-second": nodes / build_seconds if build_seconds else 0.0,
+        "index-bytes": _dir_size(output_dir),
+        "pipeline": processor.pipeline_metrics,
+    }
+
+
+def measure_node_memory(nodes: List[TextNode]) -> Dict:
+    """Measure the memory held by embedded nodes, as objects and stored.
+
+    The nodes are copied through JSON, so that the copies share no object
+    with them like the nodes of a build, then added to a NodeStore. The
+    allocations of both are traced and extrapolated to a million nodes.
+    """
+    if not nodes:
+        raise RuntimeError("No nodes to measure")
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        copies = [TextNode.from_json(node.to_json()) for node in nodes]
+        objects_bytes = tracemalloc.get_traced_memory()[0] - start
+        del copies
+
+        start = tracemalloc.get_traced_memory()[0]
+        store = NodeStore()
+        store.extend(nodes)
+        store_bytes = tracemalloc.get_traced_memory()[0] - start
+        del store
+    finally:
+        tracemalloc.stop()
+
+    scale = 1_000_000 / len(nodes)
+    return {
+        "nodes": len(nodes),
+        "embedding-dimension": len(nodes[0].embedding or []),
+        "objects-bytes": objects_bytes,
+        "store-bytes": store_bytes,
+        "objects-bytes-per-million": int(objects_bytes * scale),
+        "store-bytes-per-million": int(store_bytes * scale),
+        "saving-bytes-per-million": int((objects_bytes - store_bytes) * scale),
+        "saving-ratio": 1 - store_bytes / objects_bytes,
+    }
+
+
+def node_memory(corpus: Dict, chunk_size: int = 380, chunk_overlap: int = 0,
+                embed_dim: int = 768) -> Dict:
+    """Split and embed a generated corpus, and measure its node memory.
+
+    The stub embeddings have the dimension of the model, 768 for
+    all-mpnet-base-v2 by default. See measure_node_memory().
+    """
+    processor = DocumentProcessor(
+        chunk_size, chunk_overlap, "stub", None,
+        embed_model=StubEmbedding(embed_dim=embed_dim))
+    processor.process(
+        corpus["docs-dir"], metadata=BenchmarkMetadata(corpus["docs-dir"]))
+    processor.process(
+        corpus["runbooks-dir"],
+        metadata=BenchmarkMetadata(corpus["runbooks-dir"]),
+        required_exts=[".md"],
+        file_extractor={".md": FlatReader()})
+    processor.embed()
+    return {"chunk-size": chunk_size, "chunk-overlap": chunk_overlap,
+            **measure_node_memory(processor.nodes)}
+
+
+def check_budget(results: List[Dict], budget: Dict) -> List[str]:
+    """Return the violations of a performance budget by the results.
+
+    The budget may set min-nodes-per-second, max-total-seconds and
+    max-index-bytes, each of them applies to every result.
+    """
+    unknown = set(budget) - set(BUDGET_KEYS)
+    if unknown:
+        raise RuntimeError(f"Unknown budget keys: {sorted(unknown)}")
+
+    violations = []
+    for result in results:
+        for key, limit in budget.items():
+            kind, measure = key.split("-", 1)
+            value = result[measure]
+            if (value < limit) if kind == "min" else (value > limit):
+                violations.append(
+                    f"{measure} {value} breaks the budget {key}={limit} "
+                    f"with chunk-size {result['chunk-size']}, workers "
+                    f"{result['workers']}, embed-batch-size "
+                    f"{result['embed-batch-size']}")
+    return violations
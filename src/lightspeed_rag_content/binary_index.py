@@ -0,0 +1,184 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from typing import Any, List, Tuple
+
+import faiss
+from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+import numpy as np
+
+# Files of the binary index and of the float vectors rescoring its results,
+# persisted next to the FAISS index
+BINARY_INDEX_FILE = "binary_index.faiss"
+FLOAT_VECTORS_FILE = "float_vectors.npy"
+
+# Number of candidates found by Hamming distance, per requested result
+RESCORE_MULTIPLIER = 4
+
+# Number of float vectors scored at once by exact_search()
+EXACT_SEARCH_BATCH = 65536
+
+
+def binarize(vectors: np.ndarray) -> np.ndarray:
+    """Quantize vectors to one bit per dimension, the sign of the value."""
+    return np.packbits(np.asarray(vectors) > 0, axis=1)
+
+
+def _binary_index(vectors: np.ndarray) -> faiss.IndexBinaryFlat:
+    # Codes are padded to whole bytes by binarize()
+    binary_index = faiss.IndexBinaryFlat((vectors.shape[1] + 7) // 8 * 8)
+    if len(vectors):
+        binary_index.add(binarize(vectors))
+    return binary_index
+
+
+def build_binary_index(float_index: faiss.Index) -> faiss.IndexBinaryFlat:
+    """Create a binary index with the sign-quantized vectors of an index.
+
+    Vectors get the same IDs in both indexes.
+    """
+    return _binary_index(float_index.reconstruct_n(0, float_index.ntotal))
+
+
+def save_binary_index(float_index: faiss.Index, persist_dir: str) -> None:
+    """Build and persist the binary index of a FAISS index.
+
+    The float vectors are also saved as a NumPy array, which
+    load_float_vectors() maps into memory.
+    """
+    vectors = float_index.reconstruct_n(0, float_index.ntotal)
+    faiss.write_index_binary(_binary_index(vectors),
+                             os.path.join(persist_dir, BINARY_INDEX_FILE))
+    np.save(os.path.join(persist_dir, FLOAT_VECTORS_FILE), vectors)
+
+
+def load_binary_index(persist_dir: str) -> faiss.IndexBinary:
+    """Load the binary index persisted next to a FAISS index."""
+    return faiss.read_index_binary(
+        os.path.join(persist_dir, BINARY_INDEX_FILE))
+
+
+def load_float_vectors(persist_dir: str) -> np.ndarray:
+    """Map the float vectors saved with the binary index into memory.
+
+    Only the pages of the vectors which are read are loaded, unlike the
+    FAISS flat index which is always read in full.
+    """
+    path = os.path.join(persist_dir, FLOAT_VECTORS_FILE)
+    if not os.path.exists(path):
+        raise RuntimeError(
+            f"{persist_dir} has no {FLOAT_VECTORS_FILE}, rebuild the index "
+            "with --binary-index")
+    return np.load(path, mmap_mode="r")
+
+
+def _top_k(ids: np.ndarray, scores: np.ndarray,
+           top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return ids[order], scores[order]
+
+
+def search(binary_index: faiss.IndexBinary, vectors: np.ndarray,
+           query: np.ndarray, top_k: int,
+           rescore_multiplier: int = RESCORE_MULTIPLIER
+           ) -> Tuple[np.ndarray, np.ndarray]:
+    """Search the binary index, then rescore the candidates.
+
+    The top_k * rescore_multiplier nearest vectors by Hamming distance are
+    rescored by inner product against their float vectors, only these rows
+    of vectors are read.
+
+    Returns the IDs and the scores of the top_k results.
+    """
+    query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+    _, candidates = binary_index.search(
+        binarize(query), top_k * rescore_multiplier)
+    candidates = candidates[0][candidates[0] >= 0]
+    if not len(candidates):
+        return candidates, np.empty(0, dtype=np.float32)
+
+    return _top_k(candidates, vectors[candidates] @ query[0], top_k)
+
+
+def exact_search(vectors: np.ndarray, query: np.ndarray, top_k: int,
+                 batch_size: int = EXACT_SEARCH_BATCH
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+    """Search the float vectors by inner product, batch by batch.
+
+    Returns the IDs and the scores of the top_k results.
+    """
+    query = np.asarray(query, dtype=np.float32).reshape(-1)
+    ids = np.empty(0, dtype=np.int64)
+    scores = np.empty(0, dtype=np.float32)
+    for start in range(0, len(vectors), batch_size):
+        batch_scores = vectors[start:start + batch_size] @ query
+        ids, scores = _top_k(
+            np.concatenate([ids, start + np.arange(len(batch_scores))]),
+            np.concatenate([scores, batch_scores]), top_k)
+    return ids, scores
+
+
+class FloatVectorsRetriever(BaseRetriever):
+    """Retriever of a FAISS vector index searching its float vectors.
+
+    The vectors, e.g. mapped by load_float_vectors(), are searched instead
+    of the FAISS index of the vector index, which can be left empty.
+    """
+
+    def __init__(self, vector_index: VectorStoreIndex, vectors: np.ndarray,
+                 similarity_top_k: int, **kwargs: Any):
+        self._vector_index = vector_index
+        self._vectors = vectors
+        self._similarity_top_k = similarity_top_k
+        super().__init__(**kwargs)
+
+    def _search(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return exact_search(self._vectors, query, self._similarity_top_k)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding
+        if embedding is None:
+            embedding = self._vector_index._embed_model.get_query_embedding(
+                query_bundle.query_str)
+
+        ids, scores = self._search(np.array(embedding))
+
+        nodes_dict = self._vector_index.index_struct.nodes_dict
+        nodes = self._vector_index.docstore.get_nodes(
+            [nodes_dict[str(i)] for i in ids])
+        return [NodeWithScore(node=node, score=float(score))
+                for node, score in zip(nodes, scores)]
+
+
+class BinaryRescoreRetriever(FloatVectorsRetriever):
+    """Retriever of a FAISS vector index searching its binary index first.
+
+    The candidates are rescored against the float vectors.
+    """
+
+    def __init__(self, vector_index: VectorStoreIndex,
+                 binary_index: faiss.IndexBinary, vectors: np.ndarray,
+                 similarity_top_k: int,
+                 rescore_multiplier: int = RESCORE_MULTIPLIER, **kwargs: Any):
+        self._binary_index = binary_index
+        self._rescore_multiplier = rescore_multiplier
+        super().__init__(vector_index, vectors, similarity_top_k, **kwargs)
+
+    def _search(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return search(self._binary_index, self._vectors, query,
+                      self._similarity_top_k, self._rescore_multiplier)
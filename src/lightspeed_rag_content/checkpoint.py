@@ -0,0 +1,82 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import glob
+import hashlib
+import logging
+import os
+import shutil
+from typing import Dict, List
+
+import numpy as np
+from llama_index.core.schema import MetadataMode, TextNode
+
+LOG = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = ".embedding_checkpoint"
+
+
+class EmbeddingCheckpoint(object):
+    """Embedded node batches persisted while an index is being built.
+
+    Every batch is stored in its own file with the node IDs, the vectors
+    and a hash of the text that was embedded. Batches are matched by that
+    hash when resuming, so a rebuild from the same documents can reuse
+    them even if the node IDs changed.
+    """
+
+    def __init__(self, output_dir: str):
+        self.directory = os.path.join(output_dir, CHECKPOINT_DIR)
+
+    @staticmethod
+    def node_key(node: TextNode) -> str:
+        """Return the hash of the content of the node that gets embedded."""
+        content = node.get_content(metadata_mode=MetadataMode.EMBED)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _batch_files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "batch-*.npz")))
+
+    def load(self) -> Dict[str, List[float]]:
+        """Load the vectors of all completed batches, indexed by node key."""
+        vectors: Dict[str, List[float]] = {}
+        for path in self._batch_files():
+            with np.load(path) as batch:
+                for key, vector in zip(batch["keys"], batch["embeddings"]):
+                    vectors[str(key)] = vector.tolist()
+        LOG.info("Loaded %d embedded nodes from checkpoint %s",
+                 len(vectors), self.directory)
+        return vectors
+
+    def save_batch(self, nodes: List[TextNode]) -> None:
+        """Persist a batch of embedded nodes."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory, f"batch-{len(self._batch_files()):06d}.npz")
+        # Write to a temporary file first, a killed build must never leave
+        # a truncated batch behind
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez(
+                file,
+                keys=np.array([self.node_key(node) for node in nodes]),
+                node_ids=np.array([node.node_id for node in nodes]),
+                embeddings=np.array([node.embedding for node in nodes],
+                                    dtype=np.float32))
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Remove all the persisted batches."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,144 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from typing import Any, List
+
+import faiss
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+import numpy as np
+
+REDUCTION_METHODS = ("pca", "matryoshka")
+
+# File of the transform persisted next to the index
+TRANSFORM_FILE = "embedding_transform.faiss"
+
+# Number of corpus vectors held out as queries to measure the recall
+RECALL_QUERIES = 100
+RECALL_TOP_K = 10
+
+
+def fit_transform(method: str, embeddings: np.ndarray,
+                  dimension: int) -> faiss.VectorTransform:
+    """Create the transform reducing the embeddings to dimension.
+
+    Args:
+        method: "pca" fits a PCA on the embeddings, "matryoshka" keeps the
+            first dimensions, which only works for models trained with
+            Matryoshka representation learning
+        embeddings: matrix of the corpus embeddings
+        dimension: dimension of the reduced embeddings
+    """
+    input_dimension = embeddings.shape[1]
+    if method == "pca":
+        transform = faiss.PCAMatrix(input_dimension, dimension)
+        transform.train(np.ascontiguousarray(embeddings, dtype=np.float32))
+    elif method == "matryoshka":
+        transform = faiss.RemapDimensionsTransform(
+            input_dimension, dimension, False)
+    else:
+        raise RuntimeError(f"Unknown dimension reduction: {method}")
+    return transform
+
+
+def apply_transform(transform: faiss.VectorTransform,
+                    embeddings: np.ndarray) -> np.ndarray:
+    """Reduce the embeddings and normalize them for inner product search."""
+    reduced = transform.apply(
+        np.ascontiguousarray(embeddings, dtype=np.float32))
+    faiss.normalize_L2(reduced)
+    return reduced
+
+
+def measure_recall(embeddings: np.ndarray, reduced: np.ndarray,
+                   num_queries: int = RECALL_QUERIES,
+                   top_k: int = RECALL_TOP_K) -> float:
+    """Measure the recall of searches over the reduced embeddings.
+
+    Evenly spaced corpus vectors, at most half of them, are held out as
+    queries and searched among the other vectors, so that no query finds
+    itself. The result is the fraction of their exact top_k neighbours,
+    searching the full embeddings, also found searching the reduced
+    embeddings.
+    """
+    if len(embeddings) < 2:
+        return 1.0
+    queries = np.linspace(0, len(embeddings) - 1,
+                          min(num_queries, len(embeddings) // 2), dtype=int)
+    corpus = np.ones(len(embeddings), dtype=bool)
+    corpus[queries] = False
+    top_k = min(top_k, int(corpus.sum()))
+
+    def search(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        index = faiss.IndexFlatIP(vectors.shape[1])
+        index.add(vectors[corpus])
+        return index.search(vectors[queries], top_k)[1]
+
+    expected = search(embeddings)
+    actual = search(reduced)
+    found = sum(len(set(e) & set(a)) for e, a in zip(expected, actual))
+    return found / (len(queries) * top_k)
+
+
+def save_transform(transform: faiss.VectorTransform,
+                   persist_dir: str) -> None:
+    """Persist the transform next to the index."""
+    os.makedirs(persist_dir, exist_ok=True)
+    faiss.write_VectorTransform(
+        transform, os.path.join(persist_dir, TRANSFORM_FILE))
+
+
+def load_transform(persist_dir: str) -> faiss.VectorTransform | None:
+    """Load the transform of an index, None if the index has none."""
+    path = os.path.join(persist_dir, TRANSFORM_FILE)
+    if not os.path.exists(path):
+        return None
+    return faiss.read_VectorTransform(path)
+
+
+class TransformedEmbedding(BaseEmbedding):
+    """Embedding model reducing the vectors of another model."""
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _transform: Any = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding,
+                 transform: faiss.VectorTransform):
+        super().__init__(model_name=embed_model.model_name,
+                         embed_batch_size=embed_model.embed_batch_size)
+        self._embed_model = embed_model
+        self._transform = transform
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "TransformedEmbedding"
+
+    def _reduce(self, embeddings: List[List[float]]) -> List[List[float]]:
+        return apply_transform(self._transform, np.array(embeddings)).tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._reduce(
+            [self._embed_model.get_query_embedding(query)])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._reduce([self._embed_model.get_text_embedding(text)])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._reduce(self._embed_model.get_text_embedding_batch(texts))
@@ -0,0 +1,182 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+import faiss
+from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.storage.docstore.types import BaseDocumentStore
+import numpy as np
+
+# Files of the document index persisted next to the FAISS index, the
+# centroids and the chunks of every document
+DOCUMENT_INDEX_FILE = "document_index.faiss"
+DOCUMENT_CHUNKS_FILE = "document_chunks.json"
+
+# Number of documents whose chunks are searched, by default
+TOP_DOCUMENTS = 10
+
+
+class DocumentIndex(object):
+    """Centroids of the chunks of every document, with their chunk IDs.
+
+    The i-th vector of the centroid index is the centroid of the i-th
+    document, whose chunks are the vectors of the chunk index with the IDs
+    chunk_ids[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, index: faiss.Index, doc_ids: List[str],
+                 offsets: np.ndarray, chunk_ids: np.ndarray):
+        self.index = index
+        self.doc_ids = list(doc_ids)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def chunks(self, document: int) -> np.ndarray:
+        """Return the IDs of the chunks of a document."""
+        return self.chunk_ids[self.offsets[document]:
+                              self.offsets[document + 1]]
+
+
+def build_document_index(float_index: faiss.Index, nodes_dict: Dict[str, str],
+                         docstore: BaseDocumentStore) -> DocumentIndex:
+    """Compute the centroid of the chunk vectors of every document.
+
+    Args:
+        float_index: FAISS index of the chunks
+        nodes_dict: node ID of every vector ID, from the index struct
+        docstore: docstore of the nodes, giving their source document
+    """
+    groups: Dict[str, List[int]] = {}
+    for vector_id, node_id in sorted(nodes_dict.items(),
+                                     key=lambda item: int(item[0])):
+        node = docstore.get_node(node_id)
+        groups.setdefault(node.ref_doc_id or node_id, []).append(
+            int(vector_id))
+
+    index = faiss.IndexFlatIP(float_index.d)
+    offsets = [0]
+    chunk_ids: List[int] = []
+    if groups:
+        vectors = float_index.reconstruct_n(0, float_index.ntotal)
+        centroids = np.zeros((len(groups), float_index.d), dtype=np.float32)
+        for i, ids in enumerate(groups.values()):
+            # Chunk vectors are normalized, so is their centroid to be
+            # compared by inner product
+            centroid = vectors[ids].mean(axis=0)
+            norm = np.linalg.norm(centroid)
+            centroids[i] = centroid / norm if norm > 0 else centroid
+            chunk_ids.extend(ids)
+            offsets.append(len(chunk_ids))
+        index.add(centroids)
+    return DocumentIndex(index, list(groups), np.array(offsets),
+                         np.array(chunk_ids))
+
+
+def save_document_index(float_index: faiss.Index, nodes_dict: Dict[str, str],
+                        docstore: BaseDocumentStore, persist_dir: str) -> None:
+    """Build and persist the document index of a FAISS index."""
+    document_index = build_document_index(float_index, nodes_dict, docstore)
+    faiss.write_index(document_index.index,
+                      os.path.join(persist_dir, DOCUMENT_INDEX_FILE))
+    with open(os.path.join(persist_dir, DOCUMENT_CHUNKS_FILE), "w") as file:
+        json.dump({"doc_ids": document_index.doc_ids,
+                   "offsets": document_index.offsets.tolist(),
+                   "chunk_ids": document_index.chunk_ids.tolist()}, file)
+
+
+def load_document_index(persist_dir: str) -> DocumentIndex:
+    """Load the document index persisted next to a FAISS index."""
+    with open(os.path.join(persist_dir, DOCUMENT_CHUNKS_FILE)) as file:
+        chunks = json.load(file)
+    return DocumentIndex(
+        faiss.read_index(os.path.join(persist_dir, DOCUMENT_INDEX_FILE)),
+        chunks["doc_ids"], chunks["offsets"], chunks["chunk_ids"])
+
+
+def search(document_index: DocumentIndex, float_index: faiss.Index,
+           query: np.ndarray, top_k: int,
+           top_documents: int = TOP_DOCUMENTS,
+           max_per_document: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Search the nearest documents, then the chunks of these documents.
+
+    The chunks of the top_documents documents with the nearest centroids
+    are scored exactly by inner product. With max_per_document, at most
+    that many chunks of a document are returned.
+
+    Returns the IDs and the scores of the top_k chunks.
+    """
+    query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+    _, documents = document_index.index.search(query, top_documents)
+    documents = documents[0][documents[0] >= 0]
+    if not len(documents):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    candidates = np.concatenate(
+        [document_index.chunks(document) for document in documents])
+    owners = np.concatenate(
+        [np.full(len(document_index.chunks(document)), document)
+         for document in documents])
+    scores = float_index.reconstruct_batch(candidates) @ query[0]
+    order = np.argsort(-scores, kind="stable")
+    if max_per_document:
+        counts: Dict[int, int] = {}
+        kept = []
+        for i in order:
+            counts[owners[i]] = counts.get(owners[i], 0) + 1
+            if counts[owners[i]] <= max_per_document:
+                kept.append(i)
+        order = np.array(kept, dtype=np.int64)
+    order = order[:top_k]
+    return candidates[order], scores[order]
+
+
+class DocumentRetriever(BaseRetriever):
+    """Retriever of a FAISS vector index searching its documents first."""
+
+    def __init__(self, vector_index: VectorStoreIndex,
+                 document_index: DocumentIndex, similarity_top_k: int,
+                 top_documents: int = TOP_DOCUMENTS,
+                 max_per_document: int = 0, **kwargs: Any):
+        self._vector_index = vector_index
+        self._document_index = document_index
+        self._similarity_top_k = similarity_top_k
+        self._top_documents = top_documents
+        self._max_per_document = max_per_document
+        super().__init__(**kwargs)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding
+        if embedding is None:
+            embedding = self._vector_index._embed_model.get_query_embedding(
+                query_bundle.query_str)
+
+        ids, scores = search(
+            self._document_index, self._vector_index.vector_store.client,
+            np.array(embedding), self._similarity_top_k,
+            self._top_documents, self._max_per_document)
+
+        nodes_dict = self._vector_index.index_struct.nodes_dict
+        nodes = self._vector_index.docstore.get_nodes(
+            [nodes_dict[str(i)] for i in ids])
+        return [NodeWithScore(node=node, score=float(score))
+                for node, score in zip(nodes, scores)]
@@ -13,36 +13,81 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from lightspeed_rag_content import arrow_dataset
+from lightspeed_rag_content import binary_index
+from lightspeed_rag_content import dimension_reduction
+from lightspeed_rag_content import document_index
+from lightspeed_rag_content import embeddings
+from lightspeed_rag_content import pgvector_search
+from lightspeed_rag_content import publish
+from lightspeed_rag_content import versions
+from lightspeed_rag_content.checkpoint import EmbeddingCheckpoint
+from lightspeed_rag_content.file_selection import FileSelector, list_files
 from lightspeed_rag_content.metadata_processor import MetadataProcessor
+from lightspeed_rag_content.node_store import NodeStore
+from lightspeed_rag_content.pipeline import Pipeline, Stage
+from lightspeed_rag_content.progress import Progress
 
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
 import os
 from pathlib import Path
 import time
 from typing import Dict, List
+import uuid
 
 import faiss
 from llama_index.core import Settings, SimpleDirectoryReader, VectorStoreIndex
+from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.llms.utils import resolve_llm
-from llama_index.core.schema import TextNode
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import (
+    Document, MetadataMode, NodeRelationship, TextNode)
 from llama_index.core.storage.storage_context import StorageContext
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.faiss import FaissVectorStore
 from llama_index.vector_stores.postgres import PGVectorStore
+import numpy as np
 
 LOG = logging.getLogger(__name__)
 
 DocumentSettings = namedtuple(
     'DocumentSettings', ['settings', 'embedding_dimension', 'storage_context'])
 
+# Namespace of the document and node IDs, which are UUIDs derived from the
+# content so that identical inputs always produce identical indexes
+ID_NAMESPACE = uuid.UUID("1c0a2f4e-4a4b-5d6c-9e8f-7a6b5c4d3e2f")
+
+# Number of nodes of a compact node store created and indexed at once
+INSERT_BATCH_SIZE = 2048
+
+
+def stable_id(*parts: str) -> str:
+    """Return an UUID derived from the given strings."""
+    return str(uuid.uuid5(ID_NAMESPACE, "\0".join(parts)))
+
+
+def _node_id(i: int, doc: Document) -> str:
+    """Return the ID of the i-th node split from a document."""
+    return stable_id(doc.id_, str(i))
+
 
 class DocumentProcessor(object):
 
     def __init__(self, chunk_size: int, chunk_overlap: int, model_name: str,
                  embeddings_model_dir: Path, num_workers: int = 0,
-                 vector_store_type: str = "faiss", table_name: str = "table_name"):
+                 vector_store_type: str = "faiss", table_name: str = "table_name",
+                 embedding_backend: str = "torch", onnx_file: str | None = None,
+                 checkpoint_batch_size: int = 0, resume: bool = False,
+                 pipelined: bool = False,
+                 dimension_reduction: str | None = None,
+                 reduced_dimension: int = 0, binary_index: bool = False,
+                 export_format: str | None = None,
+                 embed_model: BaseEmbedding | None = None,
+                 embed_batch_size: int = 0, publish: bool = False,
+                 compact_nodes: bool = False, document_index: bool = False,
+                 progress: Progress | None = None, reproducible: bool = False):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.model_name = model_name
@@ -50,59 +95,115 @@ class DocumentProcessor(object):
         self.num_workers = num_workers
         self.vector_store_type = vector_store_type
         self.table_name = table_name
+        self.embedding_backend = embedding_backend
+        self.onnx_file = onnx_file
+        self.checkpoint_batch_size = checkpoint_batch_size
+        self.resume = resume
+        self.pipelined = pipelined
+        self.dimension_reduction = dimension_reduction
+        self.reduced_dimension = reduced_dimension
+        self.binary_index = binary_index
+        self.export_format = export_format
+        self.embed_model = embed_model
+        self.embed_batch_size = embed_batch_size
+        self.publish = publish
+        self.compact_nodes = compact_nodes
+        self.document_index = document_index
+        # Progress of the build, not tracked by default
+        self.progress = progress or Progress()
+        self.reproducible = reproducible
 
         if self.num_workers <= 0:
             self.num_workers = None
 
-        # List of good nodes
-        self._good_nodes = []
+        # List of good nodes, or their compact store
+        self._good_nodes = NodeStore() if self.compact_nodes else []
         # Total number of embedded files
         self._num_embedded_files = 0
         # Start of time, used to calculate the execution time
         self._start_time = time.time()
+        # Metrics of the stages of the last pipelined process() call
+        self.pipeline_metrics: List[Dict] = []
+        # Dimension and measured recall of the reduced embeddings
+        self._reduction_metadata: Dict = {}
+        # Path of every loaded document, relative to its docs directory
+        self._doc_paths: Dict[str, str] = {}
+        # Unique nodes of the versioned documents, by path and content, or
+        # their ID once they are in the compact node store
+        self._versioned_nodes: Dict[str, TextNode | str] = {}
+        # Versions of the processed documents
+        self._versions: List[str] = []
+        # Stats of the files selected in every directory with a selector
+        self._selection_stats: List[Dict] = []
+
+        # A given embedding model is not loaded from the model directory
+        if self.embed_model is None:
+            os.environ["HF_HOME"] = self.embeddings_model_dir
+            os.environ["TRANSFORMERS_OFFLINE"] = "1"
 
-        os.environ["HF_HOME"] = self.embeddings_model_dir
-        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+        if self.binary_index and self.vector_store_type != "faiss":
+            raise RuntimeError("A binary index requires the faiss vector store")
+        if self.document_index and self.vector_store_type != "faiss":
+            raise RuntimeError(
+                "A document index requires the faiss vector store")
+        if self.pipelined and (self.checkpoint_batch_size > 0
+                               or self.resume):
+            # The pipeline embeds the nodes before the output folder holding
+            # the checkpoint is known
+            raise RuntimeError(
+                "Checkpoints and resuming are not supported by the pipelined "
+                "processing")
+        if (self.export_format is not None
+                and self.export_format not in arrow_dataset.EXPORT_FORMATS):
+            raise RuntimeError(f"Unknown export format: {self.export_format}")
 
         self._settings = self._get_settings()
 
+        if self.dimension_reduction is not None and not (
+                0 < self.reduced_dimension
+                < self._settings.embedding_dimension):
+            raise RuntimeError(
+                f"Invalid reduced dimension {self.reduced_dimension} for "
+                f"embeddings of dimension {self._settings.embedding_dimension}")
+
     def _get_settings(self) -> namedtuple:
-        Settings.chunk_size = self.chunk_size
-        Settings.chunk_overlap = self.chunk_overlap
-        Settings.embed_model = HuggingFaceEmbedding(
-            model_name=self.embeddings_model_dir)
+        Settings.text_splitter = SentenceSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            id_func=_node_id)
+        if self.embed_model is not None:
+            Settings.embed_model = self.embed_model
+        else:
+            Settings.embed_model = embeddings.get_embedding_model(
+                self.embeddings_model_dir, self.embedding_backend,
+                self.onnx_file)
+        if self.embed_batch_size > 0:
+            Settings.embed_model.embed_batch_size = self.embed_batch_size
         Settings.llm = resolve_llm(None)
 
-        embedding_dimension = len(
-            Settings.embed_model.get_text_embedding("random text"))
+        embedding_dimension = embeddings.embedding_dimension(
+            Settings.embed_model)
+        storage_context = self._get_storage_context(embedding_dimension)
+
+        return DocumentSettings(Settings, embedding_dimension, storage_context)
+
+    def _get_storage_context(self, embedding_dimension: int) -> StorageContext:
+        """Create the storage context with an empty vector store."""
         if self.vector_store_type == "faiss":
             faiss_index = faiss.IndexFlatIP(embedding_dimension)
             vector_store = FaissVectorStore(faiss_index=faiss_index)
         elif self.vector_store_type == "postgres":
-            user = os.getenv("POSTGRES_USER")
-            password = os.getenv("POSTGRES_PASSWORD")
-            host = os.getenv("POSTGRES_HOST")
-            port = os.getenv("POSTGRES_PORT")
-            database = os.getenv("POSTGRES_DATABASE")
-
             table_name = self.table_name
 
             vector_store = PGVectorStore.from_params(
-                database=database,
-                host=host,
-                password=password,
-                port=port,
-                user=user,
                 table_name=table_name,
                 embed_dim=embedding_dimension,  # openai embedding dimension
+                **pgvector_search.connection_params(),
             )
         else:
             raise RuntimeError(f"Unknown vector store type: {self.vector_store_type}")
 
-        storage_context = StorageContext.from_defaults(
-            vector_store=vector_store)
-
-        return DocumentSettings(Settings, embedding_dimension, storage_context)
+        return StorageContext.from_defaults(vector_store=vector_store)
 
     def _got_whitespace(self, text: str) -> bool:
         """Indicate if the parameter string contains whitespace."""
@@ -122,52 +223,458 @@ class DocumentProcessor(object):
                 LOG.debug("Skipping node without whitespace: %s", repr(node))
         return good_nodes
 
+    def _merge_version(self, nodes: List[TextNode],
+                       version: str) -> List[TextNode]:
+        """Tag the nodes with their version, dropping known chunks.
+
+        A chunk with the same content in the same document of another
+        version is stored once, tagged with all its versions and their
+        docs URLs. Its SOURCE relationship stays the document of the first
+        version containing it. The PREVIOUS and NEXT relationships of the
+        new nodes pointing to dropped chunks are relinked to the stored
+        chunks with the same content.
+
+        Returns the nodes not seen in previous versions.
+        """
+        new_nodes = []
+        # IDs of the stored nodes replacing the dropped ones
+        stored_ids: Dict[str, str] = {}
+        for node in nodes:
+            versions.exclude_version_metadata(node)
+            key = stable_id(self._doc_paths[node.ref_doc_id],
+                            node.get_content(metadata_mode=MetadataMode.EMBED))
+            known_node = self._versioned_nodes.get(key)
+            if known_node is None:
+                known_node = self._versioned_nodes[key] = node
+                new_nodes.append(node)
+            else:
+                stored_ids[node.node_id] = (
+                    known_node if isinstance(known_node, str)
+                    else known_node.node_id)
+            if isinstance(known_node, str):
+                # The stored node is a copy, its metadata is written back
+                position = self._good_nodes.position(known_node)
+                known_node = self._good_nodes[position]
+                versions.tag_node(known_node, version,
+                                  node.metadata.get("docs_url"))
+                self._good_nodes.set_metadata(position, known_node.metadata)
+            else:
+                versions.tag_node(known_node, version,
+                                  node.metadata.get("docs_url"))
+        for node in new_nodes:
+            for relationship in (NodeRelationship.PREVIOUS,
+                                 NodeRelationship.NEXT):
+                info = node.relationships.get(relationship)
+                if info is not None and info.node_id in stored_ids:
+                    node.relationships[relationship] = info.copy(
+                        update={"node_id": stored_ids[info.node_id]})
+        LOG.info("Version %s: %d new nodes, %d nodes shared with other "
+                 "versions", version, len(new_nodes),
+                 len(nodes) - len(new_nodes))
+        return new_nodes
+
+    def _embed_nodes(self, checkpoint: EmbeddingCheckpoint | None) -> None:
+        """Embed the good nodes, persisting every batch to the checkpoint."""
+        completed = {}
+        if checkpoint is not None and self.resume:
+            completed = checkpoint.load()
+        elif checkpoint is not None:
+            checkpoint.clear()
+
+        # Positions of the nodes to embed, nodes of a compact store are only
+        # created for the batch being embedded
+        compact = isinstance(self._good_nodes, NodeStore)
+        pending = []
+        for position in range(len(self._good_nodes)):
+            if compact and self._good_nodes.is_embedded(position):
+                continue
+            node = self._good_nodes[position]
+            if node.embedding is not None:
+                continue
+            key = checkpoint.node_key(node) if completed else None
+            if key in completed:
+                self._set_embedding(position, node, completed[key])
+            else:
+                pending.append(position)
+        LOG.info("Resumed %d embedded nodes, %d nodes left to embed",
+                 len(self._good_nodes) - len(pending), len(pending))
+        self.progress.add_total("nodes-embedded", len(pending))
+
+        embed_model = self._settings.settings.embed_model
+        batch_size = self.checkpoint_batch_size or embed_model.embed_batch_size
+        for i in range(0, len(pending), batch_size):
+            positions = pending[i:i + batch_size]
+            batch = [self._good_nodes[position] for position in positions]
+            vectors = embed_model.get_text_embedding_batch(
+                [node.get_content(metadata_mode=MetadataMode.EMBED)
+                 for node in batch])
+            for position, node, vector in zip(positions, batch, vectors):
+                self._set_embedding(position, node, vector)
+            self.progress.add("nodes-embedded", len(batch))
+            if checkpoint is not None:
+                checkpoint.save_batch(batch)
+
+    def _set_embedding(self, position: int, node: TextNode,
+                       embedding: List[float]) -> None:
+        """Set the embedding of a good node, in the node store if any."""
+        node.embedding = embedding
+        if isinstance(self._good_nodes, NodeStore):
+            self._good_nodes.set_embedding(position, embedding)
+
+    def _add_nodes(self, nodes: List[TextNode]) -> None:
+        """Add nodes to the good nodes."""
+        self._good_nodes.extend(nodes)
+        if isinstance(self._good_nodes, NodeStore):
+            # Stored nodes are copies, versions are then tagged in the store
+            for key, node in self._versioned_nodes.items():
+                if not isinstance(node, str):
+                    self._versioned_nodes[key] = node.node_id
+
+    def _reduce_dimension(self, persist_folder: str) -> None:
+        """Reduce the dimension of the embedded nodes.
+
+        The transform is persisted next to the index, so that queries can
+        be transformed the same way, and the vector store is replaced by
+        one of the reduced dimension.
+        """
+        compact = isinstance(self._good_nodes, NodeStore)
+        if compact:
+            vectors = self._good_nodes.embeddings()
+        else:
+            vectors = np.array([node.embedding for node in self._good_nodes],
+                               dtype=np.float32)
+        transform = dimension_reduction.fit_transform(
+            self.dimension_reduction, vectors, self.reduced_dimension)
+        reduced = dimension_reduction.apply_transform(transform, vectors)
+        if compact:
+            self._good_nodes.set_embeddings(reduced)
+        else:
+            for node, vector in zip(self._good_nodes, reduced):
+                node.embedding = vector.tolist()
+        dimension_reduction.save_transform(transform, persist_folder)
+
+        self._reduction_metadata = {
+            "method": self.dimension_reduction,
+            "original-dimension": self._settings.embedding_dimension,
+            f"recall@{dimension_reduction.RECALL_TOP_K}":
+                dimension_reduction.measure_recall(vectors, reduced),
+        }
+        LOG.info("Dimension reduction: %s", self._reduction_metadata)
+        self._settings = self._settings._replace(
+            embedding_dimension=self.reduced_dimension,
+            storage_context=self._get_storage_context(self.reduced_dimension))
+
     def _save_index(self, index: str, persist_folder: str) -> None:
         """Create and save the Vector Store Index"""
-        idx = VectorStoreIndex(
-            self._good_nodes,
-            storage_context=self._settings.storage_context,
-        )
+        checkpoint = EmbeddingCheckpoint(persist_folder)
+        if self.checkpoint_batch_size > 0:
+            self._embed_nodes(checkpoint)
+        if self.dimension_reduction is not None:
+            # The transform is fitted on the embeddings of all nodes
+            self._embed_nodes(None)
+            self._reduce_dimension(persist_folder)
+        elif (self.export_format is not None or self.compact_nodes
+              or self.progress.enabled):
+            # The exported embeddings are the ones of the index, stored
+            # nodes are embedded in place before being indexed, and the
+            # progress of the embedding is only tracked here
+            self._embed_nodes(None)
+
+        if self.compact_nodes:
+            # Nodes are created batch by batch, only their serialized form
+            # is kept by the docstore
+            idx = VectorStoreIndex(
+                [], storage_context=self._settings.storage_context)
+            for start in range(0, len(self._good_nodes), INSERT_BATCH_SIZE):
+                idx.insert_nodes([
+                    self._good_nodes[position] for position in range(
+                        start, min(start + INSERT_BATCH_SIZE,
+                                   len(self._good_nodes)))])
+        else:
+            idx = VectorStoreIndex(
+                self._good_nodes,
+                storage_context=self._settings.storage_context,
+            )
         idx.set_index_id(index)
         idx.storage_context.persist(persist_dir=persist_folder)
+        if self.binary_index:
+            binary_index.save_binary_index(
+                idx.storage_context.vector_store.client, persist_folder)
+        if self.document_index:
+            document_index.save_document_index(
+                idx.storage_context.vector_store.client,
+                idx.index_struct.nodes_dict, idx.docstore, persist_folder)
+        if self.export_format is not None:
+            # The dataset is built column by column from all the nodes
+            arrow_dataset.write_dataset(
+                list(self._good_nodes), persist_folder, self.export_format,
+                index)
+
+        # The index is complete, the checkpoint is not needed anymore
+        checkpoint.clear()
 
     def _save_metadata(self, index, persist_folder) -> None:
         """Create and save the metadata"""
+        execution_time = time.time() - self._start_time
+        LOG.info("Execution time: %f", execution_time)
         metadata: dict = {}
-        metadata["execution-time"] = time.time() - self._start_time
+        # Reproducible builds of identical inputs have identical metadata
+        if not self.reproducible:
+            metadata["execution-time"] = execution_time
         metadata["llm"] = "None"
         metadata["embedding-model"] = self.model_name
+        metadata["embedding-backend"] = self.embedding_backend
         metadata["index-id"] = index
         if self.vector_store_type == "faiss":
             metadata["vector-db"] = "faiss.IndexFlatIP"
         elif self.vector_store_type == "postgres":
             metadata["vector-db"] = "PGVectorStore"
         metadata["embedding-dimension"] = self._settings.embedding_dimension
+        if self.binary_index:
+            metadata["binary-vector-db"] = "faiss.IndexBinaryFlat"
+        if self.document_index:
+            metadata["document-vector-db"] = "faiss.IndexFlatIP"
+        if self._reduction_metadata:
+            metadata["dimension-reduction"] = self._reduction_metadata
+        if self._versions:
+            metadata["versions"] = self._versions
+        if self._selection_stats:
+            metadata["file-selection"] = self._selection_stats
+        if self.export_format is not None:
+            metadata["node-dataset"] = arrow_dataset.DATASET_FILES[
+                self.export_format]
         metadata["chunk"] = self.chunk_size
         metadata["overlap"] = self.chunk_overlap
         metadata["total-embedded-files"] = self._num_embedded_files
         with open(os.path.join(persist_folder, "metadata.json"), "w") as file:
             file.write(json.dumps(metadata))
 
+    def _list_files(self, docs_dir: Path, required_exts: List[str] | None,
+                    selector: FileSelector | None = None) -> List[str]:
+        """List the files to load, sorted.
+
+        Without a selector, all the non-hidden files of the directory tree
+        are loaded.
+        """
+        if selector is None:
+            input_files = list_files(docs_dir, required_exts)
+        else:
+            input_files, stats = selector.select(docs_dir, required_exts)
+            # Only the folder name, the metadata must not depend on where
+            # the documents are
+            stats = {"folder": os.path.basename(os.path.abspath(docs_dir)),
+                     **stats}
+            LOG.info("Selected files: %s", stats)
+            self._selection_stats.append(stats)
+        if not input_files:
+            raise ValueError(f"No files found in {docs_dir}.")
+        self.progress.add_total("files-loaded", len(input_files))
+        return sorted(input_files)
+
+    def _load_file(self, docs_dir: Path, input_file: str,
+                   metadata: MetadataProcessor,
+                   file_extractor: Dict) -> List[Document]:
+        """Read a file, attaching its metadata.
+
+        Documents get IDs derived from their path relative to docs_dir and
+        from their content.
+        """
+        docs = SimpleDirectoryReader.load_file(
+            Path(input_file), metadata.populate, file_extractor)
+        rel_path = os.path.relpath(input_file, os.path.abspath(docs_dir))
+        for part, doc in enumerate(docs):
+            doc.id_ = stable_id(rel_path, str(part), doc.hash)
+            self._doc_paths[doc.id_] = rel_path
+        self.progress.add("files-loaded")
+        return docs
+
+    def _load_documents(self, docs_dir: Path, input_files: List[str],
+                        metadata: MetadataProcessor,
+                        file_extractor: Dict | None) -> List[Document]:
+        """Read the files concurrently, in the order of input_files."""
+        file_extractor = file_extractor or {}
+
+        def load_file(input_file: str) -> List[Document]:
+            return self._load_file(
+                docs_dir, input_file, metadata, file_extractor)
+
+        # Reading files is I/O bound, threads avoid the cost of spawning
+        # processes and of pickling the metadata processor
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            return [doc for docs in executor.map(load_file, input_files)
+                    for doc in docs]
+
+    def _process_pipelined(self, docs_dir: Path, input_files: List[str],
+                           metadata: MetadataProcessor,
+                           file_extractor: Dict | None,
+                           version: str | None = None) -> None:
+        """Read, split and embed the files in concurrent stages.
+
+        The metadata of a file is computed when the file is read, in the
+        threads of the read stage. The embedded nodes are collected in the
+        same order as process() would produce them.
+        """
+        file_extractor = file_extractor or {}
+        text_splitter = self._settings.settings.text_splitter
+        embed_model = self._settings.settings.embed_model
+        # Position of every document, used to restore the order of nodes
+        doc_order: Dict[str, tuple] = {}
+        self._track_metadata(metadata)
+
+        def read(item: tuple) -> List[List[Document]]:
+            index, input_file = item
+            docs = self._load_file(
+                docs_dir, input_file, metadata, file_extractor)
+            for part, doc in enumerate(docs):
+                doc_order[doc.id_] = (index, part)
+            return [docs]
+
+        def split(docs: List[Document]) -> List[TextNode]:
+            nodes = self._filter_out_invalid_nodes(
+                text_splitter.get_nodes_from_documents(docs))
+            self.progress.add("nodes-split", len(nodes))
+            if version is not None:
+                # Known chunks are not embedded again
+                nodes = self._merge_version(nodes, version)
+            self.progress.add_total("nodes-embedded", len(nodes))
+            return nodes
+
+        def embed(nodes: List[TextNode]) -> List[TextNode]:
+            vectors = embed_model.get_text_embedding_batch(
+                [node.get_content(metadata_mode=MetadataMode.EMBED)
+                 for node in nodes])
+            for node, vector in zip(nodes, vectors):
+                node.embedding = vector
+            self.progress.add("nodes-embedded", len(nodes))
+            return nodes
+
+        pipeline = Pipeline([
+            Stage("read", read,
+                  workers=self.num_workers or min(32, os.cpu_count() + 4)),
+            Stage("split", split),
+            Stage("embed", embed, batch_size=embed_model.embed_batch_size),
+        ])
+        nodes = pipeline.run(enumerate(input_files))
+        # Nodes of a document keep their order through the single-threaded
+        # split and embed stages, documents may be read out of order
+        nodes.sort(key=lambda node: doc_order[node.ref_doc_id])
+
+        self.pipeline_metrics = pipeline.metrics()
+        for stage in self.pipeline_metrics:
+            LOG.info("Pipeline stage %(stage)s: %(processed)d items, "
+                     "%(busy-seconds).1fs busy, queue depth mean "
+                     "%(queue-depth-mean).1f max %(queue-depth-max)d", stage)
+
+        self._add_nodes(nodes)
+        self._num_embedded_files += len(doc_order)
+
+    def _track_metadata(self, metadata: MetadataProcessor) -> None:
+        """Count the URL checks of a metadata processor with the build."""
+        if self.progress.enabled:
+            metadata.progress = self.progress
+
+    def load(self, docs_dir: Path, metadata: MetadataProcessor,
+             required_exts: List[str] | None = None,
+             file_extractor: Dict | None = None,
+             selector: FileSelector | None = None) -> List[Document]:
+        """Load the documents of a directory with their metadata."""
+        input_files = self._list_files(docs_dir, required_exts, selector)
+
+        # Compute titles and URLs of all files before loading them
+        self._track_metadata(metadata)
+        metadata.prefetch(input_files)
+
+        return self._load_documents(
+            docs_dir, input_files, metadata, file_extractor)
+
     def process(self, docs_dir: Path, metadata: MetadataProcessor,
                 required_exts: List[str] | None = None,
-                file_extractor: Dict | None = None) -> None:
-        reader = SimpleDirectoryReader(
-            docs_dir,
-            recursive=True,
-            file_metadata=metadata.populate,
-            required_exts=required_exts,
-            file_extractor=file_extractor)
+                file_extractor: Dict | None = None,
+                version: str | None = None,
+                selector: FileSelector | None = None) -> None:
+        """Load and split the documents of a directory.
+
+        Args:
+            docs_dir: directory of the documents
+            metadata: metadata processor of the documents
+            required_exts: extensions of the files to load, all if None
+            file_extractor: readers of the files by extension
+            version: version of the documents, chunks shared by several
+                versions are then stored and embedded once, tagged with
+                their versions
+            selector: selector of the files to load, instead of all the
+                files of the directory
+        """
+        if version is not None and version not in self._versions:
+            self._versions.append(version)
+        if self.pipelined:
+            self._process_pipelined(
+                docs_dir,
+                self._list_files(docs_dir, required_exts, selector),
+                metadata, file_extractor, version)
+            return
 
         # Create chunks/nodes
-        docs = reader.load_data(num_workers=self.num_workers)
+        docs = self.load(docs_dir, metadata, required_exts, file_extractor,
+                         selector)
         nodes = self._settings.settings.text_splitter.get_nodes_from_documents(
             docs)
-        self._good_nodes.extend(self._filter_out_invalid_nodes(nodes))
+        nodes = self._filter_out_invalid_nodes(nodes)
+        self.progress.add("nodes-split", len(nodes))
+        if version is not None:
+            nodes = self._merge_version(nodes, version)
+        self._add_nodes(nodes)
 
         # Count embedded files and unreachables nodes
         self._num_embedded_files += len(docs)
 
+    @property
+    def nodes(self) -> List[TextNode] | NodeStore:
+        """Nodes of the processed documents."""
+        return self._good_nodes
+
+    @property
+    def num_embedded_files(self) -> int:
+        """Number of processed files."""
+        return self._num_embedded_files
+
+    @property
+    def embedding_model(self) -> BaseEmbedding:
+        """Model embedding the nodes, the given one or the loaded one."""
+        return self._settings.settings.embed_model
+
+    def doc_path(self, doc_id: str) -> str:
+        """Return the path of a loaded document, relative to its docs_dir."""
+        return self._doc_paths[doc_id]
+
+    def split(self, docs: List[Document], chunk_size: int,
+              chunk_overlap: int) -> List[TextNode]:
+        """Split documents into valid nodes, without adding them.
+
+        The node IDs are the ones process() would give with these chunking
+        settings.
+        """
+        splitter = SentenceSplitter(chunk_size=chunk_size,
+                                    chunk_overlap=chunk_overlap,
+                                    id_func=_node_id)
+        return self._filter_out_invalid_nodes(
+            splitter.get_nodes_from_documents(docs))
+
+    def embed(self) -> None:
+        """Embed the nodes without embedding, without saving an index."""
+        self._embed_nodes(None)
+
     def save(self, index: str, output_dir: str) -> None:
-        self._save_index(index, output_dir)
-        self._save_metadata(index, output_dir)
+        """Save the index and its metadata to output_dir.
+
+        When publishing, the index is saved to a staging directory, then
+        output_dir is atomically replaced by a symlink to it.
+        """
+        persist_folder = output_dir
+        if self.publish:
+            persist_folder = publish.prepare_staging(output_dir)
+        self._save_index(index, persist_folder)
+        self._save_metadata(index, persist_folder)
+        if self.publish:
+            publish.publish(persist_folder, output_dir)
+        self.progress.finish()
@@ -0,0 +1,218 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import logging
+import os
+import time
+from typing import Any, List
+
+import numpy as np
+from llama_index.core.base.embeddings.base import (
+    DEFAULT_EMBED_BATCH_SIZE, BaseEmbedding)
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from transformers import AutoTokenizer
+
+from lightspeed_rag_content.prepared_model import PreparedEmbedding
+
+LOG = logging.getLogger(__name__)
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "prepared")
+
+# Directory of the ONNX export inside a sentence-transformers model repo
+ONNX_DIR = "onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_qint8.onnx"
+
+# Sentences used to compare the output of two embedding backends
+PARITY_TEXTS = [
+    "What is OpenShift?",
+    "How do I scale the number of replicas of a deployment?",
+    "The cluster monitoring operator manages the Prometheus stack.",
+    "Configure persistent storage using local volumes.",
+]
+
+
+def _import_onnxruntime() -> Any:
+    """Import onnxruntime, which is an optional dependency."""
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise RuntimeError(
+            "The onnx embedding backend requires the onnxruntime package, "
+            "install it with: pip install onnxruntime") from e
+    return onnxruntime
+
+
+def _read_json(path: str) -> dict:
+    """Read a JSON file, return an empty dict if it does not exist."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+class OnnxEmbedding(BaseEmbedding):
+    """Embedding model running the ONNX export with ONNX Runtime on CPU.
+
+    The pooling and the maximum sequence length are read from the
+    sentence-transformers configuration files stored in the model
+    directory, so the produced vectors match `HuggingFaceEmbedding`.
+    """
+
+    max_length: int = Field(description="Maximum length of input.", gt=0)
+    normalize: bool = Field(default=True, description="Normalize embeddings.")
+    pooling: str = Field(default="mean", description="Pooling mode.")
+
+    _session: Any = PrivateAttr()
+    _tokenizer: Any = PrivateAttr()
+    _input_names: List[str] = PrivateAttr()
+
+    def __init__(self, model_dir: str, onnx_file: str = ONNX_MODEL_FILE,
+                 normalize: bool = True,
+                 embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+                 num_threads: int = 0, **kwargs: Any):
+        onnxruntime = _import_onnxruntime()
+
+        st_config = _read_json(
+            os.path.join(model_dir, "sentence_bert_config.json"))
+        pooling_config = _read_json(
+            os.path.join(model_dir, "1_Pooling", "config.json"))
+        pooling = "cls" if pooling_config.get(
+            "pooling_mode_cls_token") else "mean"
+
+        options = onnxruntime.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, ONNX_DIR, onnx_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"])
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        super().__init__(
+            model_name=model_dir,
+            embed_batch_size=embed_batch_size,
+            max_length=st_config.get("max_seq_length",
+                                     tokenizer.model_max_length),
+            normalize=normalize,
+            pooling=pooling,
+            **kwargs)
+
+        self._session = session
+        self._tokenizer = tokenizer
+        self._input_names = [i.name for i in session.get_inputs()]
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "OnnxEmbedding"
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Tokenize and embed a batch of texts."""
+        encoded = self._tokenizer(
+            texts, padding=True, truncation=True,
+            max_length=self.max_length, return_tensors="np")
+        inputs = {name: encoded[name].astype(np.int64)
+                  for name in self._input_names if name in encoded}
+        token_embeddings = self._session.run(None, inputs)[0]
+
+        if self.pooling == "cls":
+            embeddings = token_embeddings[:, 0]
+        else:
+            mask = encoded["attention_mask"][..., np.newaxis].astype(
+                token_embeddings.dtype)
+            embeddings = ((token_embeddings * mask).sum(axis=1)
+                          / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        if self.normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        return embeddings.tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts)
+
+
+def get_embedding_model(model_dir: str, backend: str = "torch",
+                        onnx_file: str | None = None) -> BaseEmbedding:
+    """Create the embedding model for the selected backend.
+
+    Args:
+        model_dir: directory containing the downloaded embedding model
+        backend: one of EMBEDDING_BACKENDS
+        onnx_file: ONNX file inside the onnx/ directory of the model, for
+            example model_qint8.onnx for the int8-quantized export
+    """
+    start = time.perf_counter()
+    if backend == "torch":
+        embed_model = HuggingFaceEmbedding(model_name=model_dir)
+    elif backend == "onnx":
+        embed_model = OnnxEmbedding(
+            model_dir, onnx_file=onnx_file or ONNX_MODEL_FILE)
+    elif backend == "prepared":
+        embed_model = PreparedEmbedding(model_dir)
+    else:
+        raise RuntimeError(f"Unknown embedding backend: {backend}")
+    LOG.info("Loaded the %s embedding model in %.3fs", backend,
+             time.perf_counter() - start)
+    return embed_model
+
+
+def embedding_dimension(embed_model: BaseEmbedding) -> int:
+    """Return the dimension of the embeddings of a model.
+
+    The dimension of a prepared model is read from its artifact, other
+    models embed a text.
+    """
+    if isinstance(embed_model, PreparedEmbedding):
+        return embed_model.dimension
+    return len(embed_model.get_text_embedding("random text"))
+
+
+def check_embedding_parity(reference: BaseEmbedding, candidate: BaseEmbedding,
+                           tolerance: float,
+                           texts: List[str] | None = None) -> float:
+    """Compare the vectors produced by two embedding models.
+
+    Returns the largest cosine distance between the reference and the
+    candidate vectors and raises RuntimeError when it exceeds tolerance.
+    """
+    texts = texts or PARITY_TEXTS
+    expected = np.asarray(reference.get_text_embedding_batch(texts))
+    actual = np.asarray(candidate.get_text_embedding_batch(texts))
+    if expected.shape != actual.shape:
+        raise RuntimeError(
+            f"Embedding shapes differ: {expected.shape} != {actual.shape}")
+
+    cosine = (expected * actual).sum(axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1))
+    distance = float(np.max(1.0 - cosine))
+    LOG.info("Maximum cosine distance between embedding backends: %f",
+             distance)
+    if distance > tolerance:
+        raise RuntimeError(
+            f"Embedding backends differ by {distance}, above the tolerance "
+            f"of {tolerance}")
+    return distance
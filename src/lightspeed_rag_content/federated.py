@@ -0,0 +1,131 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+from llama_index.core import VectorStoreIndex, load_index_from_storage
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.storage.storage_context import StorageContext
+from llama_index.vector_stores.faiss import FaissVectorStore
+import numpy as np
+
+from lightspeed_rag_content import dimension_reduction
+
+NORMALIZATIONS = ("minmax", "none")
+
+# Index searched by a FederatedRetriever, its scores are multiplied by the
+# weight and its query embeddings reduced by the transform, if any
+FederatedIndex = namedtuple(
+    "FederatedIndex", ["name", "retriever", "weight", "transform"])
+
+
+def load_index(db_path: str, index_id: str) -> VectorStoreIndex:
+    """Load a persisted FAISS vector index."""
+    storage_context = StorageContext.from_defaults(
+        vector_store=FaissVectorStore.from_persist_dir(db_path),
+        persist_dir=db_path,
+    )
+    return load_index_from_storage(storage_context=storage_context,
+                                   index_id=index_id)
+
+
+def federated_index(name: str, db_path: str, index_id: str,
+                    similarity_top_k: int,
+                    weight: float = 1.0) -> FederatedIndex:
+    """Load a persisted index to search with a FederatedRetriever."""
+    vector_index = load_index(db_path, index_id)
+    return FederatedIndex(
+        name, vector_index.as_retriever(similarity_top_k=similarity_top_k),
+        weight, dimension_reduction.load_transform(db_path))
+
+
+def normalize_scores(results: List[List[NodeWithScore]],
+                     weights: List[float],
+                     normalization: str) -> List[List[NodeWithScore]]:
+    """Rescale the scores of the results of every index.
+
+    With "minmax" the best result of an index gets its weight and the
+    worst one 0, so that indexes with different score distributions can be
+    merged. The scores of an index with fewer than two distinct scores,
+    e.g. searched for a single result, cannot be rescaled: the scores of
+    all the indexes are then only multiplied by their weights, like with
+    "none", so that they are still compared.
+    """
+    scores = [[node.score or 0.0 for node in nodes] for nodes in results]
+    if normalization == "minmax" and all(
+            len(set(index_scores)) > 1 for index_scores in scores if
+            index_scores):
+        scores = [[(score - min(index_scores))
+                   / (max(index_scores) - min(index_scores))
+                   for score in index_scores] for index_scores in scores]
+    return [[NodeWithScore(node=node.node, score=score * weight)
+             for node, score in zip(nodes, index_scores)]
+            for nodes, index_scores, weight in zip(results, scores, weights)]
+
+
+class FederatedRetriever(BaseRetriever):
+    """Retriever searching several indexes concurrently.
+
+    The query is embedded once by the shared embedding model, every index
+    is searched in its own thread and the results are merged by their
+    normalized scores. close() stops the threads.
+    """
+
+    def __init__(self, indexes: List[FederatedIndex],
+                 embed_model: BaseEmbedding, similarity_top_k: int,
+                 normalization: str = "minmax", **kwargs: Any):
+        if normalization not in NORMALIZATIONS:
+            raise RuntimeError(f"Unknown normalization: {normalization}")
+        self._indexes = indexes
+        self._embed_model = embed_model
+        self._similarity_top_k = similarity_top_k
+        self._normalization = normalization
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(indexes)),
+            thread_name_prefix="federated-search")
+        super().__init__(**kwargs)
+
+    def _search(self, index: FederatedIndex, query_str: str,
+                embedding: List[float]) -> List[NodeWithScore]:
+        if index.transform is not None:
+            embedding = dimension_reduction.apply_transform(
+                index.transform, np.array([embedding]))[0].tolist()
+        return index.retriever.retrieve(
+            QueryBundle(query_str, embedding=embedding))
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding
+        if embedding is None:
+            embedding = self._embed_model.get_query_embedding(
+                query_bundle.query_str)
+
+        futures = [self._executor.submit(self._search, index,
+                                         query_bundle.query_str, embedding)
+                   for index in self._indexes]
+        results = normalize_scores(
+            [future.result() for future in futures],
+            [index.weight for index in self._indexes], self._normalization)
+        nodes = [node for index_nodes in results for node in index_nodes]
+        # The sort is stable, ties keep the order of the indexes
+        nodes.sort(key=lambda node: node.score, reverse=True)
+        return nodes[:self._similarity_top_k]
+
+    def close(self) -> None:
+        """Stop the search threads."""
+        self._executor.shutdown()
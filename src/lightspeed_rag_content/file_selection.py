@@ -0,0 +1,147 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fnmatch
+import os
+import re
+from typing import Dict, List, Tuple
+
+import yaml
+
+DEFAULT_DISTRO = "openshift-enterprise"
+
+
+def list_files(docs_dir: str,
+               required_exts: List[str] | None = None) -> List[str]:
+    """List the non-hidden files of a directory tree, sorted."""
+    input_files = []
+    # os.walk relies on scandir, so no stat call is made per entry
+    for root, dirs, files in os.walk(os.path.abspath(docs_dir)):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith("."):
+                continue
+            if (required_exts is not None
+                    and os.path.splitext(name)[1] not in required_exts):
+                continue
+            input_files.append(os.path.join(root, name))
+    return sorted(input_files)
+
+
+def node_in_distro(node: Dict, distro: str) -> bool:
+    """Check if a node of a topic map is in a distro."""
+    return node.get("Distros", "") == "" or distro in node.get(
+        "Distros", "").split(",")
+
+
+def topic_map_files(topic_map: str, distro: str = DEFAULT_DISTRO) -> List[str]:
+    """Return the paths of the files of a topic map, without extension.
+
+    Paths are relative to the root of the docs, in the order of the topic
+    map. Topics and groups not in the distro are skipped.
+    """
+    files = []
+    with open(topic_map) as file:
+        stack = [("", node) for node in reversed(
+            [node for node in yaml.safe_load_all(file) if node])]
+    while stack:
+        directory, node = stack.pop()
+        if not node_in_distro(node, distro):
+            continue
+        if "Topics" in node:
+            directory = os.path.join(directory, node["Dir"])
+            stack.extend((directory, topic)
+                         for topic in reversed(node["Topics"]))
+        else:
+            files.append(os.path.join(directory, node["File"]))
+    return files
+
+
+def read_exclude_file(path: str) -> List[str]:
+    """Read the glob patterns of an exclude file, one per line.
+
+    Empty lines and lines starting with # are ignored.
+    """
+    with open(path) as file:
+        lines = [line.strip() for line in file]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def compile_globs(patterns: List[str]) -> re.Pattern | None:
+    """Compile glob patterns into a single regular expression.
+
+    As with fnmatch, * also matches the / of subdirectories.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+class FileSelector(object):
+    """Select the files of a docs directory before they are loaded.
+
+    With a topic map, only the files it lists are candidates and the
+    directory is not walked, so stale files of earlier conversions are
+    ignored. Candidates matching an exclude pattern, relative to the docs
+    directory, or larger than max_size bytes are skipped. Only the size of
+    the candidates is read, no file is opened.
+
+    Args:
+        topic_files: paths listed by the topic map, see topic_map_files
+        extension: extension of the files of the topic map paths
+        exclude: glob patterns of the files to skip
+        max_size: maximum size of the files in bytes, 0 for no limit
+    """
+
+    def __init__(self, topic_files: List[str] | None = None,
+                 extension: str = ".txt", exclude: List[str] | None = None,
+                 max_size: int = 0):
+        self.topic_files = topic_files
+        self.extension = extension
+        self.exclude = compile_globs(exclude or [])
+        self.max_size = max_size
+
+    def select(self, docs_dir: str, required_exts: List[str] | None = None
+               ) -> Tuple[List[str], Dict[str, int]]:
+        """Return the sorted paths of the selected files and the stats."""
+        docs_dir = os.path.abspath(docs_dir)
+        if self.topic_files is not None:
+            # A topic may be listed by several groups
+            candidates = sorted({
+                os.path.join(docs_dir, path + self.extension)
+                for path in self.topic_files
+                if required_exts is None or self.extension in required_exts})
+        else:
+            candidates = list_files(docs_dir, required_exts)
+
+        stats = {"candidates": len(candidates), "selected": 0, "excluded": 0,
+                 "missing": 0, "too-large": 0}
+        selected = []
+        for path in candidates:
+            if self.exclude is not None and self.exclude.match(
+                    os.path.relpath(path, docs_dir)):
+                stats["excluded"] += 1
+                continue
+            try:
+                size = os.stat(path).st_size
+            except FileNotFoundError:
+                stats["missing"] += 1
+                continue
+            if self.max_size and size > self.max_size:
+                stats["too-large"] += 1
+                continue
+            selected.append(path)
+        stats["selected"] = len(selected)
+        return selected, stats
@@ -14,13 +14,20 @@
 #    under the License.
 
 import abc
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import Dict
+from typing import Dict, List
 
 import requests
 
+from lightspeed_rag_content.progress import Progress
+
 LOG = logging.getLogger(__name__)
 
+# Number of threads computing metadata in prefetch(), the work is dominated
+# by waiting for the URL pings
+PREFETCH_WORKERS = 16
+
 
 class MetadataProcessor(object):
     """Metadata processing callback with memory of unreachable URLS.
@@ -30,8 +37,13 @@ class MetadataProcessor(object):
     Projects should make their own metadata processors.
     Specifically, the `url_function` which is meant to derive URL
     from name of a document, is not implemented.
+
+    URL checks are counted by the progress attribute, disabled unless it
+    is set, e.g. by DocumentProcessor.
     """
 
+    progress: Progress = Progress()
+
     def get_file_title(sel, file_path: str) -> str:
         """Extract title from the plaintext doc file."""
         title = ""
@@ -50,15 +62,43 @@ class MetadataProcessor(object):
         except requests.exceptions.RequestException:
             return False
 
+    def prefetch(self, file_paths: List[str],
+                 num_workers: int = PREFETCH_WORKERS) -> None:
+        """Compute the metadata of the files concurrently.
+
+        The results are kept in memory and returned by populate(), so the
+        titles are read and the URLs are pinged once per file, before the
+        documents are loaded.
+
+        Args:
+            file_paths: list of file paths in str
+            num_workers: number of threads computing the metadata
+        """
+        self.progress.add_total("urls-checked", len(file_paths))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = executor.map(self._populate, file_paths)
+            prefetched = dict(zip(file_paths, results))
+        # Derived classes are not required to call __init__
+        if not hasattr(self, "_prefetched"):
+            self._prefetched: Dict[str, Dict] = {}
+        self._prefetched.update(prefetched)
+
     def populate(self, file_path: str) -> Dict:
         """Populate title and metadata with docs URL.
 
         Populate the docs_url and title metadata elements with docs URL
-        and the page's title.
+        and the page's title. Metadata computed by prefetch() is reused.
 
         Args:
             file_path: str: file path in str
         """
+        prefetched = getattr(self, "_prefetched", {})
+        if file_path in prefetched:
+            return prefetched[file_path]
+        return self._populate(file_path)
+
+    def _populate(self, file_path: str) -> Dict:
+        """Compute title and docs URL metadata of a file."""
         docs_url = self.url_function(file_path)
         title = self.get_file_title(file_path)
 
@@ -68,7 +108,10 @@ class MetadataProcessor(object):
             "url": docs_url,
         }
 
-        if not self.ping_url(docs_url):
+        reachable = self.ping_url(docs_url)
+        self.progress.add("urls-checked")
+        if not reachable:
+            self.progress.add("urls-unreachable")
             LOG.warning('URL not reachable: %(url)s (Title: "%(title)s", '
                         'File path: %(file_path)s)', document)
 
@@ -0,0 +1,196 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from array import array
+import json
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from llama_index.core.schema import RelatedNodeInfo, TextNode
+import numpy as np
+
+# Attributes of a node usually shared by all the nodes of a document, they
+# are stored once per distinct combination
+SHARED_FIELDS = ("metadata", "excluded_embed_metadata_keys",
+                 "excluded_llm_metadata_keys", "mimetype", "text_template",
+                 "metadata_template", "metadata_seperator")
+
+
+class _Interner(object):
+    """Table of distinct strings, referenced by their position."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class NodeStore(object):
+    """Compact storage of the text nodes of a build.
+
+    The texts are stored in a single UTF-8 buffer with their offsets, the
+    metadata and the other attributes shared by the nodes of a document
+    are stored once and referenced by every node, and the embeddings fill
+    a float32 matrix. Nodes are stored in the order they are added and
+    TextNode objects are only created when they are read, by position.
+
+    Nodes read from the store are copies, changes must be written back
+    with set_embedding() or set_metadata().
+    """
+
+    def __init__(self):
+        self._text = bytearray()
+        self._text_offsets = array("q", [0])
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        # Start and end character indexes, -1 for None
+        self._char_idx = array("q")
+        self._shared = _Interner()
+        self._shared_codes = array("q")
+        self._metadata = _Interner()
+        # Relationships of every node, their metadata is interned
+        self._relationships: List[str] = []
+        self._embeddings: np.ndarray | None = None
+        self._embedded = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[TextNode]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def _encode_related(self, info: RelatedNodeInfo | List) -> List:
+        if isinstance(info, list):
+            return [self._encode_related(item) for item in info]
+        return {"id": info.node_id, "type": info.node_type, "hash": info.hash,
+                "metadata": self._metadata.code(json.dumps(info.metadata))}
+
+    def _decode_related(self, info: Dict | List) -> RelatedNodeInfo | List:
+        if isinstance(info, list):
+            return [self._decode_related(item) for item in info]
+        return RelatedNodeInfo(
+            node_id=info["id"], node_type=info["type"], hash=info["hash"],
+            metadata=json.loads(self._metadata.values[info["metadata"]]))
+
+    def _shared_code(self, node: TextNode) -> int:
+        return self._shared.code(json.dumps(
+            [getattr(node, field) for field in SHARED_FIELDS]))
+
+    def append(self, node: TextNode) -> None:
+        """Add a node at the end of the store."""
+        if type(node) is not TextNode:
+            raise RuntimeError(
+                f"Only TextNode objects can be stored, not {type(node)}")
+        if node.node_id in self._positions:
+            raise RuntimeError(f"Node {node.node_id} is already stored")
+        position = len(self._ids)
+        self._text.extend(node.text.encode("utf-8"))
+        self._text_offsets.append(len(self._text))
+        self._ids.append(node.node_id)
+        self._positions[node.node_id] = position
+        self._char_idx.extend([
+            -1 if node.start_char_idx is None else node.start_char_idx,
+            -1 if node.end_char_idx is None else node.end_char_idx])
+        self._shared_codes.append(self._shared_code(node))
+        self._relationships.append(json.dumps(
+            {key.value: self._encode_related(info)
+             for key, info in node.relationships.items()}))
+        self._embedded.append(0)
+        if node.embedding is not None:
+            self.set_embedding(position, node.embedding)
+
+    def extend(self, nodes: Iterable[TextNode]) -> None:
+        """Add nodes at the end of the store."""
+        if isinstance(nodes, Sequence) and nodes and (
+                nodes[0].embedding is not None):
+            self._reserve(len(self) + len(nodes), len(nodes[0].embedding))
+        for node in nodes:
+            self.append(node)
+
+    def __getitem__(self, position: int) -> TextNode:
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        shared = json.loads(
+            self._shared.values[self._shared_codes[position]])
+        start, end = self._char_idx[2 * position:2 * position + 2]
+        text = self._text[self._text_offsets[position]:
+                          self._text_offsets[position + 1]].decode("utf-8")
+        relationships = {
+            key: self._decode_related(info) for key, info
+            in json.loads(self._relationships[position]).items()}
+        embedding = None
+        if self._embedded[position]:
+            embedding = self._embeddings[position].tolist()
+        return TextNode(
+            id_=self._ids[position], text=text, embedding=embedding,
+            start_char_idx=None if start < 0 else start,
+            end_char_idx=None if end < 0 else end,
+            relationships=relationships, **dict(zip(SHARED_FIELDS, shared)))
+
+    def position(self, node_id: str) -> int:
+        """Return the position of a node."""
+        return self._positions[node_id]
+
+    def set_metadata(self, position: int, metadata: Dict) -> None:
+        """Replace the metadata of a node."""
+        shared = json.loads(
+            self._shared.values[self._shared_codes[position]])
+        shared[SHARED_FIELDS.index("metadata")] = metadata
+        self._shared_codes[position] = self._shared.code(json.dumps(shared))
+
+    def is_embedded(self, position: int) -> bool:
+        """Indicate if the embedding of a node is set."""
+        return bool(self._embedded[position])
+
+    def _reserve(self, rows: int, dimension: int) -> None:
+        """Make room for the embeddings of the given number of nodes."""
+        if self._embeddings is None:
+            self._embeddings = np.zeros((rows, dimension), dtype=np.float32)
+        elif rows > len(self._embeddings):
+            grown = np.zeros((rows, dimension), dtype=np.float32)
+            grown[:len(self._embeddings)] = self._embeddings
+            self._embeddings = grown
+
+    def set_embedding(self, position: int, embedding: Sequence[float]) -> None:
+        """Set the embedding of a node."""
+        if self._embeddings is None or position >= len(self._embeddings):
+            # Grow geometrically, the matrix is copied a few times only
+            current = 0 if self._embeddings is None else len(self._embeddings)
+            self._reserve(max(len(self), position + 1, 2 * current),
+                          len(embedding))
+        self._embeddings[position] = embedding
+        self._embedded[position] = 1
+
+    def embeddings(self) -> np.ndarray:
+        """Return the embeddings of all the nodes, which must be embedded."""
+        if not all(self._embedded):
+            raise RuntimeError("Some nodes are not embedded")
+        if self._embeddings is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._embeddings[:len(self)]
+
+    def set_embeddings(self, embeddings: np.ndarray) -> None:
+        """Replace the embeddings of all the nodes, e.g. by reduced ones."""
+        if len(embeddings) != len(self):
+            raise RuntimeError(
+                f"{len(embeddings)} embeddings for {len(self)} nodes")
+        self._embeddings = np.array(embeddings, dtype=np.float32)
+        self._embedded = bytearray(b"\x01" * len(self))
@@ -0,0 +1,261 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import threading
+from typing import Any, Dict, List, Sequence
+
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+from psycopg2 import pool as pg_pool
+from psycopg2 import sql
+
+# Connection parameters of PostgreSQL and the environment variables
+# setting them, shared by the build and the queries
+CONNECTION_ENV = {
+    "user": "POSTGRES_USER",
+    "password": "POSTGRES_PASSWORD",
+    "host": "POSTGRES_HOST",
+    "port": "POSTGRES_PORT",
+    "database": "POSTGRES_DATABASE",
+}
+
+# PGVectorStore stores the nodes of a table_name in public.data_<table_name>
+TABLE_PREFIX = "data_"
+SCHEMA = "public"
+
+ANN_METHODS = ("hnsw", "ivfflat")
+
+# Names of the statements prepared on every pooled connection
+SEARCH_STATEMENT = "lightspeed_search"
+BATCH_STATEMENT = "lightspeed_search_batch"
+
+# The score is the cosine similarity, as computed by PGVectorStore
+_SEARCH = """
+PREPARE {name} (vector, integer) AS
+SELECT node_id, text, metadata_, 1 - (embedding <=> $1) AS score
+FROM {table} ORDER BY embedding <=> $1 LIMIT $2
+"""
+
+# All query vectors are searched by a single statement, every one of them
+# can still use the ANN index through the lateral join
+_BATCH_SEARCH = """
+PREPARE {name} (vector[], integer) AS
+SELECT q.ord, r.node_id, r.text, r.metadata_, r.score
+FROM unnest($1) WITH ORDINALITY AS q(embedding, ord)
+CROSS JOIN LATERAL (
+    SELECT t.node_id, t.text, t.metadata_,
+           1 - (t.embedding <=> q.embedding) AS score
+    FROM {table} t ORDER BY t.embedding <=> q.embedding LIMIT $2
+) r
+ORDER BY q.ord, r.score DESC
+"""
+
+
+def connection_params() -> Dict[str, str | None]:
+    """Return the PostgreSQL connection parameters set in the environment."""
+    return {name: os.getenv(env) for name, env in CONNECTION_ENV.items()}
+
+
+def data_table_name(table_name: str) -> str:
+    """Return the name of the table PGVectorStore creates for table_name.
+
+    PGVectorStore lowercases the table name and adds the data_ prefix.
+    """
+    return TABLE_PREFIX + table_name.lower()
+
+
+def _vector_literal(embedding: Sequence[float]) -> str:
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def _array_literal(embeddings: Sequence[Sequence[float]]) -> str:
+    return "{" + ",".join(f'"{_vector_literal(embedding)}"'
+                          for embedding in embeddings) + "}"
+
+
+def _to_node(node_id: str, text: str, metadata: Dict | None) -> TextNode:
+    try:
+        node = metadata_dict_to_node(metadata)
+        node.set_content(text)
+    except Exception:
+        # Rows not written by llama_index have plain metadata
+        node = TextNode(id_=node_id, text=text, metadata=metadata or {})
+    return node
+
+
+class PgVectorSearch(object):
+    """Search the nodes saved by PGVectorStore through a connection pool.
+
+    Search statements are prepared once per pooled connection. The HNSW
+    ef_search and the IVFFlat probes are set for every search, within its
+    transaction, so searches with different settings can share the pool.
+
+    Args:
+        table_name: table name given to the build, as data_table_name()
+            maps it to the table of PGVectorStore
+        pool_size: maximum number of connections
+        ef_search: default hnsw.ef_search, None keeps the server setting
+        probes: default ivfflat.probes, None keeps the server setting
+        params: connection parameters, by default connection_params()
+    """
+
+    def __init__(self, table_name: str, pool_size: int = 4,
+                 ef_search: int | None = None, probes: int | None = None,
+                 **params: Any):
+        self.table_name = data_table_name(table_name)
+        self.table = sql.Identifier(SCHEMA, self.table_name)
+        self.ef_search = ef_search
+        self.probes = probes
+        self._pool = pg_pool.ThreadedConnectionPool(
+            1, pool_size, **(params or connection_params()))
+        self._prepared: set = set()
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close all the connections of the pool."""
+        self._pool.closeall()
+
+    def _prepare(self, conn: Any) -> None:
+        # A pooled connection is only used by one thread at a time
+        with self._lock:
+            if conn in self._prepared:
+                return
+        with conn.cursor() as cursor:
+            for name, statement in [(SEARCH_STATEMENT, _SEARCH),
+                                    (BATCH_STATEMENT, _BATCH_SEARCH)]:
+                cursor.execute(sql.SQL(statement).format(
+                    name=sql.Identifier(name), table=self.table))
+        conn.commit()
+        with self._lock:
+            self._prepared.add(conn)
+
+    def _execute(self, statement: str, args: tuple,
+                 ef_search: int | None, probes: int | None) -> List[tuple]:
+        ef_search = ef_search or self.ef_search
+        probes = probes or self.probes
+        conn = self._pool.getconn()
+        try:
+            self._prepare(conn)
+            with conn.cursor() as cursor:
+                # SET LOCAL only lasts until the end of the transaction
+                if ef_search:
+                    cursor.execute("SET LOCAL hnsw.ef_search = %s",
+                                   (int(ef_search),))
+                if probes:
+                    cursor.execute("SET LOCAL ivfflat.probes = %s",
+                                   (int(probes),))
+                cursor.execute(
+                    sql.SQL("EXECUTE {} (%s, %s)").format(
+                        sql.Identifier(statement)), args)
+                rows = cursor.fetchall()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+        return rows
+
+    def search(self, embedding: Sequence[float], top_k: int,
+               ef_search: int | None = None,
+               probes: int | None = None) -> List[NodeWithScore]:
+        """Return the top_k nodes most similar to a query embedding."""
+        rows = self._execute(SEARCH_STATEMENT,
+                             (_vector_literal(embedding), top_k),
+                             ef_search, probes)
+        return [NodeWithScore(node=_to_node(node_id, text, metadata),
+                              score=score)
+                for node_id, text, metadata, score in rows]
+
+    def search_batch(self, embeddings: Sequence[Sequence[float]], top_k: int,
+                     ef_search: int | None = None,
+                     probes: int | None = None) -> List[List[NodeWithScore]]:
+        """Search several query embeddings in a single round trip.
+
+        Returns the top_k nodes of every query, in the order of the queries.
+        """
+        results: List[List[NodeWithScore]] = [[] for _ in embeddings]
+        if not results:
+            return results
+        rows = self._execute(BATCH_STATEMENT,
+                             (_array_literal(embeddings), top_k),
+                             ef_search, probes)
+        for position, node_id, text, metadata, score in rows:
+            results[position - 1].append(NodeWithScore(
+                node=_to_node(node_id, text, metadata), score=score))
+        return results
+
+    def dimension(self) -> int | None:
+        """Return the dimension of the stored embeddings, None if empty."""
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL(
+                    "SELECT vector_dims(embedding) FROM {} LIMIT 1").format(
+                        self.table))
+                row = cursor.fetchone()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+        return row[0] if row else None
+
+    def create_index(self, method: str, m: int = 16,
+                     ef_construction: int = 64, lists: int = 100) -> None:
+        """Create the ANN index of the embeddings, unless one exists."""
+        if method not in ANN_METHODS:
+            raise RuntimeError(f"Unknown ANN index method: {method}")
+        if method == "hnsw":
+            options = sql.SQL("m = {}, ef_construction = {}").format(
+                sql.Literal(m), sql.Literal(ef_construction))
+        else:
+            options = sql.SQL("lists = {}").format(sql.Literal(lists))
+        name = sql.Identifier(f"{self.table_name}_{method}_idx")
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL(
+                    "CREATE INDEX IF NOT EXISTS {} ON {} USING {} "
+                    "(embedding vector_cosine_ops) WITH ({})").format(
+                        name, self.table, sql.SQL(method), options))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+
+class PgVectorRetriever(BaseRetriever):
+    """Retriever searching a PgVectorSearch with the query embedding."""
+
+    def __init__(self, search: PgVectorSearch, embed_model: BaseEmbedding,
+                 similarity_top_k: int, **kwargs: Any):
+        self._search = search
+        self._embed_model = embed_model
+        self._similarity_top_k = similarity_top_k
+        super().__init__(**kwargs)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding
+        if embedding is None:
+            embedding = self._embed_model.get_query_embedding(
+                query_bundle.query_str)
+        return self._search.search(embedding, self._similarity_top_k)
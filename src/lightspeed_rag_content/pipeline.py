@@ -0,0 +1,192 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+LOG = logging.getLogger(__name__)
+
+# Default capacity of the queue in front of every stage
+QUEUE_SIZE = 64
+
+# Marks the end of the items in a queue
+_DONE = object()
+
+
+class Stage(object):
+    """Stage of a pipeline.
+
+    Args:
+        name: name of the stage, used in the metrics
+        func: callable processing an item, or a list of items if batch_size
+            is set, and returning an iterable of items for the next stage
+        workers: number of threads running func
+        batch_size: number of items passed to func at once, the last batch
+            may be smaller
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Iterable],
+                 workers: int = 1, batch_size: int = 0):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.batch_size = batch_size
+
+        self.processed = 0
+        self.busy_time = 0.0
+        self._depth_sum = 0
+        self._depth_max = 0
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def _record(self, depth: int, count: int, busy_time: float) -> None:
+        with self._lock:
+            self.processed += count
+            self.busy_time += busy_time
+            self._depth_sum += depth
+            self._depth_max = max(self._depth_max, depth)
+            self._samples += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the metrics of the stage.
+
+        The queue depth is sampled every time a worker takes work. A queue
+        which is often full shows that this stage is the bottleneck, an
+        empty one that the stages before it are.
+        """
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "busy-seconds": self.busy_time,
+            "queue-depth-max": self._depth_max,
+            "queue-depth-mean": (self._depth_sum / self._samples
+                                 if self._samples else 0.0),
+        }
+
+
+class Pipeline(object):
+    """Stages running concurrently, connected by bounded queues.
+
+    A stage blocks when the queue of the next stage is full, so a slow
+    stage slows down the ones before it instead of buffering all items in
+    memory.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._error: Exception | None = None
+        self._stop = threading.Event()
+
+    def _put(self, out: queue.Queue, item: Any) -> None:
+        """Put an item in a queue, giving up if the pipeline failed."""
+        while not self._stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _take(self, stage: Stage, inq: queue.Queue) -> List[Any] | None:
+        """Take the next item, or batch of items, from a queue.
+
+        Returns None once the queue is exhausted.
+        """
+        items: List[Any] = []
+        size = stage.batch_size or 1
+        while len(items) < size:
+            try:
+                item = inq.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return None
+                continue
+            if item is _DONE:
+                # Let the other workers of the stage see the end too
+                inq.put(_DONE)
+                break
+            items.append(item)
+        return items or None
+
+    def _worker(self, stage: Stage, inq: queue.Queue, out: queue.Queue,
+                remaining: List[int], lock: threading.Lock) -> None:
+        try:
+            while not self._stop.is_set():
+                depth = inq.qsize()
+                items = self._take(stage, inq)
+                if items is None:
+                    break
+                start = time.monotonic()
+                results = stage.func(items if stage.batch_size else items[0])
+                for result in results:
+                    self._put(out, result)
+                stage._record(depth, len(items), time.monotonic() - start)
+        except Exception as e:
+            LOG.error("Stage %s failed: %s", stage.name, e)
+            self._error = self._error or e
+            self._stop.set()
+        finally:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    self._put(out, _DONE)
+
+    def run(self, items: Iterable) -> List[Any]:
+        """Feed the items through all stages and return the final items."""
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        results: queue.Queue = queue.Queue()
+        outputs = queues[1:] + [results]
+
+        threads = []
+        for stage, inq, out in zip(self.stages, queues, outputs):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for i in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"{stage.name}-{i}",
+                    args=(stage, inq, out, remaining, lock), daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            if self._stop.is_set():
+                break
+            self._put(queues[0], item)
+        self._put(queues[0], _DONE)
+
+        # The results queue is unbounded, so the last stage never blocks
+        final = []
+        while not self._stop.is_set():
+            try:
+                item = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+            final.append(item)
+
+        for thread in threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+        return final
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Return the metrics of every stage."""
+        return [stage.metrics() for stage in self.stages]
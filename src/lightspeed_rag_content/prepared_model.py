@@ -0,0 +1,269 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, List
+
+from llama_index.core.base.embeddings.base import (
+    DEFAULT_EMBED_BATCH_SIZE, BaseEmbedding)
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+import torch
+import transformers
+from transformers.modeling_utils import no_init_weights
+
+LOG = logging.getLogger(__name__)
+
+# Directory of the prepared artifact inside the model directory
+PREPARED_DIR = "prepared"
+PREPARED_FILE = "prepared.json"
+WEIGHTS_FILE = "model.safetensors"
+
+# Modules of the sentence-transformers models which can be prepared
+SUPPORTED_MODULES = ("Transformer", "Pooling", "Normalize")
+POOLING_MODES = ("mean", "cls")
+
+# Torch types of the safetensors dtypes
+_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16,
+    "BF16": torch.bfloat16, "I64": torch.int64, "I32": torch.int32,
+    "I16": torch.int16, "I8": torch.int8, "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def prepared_dir(model_dir: str) -> str:
+    """Return the directory of the prepared artifact of a model."""
+    return os.path.join(model_dir, PREPARED_DIR)
+
+
+def _named_tensors(model: torch.nn.Module) -> Any:
+    # Non-persistent buffers, e.g. the position IDs, are not in the
+    # state dict but must be set as well
+    return itertools.chain(model.named_parameters(remove_duplicate=False),
+                           model.named_buffers(remove_duplicate=False))
+
+
+def prepare_model(model_dir: str) -> Dict[str, Any]:
+    """Write the prepared artifact of a sentence-transformers model.
+
+    The weights and all the buffers of the transformer are saved to a
+    single safetensors file, with the tokenizer, the model configuration
+    and the settings of the pooling, and the embedding dimension.
+
+    Returns the settings written to prepared.json.
+    """
+    from safetensors.torch import save_file
+    from sentence_transformers import SentenceTransformer
+
+    st_model = SentenceTransformer(model_dir, device="cpu")
+    names = [type(module).__name__ for module in st_model]
+    if names[0] != "Transformer" or not set(names) <= set(SUPPORTED_MODULES):
+        raise RuntimeError(f"Cannot prepare a model with modules {names}")
+    pooling_module = st_model[1]
+    pooling = (pooling_module.get_pooling_mode_str()
+               if hasattr(pooling_module, "get_pooling_mode_str")
+               else pooling_module.pooling_mode)
+    if pooling not in POOLING_MODES:
+        raise RuntimeError(f"Cannot prepare a model with {pooling} pooling")
+
+    transformer = st_model[0]
+    model = transformer.auto_model
+    output_dir = prepared_dir(model_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Tied tensors are saved once
+    tensors: Dict[str, torch.Tensor] = {}
+    aliases: Dict[str, str] = {}
+    seen: Dict[tuple, str] = {}
+    for name, tensor in _named_tensors(model):
+        key = (tensor.data_ptr(), tensor.dtype, tuple(tensor.shape))
+        if key in seen:
+            aliases[name] = seen[key]
+            continue
+        seen[key] = name
+        tensors[name] = tensor.detach().contiguous()
+    save_file(tensors, os.path.join(output_dir, WEIGHTS_FILE))
+    model.config.save_pretrained(output_dir)
+    transformer.tokenizer.save_pretrained(output_dir)
+
+    settings = {
+        "model-class": type(model).__name__,
+        "tokenizer-class": type(transformer.tokenizer).__name__,
+        "dimension": len(st_model.encode("dimension")),
+        "max-length": st_model.max_seq_length,
+        "pooling": pooling,
+        "do-lower-case": bool(getattr(transformer, "do_lower_case", False)),
+        "aliases": aliases,
+    }
+    with open(os.path.join(output_dir, PREPARED_FILE), "w") as file:
+        json.dump(settings, file, indent=2)
+    return settings
+
+
+def read_settings(model_dir: str) -> Dict[str, Any]:
+    """Read the settings of the prepared artifact of a model."""
+    path = os.path.join(prepared_dir(model_dir), PREPARED_FILE)
+    if not os.path.exists(path):
+        raise RuntimeError(
+            f"{model_dir} has no prepared artifact, create it with "
+            "download_embeddings_model.py --prepare")
+    with open(path) as file:
+        return json.load(file)
+
+
+def map_weights(path: str) -> Dict[str, torch.Tensor]:
+    """Map the tensors of a safetensors file into memory.
+
+    The tensors are views of a copy-on-write mapping of the file, so no
+    data is read until it is used and processes loading the same file
+    share its pages.
+    """
+    with open(path, "rb") as file:
+        (header_size,) = struct.unpack("<Q", file.read(8))
+        header = json.loads(file.read(header_size))
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = _DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        if begin == end:
+            tensors[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        # The tensors keep a reference to the mapping
+        tensors[name] = torch.frombuffer(
+            mapped, dtype=dtype, offset=start + begin,
+            count=(end - begin) // dtype.itemsize).reshape(info["shape"])
+    return tensors
+
+
+def load_model(model_dir: str, settings: Dict[str, Any]) -> torch.nn.Module:
+    """Create the transformer of a prepared artifact with mapped weights.
+
+    The model is created without initializing its weights, whose memory is
+    never touched, then every parameter and buffer is replaced by its
+    mapped tensor.
+    """
+    output_dir = prepared_dir(model_dir)
+    config = transformers.AutoConfig.from_pretrained(output_dir)
+    with no_init_weights():
+        model = getattr(transformers, settings["model-class"])(config)
+    weights = map_weights(os.path.join(output_dir, WEIGHTS_FILE))
+    aliases = settings["aliases"]
+    for name, _ in list(_named_tensors(model)):
+        key = aliases.get(name, name)
+        if key not in weights:
+            raise RuntimeError(f"Tensor {name} missing from {output_dir}")
+        module_name, _, leaf = name.rpartition(".")
+        module = model.get_submodule(module_name)
+        if leaf in module._parameters:
+            module._parameters[leaf] = torch.nn.Parameter(
+                weights[key], requires_grad=False)
+        else:
+            module._buffers[leaf] = weights[key]
+    return model.eval()
+
+
+class PreparedEmbedding(BaseEmbedding):
+    """Embedding model loaded from a prepared artifact.
+
+    The vectors match `HuggingFaceEmbedding` for the models accepted by
+    prepare_model(). Loading does not read the weights, which are mapped
+    into memory, and the embedding dimension is known without embedding a
+    text.
+    """
+
+    max_length: int = Field(description="Maximum length of input.", gt=0)
+    normalize: bool = Field(default=True, description="Normalize embeddings.")
+    pooling: str = Field(default="mean", description="Pooling mode.")
+    dimension: int = Field(description="Dimension of the embeddings.", gt=0)
+    load_seconds: float = Field(default=0.0,
+                                description="Time spent loading the model.")
+
+    _model: Any = PrivateAttr()
+    _tokenizer: Any = PrivateAttr()
+    _do_lower_case: bool = PrivateAttr()
+
+    def __init__(self, model_dir: str, normalize: bool = True,
+                 embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+                 **kwargs: Any):
+        start = time.perf_counter()
+        settings = read_settings(model_dir)
+        model = load_model(model_dir, settings)
+        tokenizer_class = getattr(transformers, settings["tokenizer-class"])
+        tokenizer = tokenizer_class.from_pretrained(prepared_dir(model_dir))
+        load_seconds = time.perf_counter() - start
+        LOG.info("Loaded the prepared model %s in %.3fs", model_dir,
+                 load_seconds)
+
+        super().__init__(
+            model_name=model_dir,
+            embed_batch_size=embed_batch_size,
+            max_length=settings["max-length"],
+            normalize=normalize,
+            pooling=settings["pooling"],
+            dimension=settings["dimension"],
+            load_seconds=load_seconds,
+            **kwargs)
+
+        self._model = model
+        self._tokenizer = tokenizer
+        self._do_lower_case = settings["do-lower-case"]
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "PreparedEmbedding"
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Tokenize and embed a batch of texts."""
+        if self._do_lower_case:
+            texts = [text.lower() for text in texts]
+        encoded = self._tokenizer(
+            texts, padding=True, truncation=True,
+            max_length=self.max_length, return_tensors="pt")
+        with torch.inference_mode():
+            token_embeddings = self._model(**encoded)[0]
+
+            if self.pooling == "cls":
+                embeddings = token_embeddings[:, 0]
+            else:
+                mask = encoded["attention_mask"].unsqueeze(-1).to(
+                    token_embeddings.dtype)
+                embeddings = ((token_embeddings * mask).sum(dim=1)
+                              / mask.sum(dim=1).clamp(min=1e-9))
+
+            if self.normalize:
+                embeddings = torch.nn.functional.normalize(embeddings, dim=1)
+        return embeddings.float().tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts)
@@ -0,0 +1,179 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict
+
+PROGRESS_FORMATS = ("json", "prometheus")
+
+# Minimum number of seconds between two writes of the status file
+WRITE_INTERVAL = 10.0
+
+# Counters of a build, the ETA is the one of the embedding
+COUNTERS = ("files-loaded", "urls-checked", "urls-unreachable", "nodes-split",
+            "nodes-embedded")
+ETA_COUNTER = "nodes-embedded"
+
+# Prefix of the Prometheus metrics
+METRIC_PREFIX = "lightspeed_build"
+
+
+def rss_bytes() -> int | None:
+    """Return the resident set size of the process, None if unknown."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _metric(counter: str) -> str:
+    return f"{METRIC_PREFIX}_{counter.replace('-', '_')}"
+
+
+class Progress(object):
+    """Progress counters of a build, written periodically to a status file.
+
+    Counters are incremented from any thread. The status file, a JSON
+    document or a Prometheus textfile, is rewritten atomically at most
+    every interval seconds when a counter changes, and by finish(). The
+    rate of a counter is measured from its first increment, so that the
+    embedding rate does not include the time spent loading files.
+
+    Without a path progress is not tracked and add() returns immediately.
+
+    Args:
+        path: status file, None to disable progress tracking
+        status_format: json or prometheus
+        interval: minimum number of seconds between two writes
+    """
+
+    def __init__(self, path: str | None = None, status_format: str = "json",
+                 interval: float = WRITE_INTERVAL):
+        if status_format not in PROGRESS_FORMATS:
+            raise RuntimeError(f"Unknown progress format: {status_format}")
+        self.path = path
+        self.status_format = status_format
+        self.interval = interval
+        self._counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._totals: Dict[str, int] = {}
+        self._started: Dict[str, float] = {}
+        self._start = time.monotonic()
+        self._next_write = self._start + interval
+        self._done = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def add(self, counter: str, count: int = 1) -> None:
+        """Increment a counter."""
+        if self.path is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._counts[counter] = self._counts.get(counter, 0) + count
+            self._started.setdefault(counter, now)
+            if now < self._next_write:
+                return
+            self._next_write = now + self.interval
+        self.write()
+
+    def add_total(self, counter: str, count: int) -> None:
+        """Increase the expected final value of a counter."""
+        if self.path is None:
+            return
+        with self._lock:
+            self._totals[counter] = self._totals.get(counter, 0) + count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters with their rates and the ETA of the build."""
+        now = time.monotonic()
+        with self._lock:
+            counters = {}
+            for counter, count in self._counts.items():
+                elapsed = now - self._started.get(counter, now)
+                rate = count / elapsed if elapsed > 0 else 0.0
+                total = self._totals.get(counter)
+                eta = None
+                if total is not None and rate > 0:
+                    eta = max(total - count, 0) / rate
+                counters[counter] = {"count": count, "total": total,
+                                     "rate": rate, "eta-seconds": eta}
+            done = self._done
+        return {
+            "state": "done" if done else "running",
+            "elapsed-seconds": now - self._start,
+            "eta-seconds": 0.0 if done else counters.get(
+                ETA_COUNTER, {}).get("eta-seconds"),
+            "rss-bytes": rss_bytes(),
+            "counters": counters,
+        }
+
+    def _prometheus(self, status: Dict[str, Any]) -> str:
+        lines = []
+
+        def metric(name: str, kind: str, description: str,
+                   value: Any) -> None:
+            if value is None:
+                return
+            lines.extend([f"# HELP {name} {description}",
+                          f"# TYPE {name} {kind}", f"{name} {float(value)!r}"])
+
+        metric(f"{METRIC_PREFIX}_done", "gauge", "1 once the build is saved",
+               1 if status["state"] == "done" else 0)
+        metric(f"{METRIC_PREFIX}_elapsed_seconds", "gauge",
+               "Seconds since the build started", status["elapsed-seconds"])
+        metric(f"{METRIC_PREFIX}_eta_seconds", "gauge",
+               "Estimated seconds until the embedding is complete",
+               status["eta-seconds"])
+        metric(f"{METRIC_PREFIX}_rss_bytes", "gauge",
+               "Resident set size of the build", status["rss-bytes"])
+        for counter, values in status["counters"].items():
+            name = _metric(counter)
+            metric(f"{name}_total", "counter", f"Count of {counter}",
+                   values["count"])
+            metric(f"{name}_expected", "gauge",
+                   f"Expected final count of {counter}", values["total"])
+            metric(f"{name}_per_second", "gauge", f"Rate of {counter}",
+                   values["rate"])
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Write the status file, atomically."""
+        if self.path is None:
+            return
+        status = self.snapshot()
+        if self.status_format == "prometheus":
+            content = self._prometheus(status)
+        else:
+            content = json.dumps(status, indent=2)
+        # Collectors and readers never see a partially written file
+        tmp_path = f"{self.path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w") as file:
+            file.write(content)
+        os.replace(tmp_path, self.path)
+
+    def finish(self) -> None:
+        """Mark the build as done and write the final status."""
+        if self.path is None:
+            return
+        with self._lock:
+            self._done = True
+        self.write()
@@ -0,0 +1,257 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gc
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from lightspeed_rag_content.checkpoint import CHECKPOINT_DIR
+
+LOG = logging.getLogger(__name__)
+
+# A published index is a symlink to <index>.versions/<version>, builds are
+# saved to <index>.versions/staging first
+VERSIONS_SUFFIX = ".versions"
+STAGING_DIR = "staging"
+MANIFEST_FILE = "manifest.json"
+
+# Number of published versions kept, including the current one
+KEEP_VERSIONS = 3
+
+# Seconds between two checks for a new version by a ReloadingIndex
+CHECK_INTERVAL = 5.0
+
+
+def versions_dir(output_dir: str) -> str:
+    """Return the directory of the versions of a published index."""
+    return os.path.normpath(output_dir) + VERSIONS_SUFFIX
+
+
+def prepare_staging(output_dir: str) -> str:
+    """Create the staging directory of a build and return its path.
+
+    Files of a previous build are removed, except its embedding checkpoint
+    so that the build can be resumed.
+    """
+    staging = os.path.join(versions_dir(output_dir), STAGING_DIR)
+    os.makedirs(staging, exist_ok=True)
+    for name in os.listdir(staging):
+        if name == CHECKPOINT_DIR:
+            continue
+        path = os.path.join(staging, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    return staging
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _checksums(directory: str) -> Dict[str, Dict]:
+    files = {}
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, directory)
+            if rel_path == MANIFEST_FILE:
+                continue
+            files[rel_path] = {"sha256": _sha256(path),
+                               "size": os.path.getsize(path)}
+    return files
+
+
+def write_manifest(directory: str) -> Dict:
+    """Write the manifest with the checksums of the files of a build.
+
+    The version of the build is derived from the checksums, identical
+    builds get the same version.
+    """
+    files = _checksums(directory)
+    version = hashlib.sha256(
+        json.dumps(files, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    manifest = {"version": version, "files": files}
+    with open(os.path.join(directory, MANIFEST_FILE), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return manifest
+
+
+def verify(directory: str) -> Dict:
+    """Check the files of a build against its manifest.
+
+    Returns the manifest, raises RuntimeError if a file is missing, was
+    added or was modified.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as file:
+        manifest = json.load(file)
+    if _checksums(directory) != manifest["files"]:
+        raise RuntimeError(
+            f"Files of {directory} do not match its manifest")
+    return manifest
+
+
+def publish(staging: str, output_dir: str,
+            keep_versions: int = KEEP_VERSIONS) -> str:
+    """Publish a build atomically.
+
+    The staging directory becomes a version directory and output_dir, a
+    symlink, is replaced to point to it. Readers resolving output_dir see
+    either the previous or the new version, never a partial one.
+
+    Returns the version directory.
+    """
+    if os.path.exists(output_dir) and not os.path.islink(output_dir):
+        raise RuntimeError(
+            f"Cannot publish to {output_dir}, it is not a symlink. Remove "
+            "the directory or save the index to another folder.")
+
+    manifest = write_manifest(staging)
+    version_dir = os.path.join(versions_dir(output_dir), manifest["version"])
+    if os.path.exists(version_dir):
+        # An identical build was published before
+        shutil.rmtree(staging)
+    else:
+        os.replace(staging, version_dir)
+
+    # Replacing the symlink by a rename is atomic, and a relative target
+    # keeps the index valid when its parent directory is mounted elsewhere
+    tmp_link = f"{os.path.normpath(output_dir)}.tmp-{os.getpid()}"
+    os.symlink(os.path.relpath(
+        version_dir, os.path.dirname(os.path.abspath(output_dir))), tmp_link)
+    os.replace(tmp_link, output_dir)
+    LOG.info("Published version %s to %s", manifest["version"], output_dir)
+
+    prune(output_dir, keep_versions)
+    return version_dir
+
+
+def prune(output_dir: str, keep_versions: int = KEEP_VERSIONS) -> None:
+    """Remove the oldest versions of an index, never the current one."""
+    current = os.path.realpath(output_dir)
+    versions = versions_dir(output_dir)
+    candidates = [os.path.join(versions, name)
+                  for name in os.listdir(versions) if name != STAGING_DIR]
+    candidates.sort(key=os.path.getmtime, reverse=True)
+    kept = {current}
+    for path in candidates:
+        if len(kept) >= keep_versions:
+            break
+        kept.add(os.path.realpath(path))
+    for path in candidates:
+        if os.path.realpath(path) not in kept:
+            LOG.info("Removing old version %s", path)
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class ReloadingIndex(object):
+    """Index loaded from a published directory, reloaded on new versions.
+
+    get() checks at most every check_interval seconds whether output_dir
+    points to a new version. The new version is loaded from its resolved
+    directory, so a version published meanwhile is never mixed in.
+
+    By default the previous index keeps serving while the new one is being
+    loaded, with no downtime but both indexes in memory for a while. With
+    release_first the previous index is released before loading the new
+    one, readers then wait for the load instead.
+
+    Args:
+        output_dir: published index, a symlink created by publish()
+        load: function loading the index of a version directory
+        check_interval: seconds between two checks for a new version
+        release_first: release the previous index before loading a new one
+        verify_manifest: check the files against the manifest first
+    """
+
+    def __init__(self, output_dir: str, load: Callable[[str], Any],
+                 check_interval: float = CHECK_INTERVAL,
+                 release_first: bool = False, verify_manifest: bool = True):
+        self.output_dir = output_dir
+        self.check_interval = check_interval
+        self.release_first = release_first
+        self.verify_manifest = verify_manifest
+        self._load_index = load
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self.version_dir: str | None = None
+        # Version that could not be loaded, not retried until a new one
+        self._failed_dir: str | None = None
+        self._index = None
+        self.check()
+
+    def _load(self, version_dir: str) -> Any:
+        if self.verify_manifest:
+            verify(version_dir)
+        start = time.perf_counter()
+        index = self._load_index(version_dir)
+        LOG.info("Loaded %s in %.3fs", version_dir,
+                 time.perf_counter() - start)
+        return index
+
+    def check(self) -> bool:
+        """Load the published version if it changed, return if it did.
+
+        Only one thread loads at a time, the others keep the current index.
+        """
+        if not self._lock.acquire(blocking=self._index is None):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            version_dir = os.path.realpath(self.output_dir)
+            if version_dir in (self.version_dir, self._failed_dir):
+                return False
+
+            if self.release_first and self._index is not None:
+                self._index = None
+                gc.collect()
+            try:
+                self._index = self._load(version_dir)
+            except Exception:
+                if self.version_dir is None:
+                    raise
+                LOG.exception("Cannot load %s, keeping %s", version_dir,
+                              self.version_dir)
+                self._failed_dir = version_dir
+                if self._index is None:
+                    self._index = self._load(self.version_dir)
+                return False
+            self.version_dir = version_dir
+            return True
+        finally:
+            self._lock.release()
+
+    def get(self) -> Any:
+        """Return the index of the latest published version."""
+        if time.monotonic() >= self._next_check:
+            self.check()
+        index = self._index
+        if index is None:
+            # The previous index was released, wait for the new one
+            with self._lock:
+                index = self._index
+        return index
@@ -0,0 +1,185 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.storage.docstore.types import BaseDocumentStore
+
+from lightspeed_rag_content.versions import use_version_url
+
+# Files of a persisted index identifying its content, the node IDs in the
+# index store are derived from the content of the documents
+FINGERPRINT_FILES = ["metadata.json", "index_store.json"]
+
+
+def index_fingerprint(persist_dir: str) -> str:
+    """Return a hash identifying the content of a persisted index."""
+    digest = hashlib.sha256()
+    for name in FINGERPRINT_FILES:
+        path = os.path.join(persist_dir, name)
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+class LRUCache(object):
+    """Size-bounded least recently used cache with hit-rate statistics.
+
+    If a path is given, the cache is loaded from that JSON file and can be
+    written back with save(), so it survives between runs. Keys must be
+    strings and values must be serializable to JSON.
+    """
+
+    def __init__(self, max_size: int, path: str | None = None):
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as file:
+                for key, value in json.load(file):
+                    self.put(key, value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """Return the cached value or None."""
+        if key not in self._data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used ones."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def save(self) -> None:
+        """Write the cache to its path, from least to most recently used."""
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                    exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(list(self._data.items()), file)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit-rate statistics of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit-rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachedQueryEmbedding(BaseEmbedding):
+    """Embedding model caching the query embeddings of another model.
+
+    The model directory, the backend and the ONNX file are part of the
+    keys, so a persisted cache never returns the vectors of another
+    runtime of the model.
+    """
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _cache: LRUCache = PrivateAttr()
+    _model_key: List[str | None] = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, cache: LRUCache,
+                 backend: str = "torch", onnx_file: str | None = None):
+        super().__init__(model_name=embed_model.model_name,
+                         embed_batch_size=embed_model.embed_batch_size)
+        self._embed_model = embed_model
+        self._cache = cache
+        self._model_key = [embed_model.model_name, backend, onnx_file]
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedQueryEmbedding"
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        key = json.dumps([*self._model_key, query])
+        embedding = self._cache.get(key)
+        if embedding is None:
+            embedding = self._embed_model.get_query_embedding(query)
+            self._cache.put(key, embedding)
+        return embedding
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed_model.get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed_model.get_text_embedding_batch(texts)
+
+
+def search_key(search_mode: str, *settings: Any) -> str:
+    """Return the key of a search mode and the settings of its results.
+
+    Results of the same search mode with other settings are cached apart.
+    """
+    return ":".join(str(part) for part in (search_mode, *settings))
+
+
+def result_cache_key(index_id: str, fingerprint: str, query: str,
+                     top_k: int, search_mode: str = "float",
+                     version: str | None = None) -> str:
+    """Return the key of the results of a query in a result cache."""
+    return json.dumps(
+        [index_id, fingerprint, query, top_k, search_mode, version])
+
+
+def cached_retrieve(retriever: BaseRetriever, query_bundle: QueryBundle,
+                    docstore: BaseDocumentStore, cache: LRUCache, key: str,
+                    version: str | None = None) -> List[NodeWithScore]:
+    """Retrieve the nodes of a query, using the results cached under key.
+
+    Only the node IDs and scores are cached, the nodes of a cached result
+    are read from the docstore and get the docs_url of the version.
+    """
+    cached = cache.get(key)
+    if cached is None:
+        nodes = retriever.retrieve(query_bundle)
+        cache.put(key, [[n.node.node_id, n.score] for n in nodes])
+        return nodes
+
+    nodes = []
+    for node_id, score in cached:
+        node = docstore.get_node(node_id)
+        if version is not None:
+            use_version_url(node, version)
+        nodes.append(NodeWithScore(node=node, score=score))
+    return nodes
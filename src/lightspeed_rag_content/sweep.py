@@ -0,0 +1,245 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+import faiss
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.schema import Document, MetadataMode, TextNode
+import numpy as np
+
+from lightspeed_rag_content import binary_index
+from lightspeed_rag_content import dimension_reduction
+from lightspeed_rag_content.checkpoint import EmbeddingCheckpoint
+from lightspeed_rag_content.document_processor import DocumentProcessor
+from lightspeed_rag_content.metadata_processor import MetadataProcessor
+
+LOG = logging.getLogger(__name__)
+
+# Index types of the candidates, "pca:<dim>" and "matryoshka:<dim>" reduce
+# the embeddings to <dim> dimensions
+INDEX_TYPES = ("flat", "binary", "pca", "matryoshka")
+
+# Search function of a candidate index, returning the vector IDs of the
+# top_k results of every query vector
+SearchFunction = Callable[[np.ndarray, int], np.ndarray]
+
+
+class EmbeddingCache(object):
+    """Embeddings of chunks, shared by the candidates of a sweep.
+
+    Chunks are matched by their embedded content, so a chunk produced by
+    several chunking settings is embedded once.
+    """
+
+    def __init__(self, embed_model: BaseEmbedding):
+        self.embed_model = embed_model
+        self._vectors: Dict[str, List[float]] = {}
+        # Chunks being embedded by another thread, set once they are done
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def embed(self, nodes: List[TextNode]) -> Tuple[np.ndarray, int]:
+        """Return the embeddings of the nodes and how many were reused."""
+        keys = [EmbeddingCheckpoint.node_key(node) for node in nodes]
+        missing: Dict[str, TextNode] = {}
+        waiting = []
+        with self._lock:
+            for key, node in zip(keys, nodes):
+                if key in self._vectors or key in missing:
+                    continue
+                if key in self._pending:
+                    waiting.append(self._pending[key])
+                else:
+                    missing[key] = node
+                    self._pending[key] = threading.Event()
+
+        batch_size = self.embed_model.embed_batch_size
+        pending = list(missing.items())
+        try:
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i:i + batch_size]
+                vectors = self.embed_model.get_text_embedding_batch(
+                    [node.get_content(metadata_mode=MetadataMode.EMBED)
+                     for _, node in batch])
+                with self._lock:
+                    for (key, _), vector in zip(batch, vectors):
+                        self._vectors[key] = vector
+                        self._pending.pop(key).set()
+        finally:
+            # Let the waiting threads fail instead of blocking forever
+            with self._lock:
+                for key in missing:
+                    if key in self._pending:
+                        self._pending.pop(key).set()
+
+        for event in waiting:
+            event.wait()
+        with self._lock:
+            embeddings = np.array([self._vectors[key] for key in keys],
+                                  dtype=np.float32)
+        return embeddings.reshape(len(nodes), -1), len(nodes) - len(missing)
+
+
+def parse_index_type(index_type: str) -> Tuple[str, int]:
+    """Split an index type into its name and reduced dimension."""
+    name, _, dimension = index_type.partition(":")
+    if name not in INDEX_TYPES or (
+            name in dimension_reduction.REDUCTION_METHODS) != bool(dimension):
+        raise RuntimeError(f"Invalid index type: {index_type}")
+    return name, int(dimension or 0)
+
+
+def build_index(index_type: str,
+                embeddings: np.ndarray) -> Tuple[SearchFunction, int]:
+    """Build a candidate index of the embeddings.
+
+    Returns its search function, taking the query embeddings, and its
+    size in bytes.
+    """
+    name, dimension = parse_index_type(index_type)
+    transform = None
+    if dimension:
+        transform = dimension_reduction.fit_transform(
+            name, embeddings, dimension)
+        embeddings = dimension_reduction.apply_transform(
+            transform, embeddings)
+    float_index = faiss.IndexFlatIP(embeddings.shape[1])
+    float_index.add(np.ascontiguousarray(embeddings))
+    size = len(faiss.serialize_index(float_index))
+
+    if name == "binary":
+        bin_index = binary_index.build_binary_index(float_index)
+        size += len(faiss.serialize_index_binary(bin_index))
+
+        def search(queries: np.ndarray, top_k: int) -> np.ndarray:
+            ids = np.full((len(queries), top_k), -1, dtype=np.int64)
+            for i, query in enumerate(queries):
+                found = binary_index.search(
+                    bin_index, embeddings, query, top_k)[0]
+                ids[i, :len(found)] = found
+            return ids
+        return search, size
+
+    def search(queries: np.ndarray, top_k: int) -> np.ndarray:
+        if transform is not None:
+            queries = dimension_reduction.apply_transform(transform, queries)
+        return float_index.search(
+            np.ascontiguousarray(queries, dtype=np.float32), top_k)[1]
+    return search, size
+
+
+class Sweep(object):
+    """Build and evaluate candidate indexes of the same documents.
+
+    The documents are loaded once, with the metadata processors pinging
+    every URL once, then every chunking setting splits and embeds them,
+    and every index type is built from these embeddings.
+
+    Queries are dicts with the "query" text and the "expected" paths of
+    the relevant documents, relative to their docs directory. The recall
+    of a candidate is the fraction of the expected documents found in the
+    top_k results.
+    """
+
+    def __init__(self, processor: DocumentProcessor,
+                 queries: List[Dict] | None = None, top_k: int = 5,
+                 num_workers: int | None = None):
+        self.processor = processor
+        self.queries = queries or []
+        self.top_k = top_k
+        self.num_workers = num_workers
+        embed_model = processor.embedding_model
+        self.cache = EmbeddingCache(embed_model)
+        self._documents: List[Document] = []
+        self._query_embeddings = np.array(
+            [embed_model.get_query_embedding(query["query"])
+             for query in self.queries], dtype=np.float32)
+
+    def add_documents(self, docs_dir: str, metadata: MetadataProcessor,
+                      **kwargs: Dict) -> None:
+        """Load the documents of a directory, see DocumentProcessor.load."""
+        self._documents.extend(
+            self.processor.load(docs_dir, metadata, **kwargs))
+
+    def _split(self, chunk_size: int, chunk_overlap: int) -> List[TextNode]:
+        return self.processor.split(self._documents, chunk_size,
+                                    chunk_overlap)
+
+    def _recall(self, nodes: List[TextNode], ids: np.ndarray) -> float:
+        found = 0
+        expected = 0
+        for query, query_ids in zip(self.queries, ids):
+            paths = {self.processor.doc_path(nodes[i].ref_doc_id)
+                     for i in query_ids if i >= 0}
+            found += len(set(query["expected"]) & paths)
+            expected += len(query["expected"])
+        return found / expected if expected else 0.0
+
+    def _run_chunking(self, chunk_size: int, chunk_overlap: int,
+                      index_types: List[str]) -> List[Dict]:
+        start = time.perf_counter()
+        nodes = self._split(chunk_size, chunk_overlap)
+        split_end = time.perf_counter()
+        embeddings, reused = self.cache.embed(nodes)
+        embed_end = time.perf_counter()
+
+        results = []
+        for index_type in index_types:
+            index_start = time.perf_counter()
+            search, size = build_index(index_type, embeddings)
+            index_seconds = time.perf_counter() - index_start
+
+            result = {
+                "chunk-size": chunk_size,
+                "chunk-overlap": chunk_overlap,
+                "index": index_type,
+                "nodes": len(nodes),
+                "reused-embeddings": reused,
+                "split-seconds": split_end - start,
+                "embed-seconds": embed_end - split_end,
+                "index-seconds": index_seconds,
+                "build-seconds": embed_end - start + index_seconds,
+                "index-bytes": size,
+            }
+            if self.queries:
+                search_start = time.perf_counter()
+                ids = search(self._query_embeddings, self.top_k)
+                result["latency-ms"] = ((time.perf_counter() - search_start)
+                                        * 1000 / len(self.queries))
+                result[f"recall@{self.top_k}"] = self._recall(nodes, ids)
+            LOG.info("Sweep candidate: %s", result)
+            results.append(result)
+        return results
+
+    def run(self, chunkings: List[Tuple[int, int]],
+            index_types: List[str]) -> List[Dict]:
+        """Build and evaluate a candidate for every setting.
+
+        The chunkings, pairs of chunk size and overlap, are processed
+        concurrently. Returns the results in the order of the settings.
+        """
+        for index_type in index_types:
+            parse_index_type(index_type)
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = [executor.submit(self._run_chunking, size, overlap,
+                                       index_types)
+                       for size, overlap in chunkings]
+            return [result for future in futures
+                    for result in future.result()]
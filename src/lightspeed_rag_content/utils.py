@@ -15,6 +15,9 @@
 
 import argparse
 
+from lightspeed_rag_content.embeddings import (
+    EMBEDDING_BACKENDS, ONNX_DIR, ONNX_QUANTIZED_MODEL_FILE)
+
 
 def get_common_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -69,8 +72,8 @@ def get_common_arg_parser() -> argparse.ArgumentParser:
         default=-1,
         type=int,
         help=(
-            "Number of workers to parallelize the data loading. Set to a "
-            "negative value by default, turning parallelism off"
+            "Number of threads reading the documents. Set to a negative "
+            "value by default, using the default size of a thread pool"
         ),
     )
     parser.add_argument(
@@ -79,4 +82,111 @@ def get_common_arg_parser() -> argparse.ArgumentParser:
         choices=["faiss", "postgres"],
         help="vector store type to be used."
     )
+    parser.add_argument(
+        "--embedding-backend",
+        default="torch",
+        choices=EMBEDDING_BACKENDS,
+        help="Runtime used to compute the embeddings. The onnx backend "
+             "runs the ONNX export of the model with ONNX Runtime on CPU, "
+             "the prepared backend loads the prepared artifact written by "
+             "download_embeddings_model.py --prepare"
+    )
+    parser.add_argument(
+        "--onnx-file",
+        default=None,
+        help=f"ONNX file in the {ONNX_DIR}/ directory of the model to use "
+             f"with the onnx backend, e.g. {ONNX_QUANTIZED_MODEL_FILE} for the "
+             "int8 model"
+    )
+    parser.add_argument(
+        "--checkpoint-batch-size",
+        default=0,
+        type=int,
+        help="Number of nodes embedded between two checkpoints saved in the "
+             "output folder. Set to 0 by default, turning checkpoints off"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse the embeddings checkpointed by an interrupted build"
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Read, split and embed the documents concurrently. Does not "
+             "support --checkpoint-batch-size and --resume"
+    )
+    parser.add_argument(
+        "--dimension-reduction",
+        default=None,
+        choices=["pca", "matryoshka"],
+        help="Reduce the dimension of the embeddings with a PCA fitted on "
+             "the corpus, or by truncating the embeddings of a Matryoshka "
+             "model. Requires --reduced-dimension"
+    )
+    parser.add_argument(
+        "--reduced-dimension",
+        default=0,
+        type=int,
+        help="Dimension of the reduced embeddings"
+    )
+    parser.add_argument(
+        "--binary-index",
+        action="store_true",
+        help="Also save a sign-quantized binary copy of the faiss index, "
+             "used to preselect candidates at query time, and the float "
+             "vectors rescoring them from a memory-mapped file"
+    )
+    parser.add_argument(
+        "--document-index",
+        action="store_true",
+        help="Also save the centroid of the chunks of every document, used "
+             "to search the chunks of the nearest documents only"
+    )
+    parser.add_argument(
+        "--export-format",
+        default=None,
+        choices=["arrow", "parquet"],
+        help="Also save the nodes with their metadata and embeddings as an "
+             "Arrow IPC or a Parquet dataset, requires pyarrow"
+    )
+    parser.add_argument(
+        "--compact-nodes",
+        action="store_true",
+        help="Keep the chunks in a compact columnar store until the index "
+             "is saved, reducing the memory of large builds"
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="Save the index to a versioned directory with a manifest, then "
+             "atomically replace the output folder by a symlink to it"
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Leave the execution time out of metadata.json, so that "
+             "identical inputs produce identical output folders"
+    )
+    parser.add_argument(
+        "--progress-file",
+        default=None,
+        help="Periodically write the progress of the build to this file: "
+             "files loaded, URLs checked, nodes split and embedded with "
+             "their rates, the ETA and the RSS"
+    )
+    parser.add_argument(
+        "--progress-format",
+        default="json",
+        choices=["json", "prometheus"],
+        help="Format of the progress file, a JSON document or a Prometheus "
+             "textfile for the node exporter"
+    )
+    parser.add_argument(
+        "--progress-interval",
+        default=10.0,
+        type=float,
+        help="Minimum number of seconds between two writes of the progress "
+             "file"
+    )
     return parser
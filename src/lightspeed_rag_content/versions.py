@@ -0,0 +1,115 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from typing import Any, List
+
+import faiss
+from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryBundle
+import numpy as np
+
+# Metadata of the nodes of a multi-version index, the versions containing
+# the node and the docs URL of the node in each of them
+VERSIONS_KEY = "versions"
+VERSION_URLS_KEY = "version_docs_urls"
+
+
+def exclude_version_metadata(node: BaseNode) -> None:
+    """Exclude the version dependent metadata from the node content.
+
+    The same chunk then gets the same embedding in every version.
+    """
+    version_keys = [VERSIONS_KEY, VERSION_URLS_KEY]
+    # The lists may be shared with the document and its other nodes
+    node.excluded_embed_metadata_keys = _union(
+        node.excluded_embed_metadata_keys, ["docs_url"] + version_keys)
+    node.excluded_llm_metadata_keys = _union(
+        node.excluded_llm_metadata_keys, version_keys)
+
+
+def _union(keys: List[str], other_keys: List[str]) -> List[str]:
+    return keys + [key for key in other_keys if key not in keys]
+
+
+def tag_node(node: BaseNode, version: str, docs_url: str | None) -> None:
+    """Record that the node is part of the given version."""
+    versions = node.metadata.setdefault(VERSIONS_KEY, [])
+    if version not in versions:
+        versions.append(version)
+    node.metadata.setdefault(VERSION_URLS_KEY, {})[version] = docs_url
+
+
+def in_version(node: BaseNode, version: str) -> bool:
+    """Indicate if the node is part of the version.
+
+    Nodes without versions, e.g. runbooks, are part of all versions.
+    """
+    versions = node.metadata.get(VERSIONS_KEY)
+    return versions is None or version in versions
+
+
+def use_version_url(node: BaseNode, version: str) -> None:
+    """Set the docs_url of the node to its URL in the version."""
+    urls = node.metadata.get(VERSION_URLS_KEY)
+    if urls is not None:
+        node.metadata["docs_url"] = urls[version]
+
+
+def version_ids(vector_index: VectorStoreIndex, version: str) -> np.ndarray:
+    """Return the FAISS IDs of the nodes of an index part of the version."""
+    docstore = vector_index.docstore
+    return np.array(
+        [int(vector_id) for vector_id, node_id
+         in vector_index.index_struct.nodes_dict.items()
+         if in_version(docstore.get_node(node_id), version)],
+        dtype=np.int64)
+
+
+class VersionFilteredRetriever(BaseRetriever):
+    """Retriever of a multi-version FAISS vector index.
+
+    Only the nodes of the requested version are searched, and their
+    docs_url is the URL of the node in that version.
+    """
+
+    def __init__(self, vector_index: VectorStoreIndex, version: str,
+                 similarity_top_k: int, **kwargs: Any):
+        self._vector_index = vector_index
+        self._version = version
+        self._similarity_top_k = similarity_top_k
+        # FAISS does not own the selector, it must outlive the searches
+        self._selector = faiss.IDSelectorBatch(
+            version_ids(vector_index, version))
+        super().__init__(**kwargs)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding
+        if embedding is None:
+            embedding = self._vector_index._embed_model.get_query_embedding(
+                query_bundle.query_str)
+
+        scores, ids = self._vector_index.vector_store.client.search(
+            np.array([embedding], dtype=np.float32), self._similarity_top_k,
+            params=faiss.SearchParameters(sel=self._selector))
+        found = ids[0] >= 0
+
+        nodes_dict = self._vector_index.index_struct.nodes_dict
+        nodes = self._vector_index.docstore.get_nodes(
+            [nodes_dict[str(i)] for i in ids[0][found]])
+        for node in nodes:
+            use_version_url(node, self._version)
+        return [NodeWithScore(node=node, score=float(score))
+                for node, score in zip(nodes, scores[0][found])]
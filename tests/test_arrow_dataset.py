@@ -0,0 +1,95 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from llama_index.core.schema import TextNode
+import numpy as np
+
+from lightspeed_rag_content import arrow_dataset
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"),
+                     "pyarrow is not installed")
+class TestArrowDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes = [
+            TextNode(id_="node-0", text="Text 0", embedding=[1.0, 0.0],
+                     metadata={"title": "Title 0", "versions": ["4.15"]}),
+            TextNode(id_="node-1", text="Text 1", embedding=[0.0, 1.0],
+                     metadata={"title": "Title 1", "versions": {"a": 1}}),
+        ]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_write_and_read_dataset(self):
+        for export_format in arrow_dataset.EXPORT_FORMATS:
+            path = arrow_dataset.write_dataset(
+                self.nodes, self.tmp_dir.name, export_format, "fake-index")
+
+            result = arrow_dataset.read_dataset(path)
+
+            self.assertEqual(
+                os.path.join(self.tmp_dir.name,
+                             arrow_dataset.DATASET_FILES[export_format]),
+                path)
+            self.assertEqual(["node-0", "node-1"],
+                             result.column("node_id").to_pylist())
+            self.assertEqual(["Title 0", "Title 1"],
+                             result.column("metadata.title").to_pylist())
+            # Values of different types are JSON encoded
+            self.assertEqual(['["4.15"]', '{"a": 1}'],
+                             result.column("metadata.versions").to_pylist())
+            self.assertEqual(b"fake-index",
+                             result.schema.metadata[b"index-id"])
+            np.testing.assert_array_equal(
+                [[1.0, 0.0], [0.0, 1.0]],
+                arrow_dataset.embeddings_array(result))
+
+    def test_embeddings_array_zero_copy(self):
+        path = arrow_dataset.write_dataset(
+            self.nodes, self.tmp_dir.name, "arrow", "fake-index")
+
+        result = arrow_dataset.embeddings_array(
+            arrow_dataset.read_dataset(path))
+
+        self.assertEqual(np.float32, result.dtype)
+        self.assertFalse(result.flags["OWNDATA"])
+
+    def test_write_dataset_unknown_format(self):
+        self.assertRaises(RuntimeError, arrow_dataset.write_dataset,
+                          self.nodes, self.tmp_dir.name, "csv", "fake-index")
+
+    def test_build_faiss_index(self):
+        path = arrow_dataset.write_dataset(
+            self.nodes, self.tmp_dir.name, "parquet", "fake-index")
+
+        index, node_ids = arrow_dataset.build_faiss_index(path)
+
+        self.assertEqual(["node-0", "node-1"], node_ids)
+        _, ids = index.search(np.array([[0.1, 0.9]], dtype=np.float32), 1)
+        self.assertEqual(1, ids[0][0])
+
+
+class TestImportPyarrow(unittest.TestCase):
+
+    def test_missing_pyarrow(self):
+        with mock.patch.dict("sys.modules", {"pyarrow": None}):
+            self.assertRaises(RuntimeError, arrow_dataset._import_pyarrow)
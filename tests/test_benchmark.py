@@ -0,0 +1,110 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from lightspeed_rag_content import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _read_tree(self, path):
+        contents = {}
+        for root, _, files in os.walk(path):
+            for name in files:
+                with open(os.path.join(root, name)) as file:
+                    contents[os.path.relpath(os.path.join(root, name),
+                                             path)] = file.read()
+        return contents
+
+    def test_generate_corpus(self):
+        result = benchmark.generate_corpus(
+            os.path.join(self.tmp_dir.name, "a"), num_files=10,
+            num_runbooks=3, depth=2, fanout=2)
+        result_again = benchmark.generate_corpus(
+            os.path.join(self.tmp_dir.name, "b"), num_files=10,
+            num_runbooks=3, depth=2, fanout=2)
+
+        docs = self._read_tree(result["docs-dir"])
+        self.assertEqual(10, len(docs))
+        self.assertIn(os.path.join("dir1", "dir0", "doc1.txt"), docs)
+        self.assertTrue(all(doc.startswith("# ") for doc in docs.values()))
+        self.assertEqual(3, len(os.listdir(result["runbooks-dir"])))
+        self.assertEqual(docs, self._read_tree(result_again["docs-dir"]))
+        self.assertEqual(result["bytes"], result_again["bytes"])
+
+    def test_stub_embedding(self):
+        embed_model = benchmark.StubEmbedding(embed_dim=8)
+
+        result = embed_model.get_text_embedding("fake text")
+
+        self.assertEqual(8, len(result))
+        self.assertAlmostEqual(1.0, float(np.linalg.norm(result)))
+        self.assertEqual(result, embed_model.get_query_embedding("fake text"))
+        self.assertNotEqual(result, embed_model.get_text_embedding("other"))
+
+    def test_parameter_grid(self):
+        result = benchmark.parameter_grid(workers=[1, 2], chunk_size=[100])
+
+        self.assertEqual([{"workers": 1, "chunk_size": 100},
+                          {"workers": 2, "chunk_size": 100}], result)
+
+    def test_check_budget(self):
+        results = [{"chunk-size": 380, "workers": 1, "embed-batch-size": 0,
+                    "nodes-per-second": 50.0, "total-seconds": 2.0,
+                    "index-bytes": 1000}]
+
+        self.assertEqual([], benchmark.check_budget(
+            results, {"min-nodes-per-second": 10, "max-total-seconds": 5}))
+        self.assertEqual(2, len(benchmark.check_budget(
+            results, {"min-nodes-per-second": 100, "max-index-bytes": 10})))
+        self.assertRaises(RuntimeError, benchmark.check_budget, results,
+                          {"max-nodes": 10})
+
+    def test_run_benchmark(self):
+        corpus = benchmark.generate_corpus(
+            os.path.join(self.tmp_dir.name, "corpus"), num_files=5,
+            num_runbooks=2)
+
+        result = benchmark.run_benchmark(
+            corpus, os.path.join(self.tmp_dir.name, "index"), chunk_size=100,
+            workers=2, embed_batch_size=4)
+
+        self.assertEqual(7, result["files"])
+        self.assertGreater(result["nodes"], 7)
+        self.assertGreater(result["index-bytes"], 0)
+        self.assertEqual("stub", result["embedding-model"])
+        self.assertTrue(os.path.exists(os.path.join(
+            self.tmp_dir.name, "index", "metadata.json")))
+
+    def test_node_memory(self):
+        corpus = benchmark.generate_corpus(
+            os.path.join(self.tmp_dir.name, "corpus"), num_files=5,
+            num_runbooks=2)
+
+        result = benchmark.node_memory(corpus, chunk_size=100, embed_dim=64)
+
+        self.assertGreater(result["nodes"], 7)
+        self.assertEqual(64, result["embedding-dimension"])
+        self.assertGreater(result["objects-bytes"], result["store-bytes"])
+        self.assertGreater(result["saving-ratio"], 0.0)
@@ -0,0 +1,114 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import tempfile
+import unittest
+from unittest import mock
+
+import faiss
+from llama_index.core.schema import QueryBundle, TextNode
+import numpy as np
+
+from lightspeed_rag_content import binary_index
+
+
+class TestBinaryIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.standard_normal((50, 12)).astype(np.float32)
+        faiss.normalize_L2(self.embeddings)
+        self.float_index = faiss.IndexFlatIP(12)
+        self.float_index.add(self.embeddings)
+
+    def test_binarize(self):
+        result = binary_index.binarize(np.array([[1.0, -1.0] * 6]))
+
+        np.testing.assert_array_equal([[0b10101010, 0b10100000]], result)
+
+    def test_build_binary_index(self):
+        result = binary_index.build_binary_index(self.float_index)
+
+        self.assertEqual(16, result.d)
+        self.assertEqual(50, result.ntotal)
+
+    def test_save_and_load_binary_index(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            binary_index.save_binary_index(self.float_index, persist_dir)
+            result = binary_index.load_binary_index(persist_dir)
+            vectors = binary_index.load_float_vectors(persist_dir)
+
+            self.assertEqual(50, result.ntotal)
+            self.assertIsInstance(vectors, np.memmap)
+            np.testing.assert_array_equal(self.embeddings, vectors)
+
+    def test_load_float_vectors_missing(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            self.assertRaises(RuntimeError, binary_index.load_float_vectors,
+                              persist_dir)
+
+    def test_search(self):
+        index = binary_index.build_binary_index(self.float_index)
+
+        ids, scores = binary_index.search(
+            index, self.embeddings, self.embeddings[7], 3,
+            rescore_multiplier=50)
+
+        expected_scores, expected_ids = self.float_index.search(
+            self.embeddings[7:8], 3)
+        np.testing.assert_array_equal(expected_ids[0], ids)
+        np.testing.assert_allclose(expected_scores[0], scores, rtol=1e-5)
+
+    def test_search_empty(self):
+        empty_index = faiss.IndexFlatIP(12)
+
+        ids, scores = binary_index.search(
+            binary_index.build_binary_index(empty_index),
+            np.empty((0, 12), dtype=np.float32), self.embeddings[0], 3)
+
+        self.assertEqual(0, len(ids))
+        self.assertEqual(0, len(scores))
+
+    def test_exact_search(self):
+        ids, scores = binary_index.exact_search(
+            self.embeddings, self.embeddings[7], 3, batch_size=8)
+
+        expected_scores, expected_ids = self.float_index.search(
+            self.embeddings[7:8], 3)
+        np.testing.assert_array_equal(expected_ids[0], ids)
+        np.testing.assert_allclose(expected_scores[0], scores, rtol=1e-5)
+
+    def test_retriever(self):
+        vector_index = mock.Mock()
+        vector_index.index_struct.nodes_dict = {
+            str(i): f"node-{i}" for i in range(50)}
+        vector_index.docstore.get_nodes.side_effect = lambda ids: [
+            TextNode(id_=node_id, text=node_id) for node_id in ids]
+        retrievers = [
+            binary_index.BinaryRescoreRetriever(
+                vector_index,
+                binary_index.build_binary_index(self.float_index),
+                self.embeddings, similarity_top_k=1, rescore_multiplier=50),
+            binary_index.FloatVectorsRetriever(
+                vector_index, self.embeddings, similarity_top_k=1),
+        ]
+
+        for retriever in retrievers:
+            result = retriever.retrieve(QueryBundle(
+                "fake query", embedding=self.embeddings[4].tolist()))
+
+            self.assertEqual(["node-4"], [n.node.node_id for n in result])
+            self.assertAlmostEqual(1.0, result[0].score, places=5)
+        vector_index._embed_model.get_query_embedding.assert_not_called()
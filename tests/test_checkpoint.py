@@ -0,0 +1,66 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+import unittest
+
+from llama_index.core.schema import TextNode
+
+from lightspeed_rag_content import checkpoint
+
+
+class TestEmbeddingCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        self.checkpoint = checkpoint.EmbeddingCheckpoint(self.output_dir.name)
+
+        self.node_0 = TextNode(text="First node", embedding=[1.0, 0.0])
+        self.node_1 = TextNode(text="Second node", embedding=[0.0, 1.0])
+
+    def test_node_key(self):
+        same_text = TextNode(text="First node")
+
+        self.assertEqual(self.checkpoint.node_key(self.node_0),
+                         self.checkpoint.node_key(same_text))
+        self.assertNotEqual(self.checkpoint.node_key(self.node_0),
+                            self.checkpoint.node_key(self.node_1))
+
+    def test_save_batch_and_load(self):
+        self.checkpoint.save_batch([self.node_0])
+        self.checkpoint.save_batch([self.node_1])
+
+        result = self.checkpoint.load()
+
+        self.assertEqual(
+            {self.checkpoint.node_key(self.node_0): [1.0, 0.0],
+             self.checkpoint.node_key(self.node_1): [0.0, 1.0]},
+            result)
+        self.assertEqual(
+            ["batch-000000.npz", "batch-000001.npz"],
+            sorted(os.listdir(self.checkpoint.directory)))
+
+    def test_load_empty(self):
+        self.assertEqual({}, self.checkpoint.load())
+
+    def test_clear(self):
+        self.checkpoint.save_batch([self.node_0])
+
+        self.checkpoint.clear()
+
+        self.assertFalse(os.path.exists(self.checkpoint.directory))
+        self.assertEqual({}, self.checkpoint.load())
@@ -0,0 +1,98 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import tempfile
+import unittest
+
+from llama_index.core.embeddings import MockEmbedding
+import numpy as np
+
+from lightspeed_rag_content import dimension_reduction
+
+
+class TestDimensionReduction(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.standard_normal((50, 16)).astype(np.float32)
+        self.embeddings /= np.linalg.norm(self.embeddings, axis=1,
+                                          keepdims=True)
+
+    def test_fit_transform_pca(self):
+        transform = dimension_reduction.fit_transform(
+            "pca", self.embeddings, 4)
+
+        result = dimension_reduction.apply_transform(
+            transform, self.embeddings)
+
+        self.assertEqual((50, 4), result.shape)
+        np.testing.assert_allclose(np.ones(50),
+                                   np.linalg.norm(result, axis=1), rtol=1e-5)
+
+    def test_fit_transform_matryoshka(self):
+        transform = dimension_reduction.fit_transform(
+            "matryoshka", self.embeddings, 4)
+
+        result = dimension_reduction.apply_transform(
+            transform, self.embeddings)
+
+        expected = self.embeddings[:, :4] / np.linalg.norm(
+            self.embeddings[:, :4], axis=1, keepdims=True)
+        np.testing.assert_allclose(expected, result, rtol=1e-5)
+
+    def test_fit_transform_unknown(self):
+        self.assertRaises(RuntimeError, dimension_reduction.fit_transform,
+                          "nonexisting", self.embeddings, 4)
+
+    def test_measure_recall(self):
+        self.assertEqual(1.0, dimension_reduction.measure_recall(
+            self.embeddings, self.embeddings))
+
+        random = np.random.default_rng(1).standard_normal((50, 4))
+        self.assertLess(dimension_reduction.measure_recall(
+            self.embeddings, random), 1.0)
+
+    def test_measure_recall_excludes_queries(self):
+        # Every query would find itself first in both searches
+        random = np.random.default_rng(1).standard_normal((50, 4))
+        random /= np.linalg.norm(random, axis=1, keepdims=True)
+
+        self.assertLess(dimension_reduction.measure_recall(
+            self.embeddings, random, top_k=1), 0.5)
+        self.assertEqual(1.0, dimension_reduction.measure_recall(
+            self.embeddings[:1], random[:1]))
+
+    def test_save_and_load_transform(self):
+        transform = dimension_reduction.fit_transform(
+            "pca", self.embeddings, 4)
+
+        with tempfile.TemporaryDirectory() as persist_dir:
+            self.assertIsNone(dimension_reduction.load_transform(persist_dir))
+            dimension_reduction.save_transform(transform, persist_dir)
+            result = dimension_reduction.load_transform(persist_dir)
+
+        np.testing.assert_allclose(
+            transform.apply(self.embeddings), result.apply(self.embeddings))
+
+    def test_transformed_embedding(self):
+        transform = dimension_reduction.fit_transform(
+            "matryoshka", self.embeddings, 2)
+        embed_model = dimension_reduction.TransformedEmbedding(
+            MockEmbedding(embed_dim=16), transform)
+
+        result = embed_model.get_query_embedding("fake query")
+
+        self.assertEqual(2, len(result))
+        self.assertEqual(2, len(embed_model.get_text_embedding("fake text")))
@@ -0,0 +1,133 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import tempfile
+import unittest
+from unittest import mock
+
+import faiss
+from llama_index.core.schema import (
+    NodeRelationship, QueryBundle, RelatedNodeInfo, TextNode)
+import numpy as np
+
+from lightspeed_rag_content import document_index
+
+
+def _node(i: int) -> TextNode:
+    # Chunks 0-9 are of doc-0, 10-19 of doc-1, ...
+    return TextNode(id_=f"node-{i}", text=f"node-{i}", relationships={
+        NodeRelationship.SOURCE: RelatedNodeInfo(node_id=f"doc-{i // 10}")})
+
+
+class TestDocumentIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # The chunks of a document are close to their document vector
+        documents = rng.standard_normal((5, 12)).astype(np.float32)
+        self.embeddings = (np.repeat(documents, 10, axis=0) + 0.3
+                           * rng.standard_normal((50, 12))).astype(np.float32)
+        faiss.normalize_L2(self.embeddings)
+        self.float_index = faiss.IndexFlatIP(12)
+        self.float_index.add(self.embeddings)
+        self.nodes_dict = {str(i): f"node-{i}" for i in range(50)}
+        self.docstore = mock.Mock()
+        self.docstore.get_node.side_effect = lambda node_id: _node(
+            int(node_id.split("-")[1]))
+
+    def _build(self):
+        return document_index.build_document_index(
+            self.float_index, self.nodes_dict, self.docstore)
+
+    def test_build_document_index(self):
+        result = self._build()
+
+        self.assertEqual([f"doc-{i}" for i in range(5)], result.doc_ids)
+        self.assertEqual(5, result.index.ntotal)
+        np.testing.assert_array_equal(np.arange(10, 20), result.chunks(1))
+        expected = self.embeddings[10:20].mean(axis=0)
+        np.testing.assert_allclose(
+            expected / np.linalg.norm(expected),
+            result.index.reconstruct(1), rtol=1e-5)
+
+    def test_build_document_index_empty(self):
+        result = document_index.build_document_index(
+            faiss.IndexFlatIP(12), {}, self.docstore)
+
+        self.assertEqual(0, len(result))
+        self.assertEqual(0, result.index.ntotal)
+
+    def test_save_and_load_document_index(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            document_index.save_document_index(
+                self.float_index, self.nodes_dict, self.docstore, persist_dir)
+            result = document_index.load_document_index(persist_dir)
+
+        self.assertEqual(5, len(result))
+        self.assertEqual(5, result.index.ntotal)
+        np.testing.assert_array_equal(np.arange(40, 50), result.chunks(4))
+
+    def test_search(self):
+        ids, scores = document_index.search(
+            self._build(), self.float_index, self.embeddings[7], 3,
+            top_documents=5)
+
+        expected_scores, expected_ids = self.float_index.search(
+            self.embeddings[7:8], 3)
+        np.testing.assert_array_equal(expected_ids[0], ids)
+        np.testing.assert_allclose(expected_scores[0], scores, rtol=1e-5)
+
+    def test_search_top_documents(self):
+        ids, _ = document_index.search(
+            self._build(), self.float_index, self.embeddings[23], 50,
+            top_documents=1)
+
+        np.testing.assert_array_equal(np.arange(20, 30), np.sort(ids))
+
+    def test_search_max_per_document(self):
+        ids, scores = document_index.search(
+            self._build(), self.float_index, self.embeddings[7], 6,
+            top_documents=3, max_per_document=2)
+
+        self.assertEqual(6, len(ids))
+        self.assertEqual(3, len({i // 10 for i in ids}))
+        self.assertEqual(list(scores), sorted(scores, reverse=True))
+
+    def test_search_empty(self):
+        empty_index = faiss.IndexFlatIP(12)
+
+        ids, scores = document_index.search(
+            document_index.build_document_index(
+                empty_index, {}, self.docstore),
+            empty_index, self.embeddings[0], 3)
+
+        self.assertEqual(0, len(ids))
+        self.assertEqual(0, len(scores))
+
+    def test_retriever(self):
+        vector_index = mock.Mock()
+        vector_index.vector_store.client = self.float_index
+        vector_index.index_struct.nodes_dict = self.nodes_dict
+        vector_index.docstore.get_nodes.side_effect = lambda ids: [
+            TextNode(id_=node_id, text=node_id) for node_id in ids]
+        retriever = document_index.DocumentRetriever(
+            vector_index, self._build(), similarity_top_k=1, top_documents=2)
+
+        result = retriever.retrieve(QueryBundle(
+            "fake query", embedding=self.embeddings[34].tolist()))
+
+        self.assertEqual(["node-34"], [n.node.node_id for n in result])
+        self.assertAlmostEqual(1.0, result[0].score, places=5)
+        vector_index._embed_model.get_query_embedding.assert_not_called()
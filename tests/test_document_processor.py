@@ -14,11 +14,14 @@
 #    under the License.
 
 import os
+import tempfile
 import unittest
 from unittest import mock
 
-from llama_index.core.schema import TextNode
+from llama_index.core.schema import Document, NodeRelationship, TextNode
+import numpy as np
 from lightspeed_rag_content import document_processor
+from lightspeed_rag_content.node_store import NodeStore
 
 
 # Mock class for HuggingFaceEmbedding
@@ -87,6 +90,278 @@ class TestMetadataProcessor(unittest.TestCase):
         fake_index.storage_context.persist.assert_called_once_with(
             persist_dir="/fake/path")
 
+    def test__embed_nodes(self):
+        self.doc_processor.checkpoint_batch_size = 2
+        nodes = [TextNode(text=f"Node {i}") for i in range(3)]
+        self.doc_processor._good_nodes = nodes
+        embed_model = self.settings_obj.settings.embed_model
+        embed_model.get_text_embedding_batch.side_effect = [
+            [[0.0], [1.0]], [[2.0]]]
+        fake_checkpoint = mock.Mock()
+
+        self.doc_processor._embed_nodes(fake_checkpoint)
+
+        fake_checkpoint.clear.assert_called_once_with()
+        fake_checkpoint.load.assert_not_called()
+        self.assertEqual([[0.0], [1.0], [2.0]],
+                         [node.embedding for node in nodes])
+        fake_checkpoint.save_batch.assert_has_calls(
+            [mock.call(nodes[:2]), mock.call(nodes[2:])])
+
+    def test__embed_nodes_progress(self):
+        self.doc_processor.checkpoint_batch_size = 2
+        self.doc_processor.progress = mock.Mock()
+        self.doc_processor._good_nodes = [
+            TextNode(text=f"Node {i}") for i in range(3)]
+        embed_model = self.settings_obj.settings.embed_model
+        embed_model.get_text_embedding_batch.side_effect = [
+            [[0.0], [1.0]], [[2.0]]]
+
+        self.doc_processor._embed_nodes(None)
+
+        self.doc_processor.progress.add_total.assert_called_once_with(
+            "nodes-embedded", 3)
+        self.doc_processor.progress.add.assert_has_calls([
+            mock.call("nodes-embedded", 2), mock.call("nodes-embedded", 1)])
+
+    def test__embed_nodes_resume(self):
+        self.doc_processor.checkpoint_batch_size = 2
+        self.doc_processor.resume = True
+        nodes = [TextNode(text=f"Node {i}") for i in range(3)]
+        self.doc_processor._good_nodes = nodes
+        embed_model = self.settings_obj.settings.embed_model
+        embed_model.get_text_embedding_batch.return_value = [[2.0]]
+        fake_checkpoint = mock.Mock()
+        fake_checkpoint.node_key.side_effect = lambda node: node.text
+        fake_checkpoint.load.return_value = {"Node 0": [0.0], "Node 1": [1.0]}
+
+        self.doc_processor._embed_nodes(fake_checkpoint)
+
+        fake_checkpoint.clear.assert_not_called()
+        embed_model.get_text_embedding_batch.assert_called_once_with(
+            ["Node 2"])
+        self.assertEqual([[0.0], [1.0], [2.0]],
+                         [node.embedding for node in nodes])
+        fake_checkpoint.save_batch.assert_called_once_with(nodes[2:])
+
+    @mock.patch.object(document_processor, "EmbeddingCheckpoint")
+    @mock.patch.object(document_processor, "VectorStoreIndex")
+    def test__save_index_checkpoint(self, mock_vector_index, mock_checkpoint):
+        self.doc_processor.checkpoint_batch_size = 10
+
+        with mock.patch.object(self.doc_processor, "_embed_nodes") as mock_embed:
+            self.doc_processor._save_index("fake-index", "/fake/path")
+
+        mock_checkpoint.assert_called_once_with("/fake/path")
+        mock_embed.assert_called_once_with(mock_checkpoint.return_value)
+        mock_checkpoint.return_value.clear.assert_called_once_with()
+
+    @mock.patch.object(document_processor.binary_index, "save_binary_index")
+    @mock.patch.object(document_processor, "VectorStoreIndex")
+    def test__save_index_binary(self, mock_vector_index, mock_save_binary):
+        self.doc_processor.binary_index = True
+        fake_index = mock_vector_index.return_value
+
+        self.doc_processor._save_index("fake-index", "/fake/path")
+
+        mock_save_binary.assert_called_once_with(
+            fake_index.storage_context.vector_store.client, "/fake/path")
+
+    @mock.patch.object(document_processor.document_index,
+                       "save_document_index")
+    @mock.patch.object(document_processor, "VectorStoreIndex")
+    def test__save_index_document(self, mock_vector_index, mock_save_document):
+        self.doc_processor.document_index = True
+        fake_index = mock_vector_index.return_value
+
+        self.doc_processor._save_index("fake-index", "/fake/path")
+
+        mock_save_document.assert_called_once_with(
+            fake_index.storage_context.vector_store.client,
+            fake_index.index_struct.nodes_dict, fake_index.docstore,
+            "/fake/path")
+
+    @mock.patch.object(document_processor.publish, "publish")
+    @mock.patch.object(document_processor.publish, "prepare_staging")
+    def test_save_publish(self, mock_prepare, mock_publish):
+        self.doc_processor.publish = True
+        mock_prepare.return_value = "/fake/path.versions/staging"
+
+        with mock.patch.object(self.doc_processor, "_save_index") as mock_save, \
+                mock.patch.object(self.doc_processor, "_save_metadata") as mock_metadata:
+            self.doc_processor.save("fake-index", "/fake/path")
+
+        mock_prepare.assert_called_once_with("/fake/path")
+        mock_save.assert_called_once_with(
+            "fake-index", "/fake/path.versions/staging")
+        mock_metadata.assert_called_once_with(
+            "fake-index", "/fake/path.versions/staging")
+        mock_publish.assert_called_once_with(
+            "/fake/path.versions/staging", "/fake/path")
+
+    @mock.patch.object(document_processor, "VectorStoreIndex")
+    def test__save_index_compact(self, mock_vector_index):
+        self.doc_processor.compact_nodes = True
+        self.doc_processor._good_nodes = NodeStore()
+        self.doc_processor._good_nodes.extend(
+            [TextNode(text=f"Node {i}") for i in range(3)])
+        embed_model = self.settings_obj.settings.embed_model
+        embed_model.embed_batch_size = 10
+        embed_model.get_text_embedding_batch.return_value = [
+            [0.0], [1.0], [2.0]]
+
+        with mock.patch.object(document_processor, "INSERT_BATCH_SIZE", 2):
+            self.doc_processor._save_index("fake-index", "/fake/path")
+
+        fake_index = mock_vector_index.return_value
+        mock_vector_index.assert_called_once_with(
+            [], storage_context=self.settings_obj.storage_context)
+        inserted = [node for call in fake_index.insert_nodes.mock_calls
+                    for node in call.args[0]]
+        self.assertEqual(2, len(fake_index.insert_nodes.mock_calls))
+        self.assertEqual(["Node 0", "Node 1", "Node 2"],
+                         [node.text for node in inserted])
+        self.assertEqual([[0.0], [1.0], [2.0]],
+                         [node.embedding for node in inserted])
+
+    @mock.patch.object(document_processor.arrow_dataset, "write_dataset")
+    @mock.patch.object(document_processor, "VectorStoreIndex")
+    def test__save_index_export(self, mock_vector_index, mock_write):
+        self.doc_processor.export_format = "arrow"
+
+        with mock.patch.object(self.doc_processor, "_embed_nodes") as mock_embed:
+            self.doc_processor._save_index("fake-index", "/fake/path")
+
+        mock_embed.assert_called_once_with(None)
+        mock_write.assert_called_once_with(
+            self.doc_processor._good_nodes, "/fake/path", "arrow",
+            "fake-index")
+
+    def test_invalid_export_format(self):
+        self.assertRaises(RuntimeError,
+            document_processor.DocumentProcessor,
+            self.chunk_size, self.chunk_overlap, self.model_name,
+            self.embeddings_model_dir, self.num_workers,
+            export_format="csv")
+
+    def test_pipelined_checkpoint(self):
+        for kwargs in ({"checkpoint_batch_size": 10}, {"resume": True}):
+            self.assertRaises(RuntimeError,
+                document_processor.DocumentProcessor,
+                self.chunk_size, self.chunk_overlap, self.model_name,
+                self.embeddings_model_dir, self.num_workers,
+                pipelined=True, **kwargs)
+
+    def test_binary_index_postgres(self):
+        self.assertRaises(RuntimeError,
+            document_processor.DocumentProcessor,
+            self.chunk_size, self.chunk_overlap, self.model_name,
+            self.embeddings_model_dir, self.num_workers,
+            "postgres", binary_index=True)
+
+    def test_document_index_postgres(self):
+        self.assertRaises(RuntimeError,
+            document_processor.DocumentProcessor,
+            self.chunk_size, self.chunk_overlap, self.model_name,
+            self.embeddings_model_dir, self.num_workers,
+            "postgres", document_index=True)
+
+    @mock.patch.object(document_processor.dimension_reduction,
+                       "save_transform")
+    def test__reduce_dimension(self, mock_save_transform):
+        self.doc_processor.dimension_reduction = "matryoshka"
+        self.doc_processor.reduced_dimension = 2
+        self.doc_processor._settings = document_processor.DocumentSettings(
+            self.settings_obj, 3, mock.Mock())
+        self.doc_processor._good_nodes = [
+            TextNode(text="Node 0", embedding=[3.0, 4.0, 1.0]),
+            TextNode(text="Node 1", embedding=[0.0, 2.0, 1.0])]
+
+        with mock.patch.object(self.doc_processor,
+                               "_get_storage_context") as mock_storage:
+            self.doc_processor._reduce_dimension("/fake/path")
+
+        self.assertEqual([[0.6, 0.8], [0.0, 1.0]],
+                         [np.round(node.embedding, 6).tolist()
+                          for node in self.doc_processor._good_nodes])
+        mock_save_transform.assert_called_once_with(mock.ANY, "/fake/path")
+        mock_storage.assert_called_once_with(2)
+        self.assertEqual(2, self.doc_processor._settings.embedding_dimension)
+        self.assertEqual(
+            {"method": "matryoshka", "original-dimension": 3,
+             "recall@10": 1.0},
+            self.doc_processor._reduction_metadata)
+
+    @mock.patch.object(document_processor.embeddings, "get_embedding_model")
+    def test_embed_model(self, mock_get_model):
+        self.patcher.stop()  # Remove the mock on the _get_settings() method
+        embed_model = mock.MagicMock()
+        embed_model.get_text_embedding.return_value = [0.0, 1.0]
+
+        with mock.patch.object(document_processor, "Settings") as settings:
+            settings.embed_model = embed_model
+            doc_processor = document_processor.DocumentProcessor(
+                self.chunk_size, self.chunk_overlap, self.model_name,
+                self.embeddings_model_dir, self.num_workers,
+                embed_model=embed_model, embed_batch_size=16)
+
+        mock_get_model.assert_not_called()
+        self.assertEqual(16, embed_model.embed_batch_size)
+        self.assertEqual(2, doc_processor._settings.embedding_dimension)
+
+    def test_embed_model_environment(self):
+        with mock.patch.dict(os.environ,
+                             {"HF_HOME": "/fake/hf_home"}):
+            document_processor.DocumentProcessor(
+                self.chunk_size, self.chunk_overlap, self.model_name, None,
+                embed_model=mock.MagicMock())
+
+            self.assertEqual("/fake/hf_home",
+                             os.environ["HF_HOME"])
+
+    def test_nodes(self):
+        self.doc_processor._good_nodes = [TextNode(text="Node")]
+        self.doc_processor._num_embedded_files = 1
+
+        self.assertIs(self.doc_processor._good_nodes, self.doc_processor.nodes)
+        self.assertEqual(1, self.doc_processor.num_embedded_files)
+
+    def test_embedding_model(self):
+        self.assertIs(self.settings_obj.settings.embed_model,
+                      self.doc_processor.embedding_model)
+
+    def test_doc_path(self):
+        self.doc_processor._doc_paths["doc-1"] = "dir/doc.txt"
+
+        self.assertEqual("dir/doc.txt", self.doc_processor.doc_path("doc-1"))
+
+    def test_split(self):
+        doc = Document(text="First sentence. Second sentence.", id_="doc-1")
+
+        nodes = self.doc_processor.split([doc], 4096, 0)
+
+        self.assertEqual([document_processor._node_id(0, doc)],
+                         [node.node_id for node in nodes])
+        self.assertEqual("doc-1", nodes[0].ref_doc_id)
+        self.assertEqual([], self.doc_processor.nodes)
+
+    def test_embed(self):
+        with mock.patch.object(self.doc_processor,
+                               "_embed_nodes") as mock_embed:
+            self.doc_processor.embed()
+
+        mock_embed.assert_called_once_with(None)
+
+    @mock.patch("lightspeed_rag_content.embeddings.HuggingFaceEmbedding",
+                new=MockEmbedding)
+    def test_invalid_reduced_dimension(self):
+        self.patcher.stop()  # Remove the mock on the _get_settings() method
+        self.assertRaises(RuntimeError,
+            document_processor.DocumentProcessor,
+            self.chunk_size, self.chunk_overlap, self.model_name,
+            self.embeddings_model_dir, self.num_workers,
+            dimension_reduction="pca", reduced_dimension=3)
+
     @mock.patch.object(document_processor.json, "dumps")
     @mock.patch("builtins.open", new_callable=mock.mock_open)
     def test__save_metadata(self, mock_file, mock_dumps):
@@ -97,6 +372,7 @@ class TestMetadataProcessor(unittest.TestCase):
             "execution-time": mock.ANY,
             "llm": "None",
             "embedding-model": self.model_name,
+            "embedding-backend": "torch",
             "index-id": "fake-index",
             "vector-db": "faiss.IndexFlatIP",
             "embedding-dimension": mock.ANY,
@@ -106,22 +382,246 @@ class TestMetadataProcessor(unittest.TestCase):
         }
         mock_dumps.assert_called_once_with(expected_dict)
 
-    @mock.patch.object(document_processor, "SimpleDirectoryReader")
-    def test_process(self, mock_dir_reader):
-        reader = mock_dir_reader.return_value
-        reader.load_data.return_value = ["doc0", "doc1", "doc3"]
+    @mock.patch.object(document_processor.json, "dumps")
+    @mock.patch("builtins.open", new_callable=mock.mock_open)
+    def test__save_metadata_reproducible(self, mock_file, mock_dumps):
+        self.doc_processor.reproducible = True
+
+        self.doc_processor._save_metadata("fake-index", "/fake/path")
+
+        self.assertNotIn("execution-time", mock_dumps.call_args.args[0])
+
+    def test_process(self):
         fake_metadata = mock.MagicMock()
         fake_good_nodes = [mock.Mock(), mock.Mock()]
+        fake_files = ["/fake/path/docs/a.txt", "/fake/path/docs/b.txt"]
 
-        with mock.patch.object(
-            self.doc_processor, '_filter_out_invalid_nodes') as mock_filter:
+        with (
+            mock.patch.object(self.doc_processor, "_list_files",
+                              return_value=fake_files),
+            mock.patch.object(self.doc_processor, "_load_documents",
+                              return_value=["doc0", "doc1", "doc3"]
+                              ) as mock_load,
+            mock.patch.object(self.doc_processor,
+                              '_filter_out_invalid_nodes') as mock_filter,
+        ):
             mock_filter.return_value = fake_good_nodes
             self.doc_processor.process("/fake/path/docs", fake_metadata)
 
-        reader.load_data.assert_called_once_with(num_workers=self.num_workers)
+        fake_metadata.prefetch.assert_called_once_with(fake_files)
+        mock_load.assert_called_once_with(
+            "/fake/path/docs", fake_files, fake_metadata, None)
         self.assertEqual(fake_good_nodes, self.doc_processor._good_nodes)
         self.assertEqual(3, self.doc_processor._num_embedded_files)
 
+    def test_load(self):
+        fake_metadata = mock.MagicMock()
+        fake_files = ["/fake/path/docs/a.txt"]
+
+        with (
+            mock.patch.object(self.doc_processor, "_list_files",
+                              return_value=fake_files) as mock_list,
+            mock.patch.object(self.doc_processor, "_load_documents",
+                              return_value=["doc0"]) as mock_load,
+        ):
+            result = self.doc_processor.load(
+                "/fake/path/docs", fake_metadata, [".txt"])
+
+        self.assertEqual(["doc0"], result)
+        mock_list.assert_called_once_with("/fake/path/docs", [".txt"], None)
+        fake_metadata.prefetch.assert_called_once_with(fake_files)
+        mock_load.assert_called_once_with(
+            "/fake/path/docs", fake_files, fake_metadata, None)
+        self.assertEqual([], self.doc_processor._good_nodes)
+
+    def test_process_pipelined(self):
+        self.doc_processor.pipelined = True
+        fake_metadata = mock.MagicMock()
+        fake_files = ["/fake/path/docs/a.txt", "/fake/path/docs/b.txt"]
+        docs = {
+            path: [document_processor.Document(text=path, id_=path)]
+            for path in fake_files}
+        settings = self.settings_obj.settings
+        settings.text_splitter.get_nodes_from_documents.side_effect = (
+            lambda docs: [TextNode(
+                text=f"Node of {doc.text}",
+                relationships={
+                    NodeRelationship.SOURCE: doc.as_related_node_info()})
+                for doc in docs])
+        settings.embed_model.embed_batch_size = 10
+        settings.embed_model.get_text_embedding_batch.side_effect = (
+            lambda texts: [[float(i)] for i in range(len(texts))])
+
+        with (
+            mock.patch.object(self.doc_processor, "_list_files",
+                              return_value=fake_files),
+            mock.patch.object(self.doc_processor, "_load_file",
+                              side_effect=lambda d, path, m, e: docs[path]),
+        ):
+            self.doc_processor.process("/fake/path/docs", fake_metadata)
+
+        fake_metadata.prefetch.assert_not_called()
+        self.assertEqual(
+            ["Node of /fake/path/docs/a.txt", "Node of /fake/path/docs/b.txt"],
+            [node.text for node in self.doc_processor._good_nodes])
+        for node in self.doc_processor._good_nodes:
+            self.assertIsNotNone(node.embedding)
+        self.assertEqual(2, self.doc_processor._num_embedded_files)
+        self.assertEqual(["read", "split", "embed"],
+                         [stage["stage"] for stage
+                          in self.doc_processor.pipeline_metrics])
+
+    def _version_nodes(self, version, texts):
+        nodes = []
+        for text in texts:
+            doc = document_processor.Document(
+                text=text, id_=f"{version}-{text}",
+                metadata={"docs_url": f"https://{version}/{text}"})
+            self.doc_processor._doc_paths[doc.id_] = "doc.txt"
+            nodes.append(TextNode(
+                text=text, metadata=dict(doc.metadata),
+                relationships={
+                    NodeRelationship.SOURCE: doc.as_related_node_info()}))
+        return nodes
+
+    def test__merge_version(self):
+        result_1 = self.doc_processor._merge_version(
+            self._version_nodes("1", ["Shared text", "Old text"]), "1")
+        result_2 = self.doc_processor._merge_version(
+            self._version_nodes("2", ["Shared text", "New text"]), "2")
+
+        self.assertEqual(["Shared text", "Old text"],
+                         [node.text for node in result_1])
+        self.assertEqual(["New text"], [node.text for node in result_2])
+        self.assertEqual(["1", "2"], result_1[0].metadata["versions"])
+        self.assertEqual(
+            {"1": "https://1/Shared text", "2": "https://2/Shared text"},
+            result_1[0].metadata["version_docs_urls"])
+        self.assertEqual(["1"], result_1[1].metadata["versions"])
+        self.assertNotIn("https://", result_1[0].get_content(
+            metadata_mode=document_processor.MetadataMode.EMBED))
+
+    def _link(self, nodes):
+        for previous, node in zip(nodes, nodes[1:]):
+            previous.relationships[NodeRelationship.NEXT] = (
+                node.as_related_node_info())
+            node.relationships[NodeRelationship.PREVIOUS] = (
+                previous.as_related_node_info())
+        return nodes
+
+    def test__merge_version_relationships(self):
+        result_1 = self.doc_processor._merge_version(self._link(
+            self._version_nodes("1", ["First", "Old text", "Last"])), "1")
+        result_2 = self.doc_processor._merge_version(self._link(
+            self._version_nodes("2", ["First", "New text", "Last"])), "2")
+
+        self.assertEqual(["New text"], [node.text for node in result_2])
+        relationships = result_2[0].relationships
+        self.assertEqual(result_1[0].node_id,
+                         relationships[NodeRelationship.PREVIOUS].node_id)
+        self.assertEqual(result_1[2].node_id,
+                         relationships[NodeRelationship.NEXT].node_id)
+        # The shared nodes keep the document of the first version
+        self.assertEqual("1-First", result_1[0].ref_doc_id)
+
+    def test__merge_version_compact(self):
+        self.doc_processor._good_nodes = NodeStore()
+        self.doc_processor._add_nodes(self.doc_processor._merge_version(
+            self._version_nodes("1", ["Shared text", "Old text"]), "1"))
+        self.doc_processor._add_nodes(self.doc_processor._merge_version(
+            self._version_nodes("2", ["Shared text", "New text"]), "2"))
+
+        nodes = list(self.doc_processor._good_nodes)
+        self.assertEqual(["Shared text", "Old text", "New text"],
+                         [node.text for node in nodes])
+        self.assertEqual(["1", "2"], nodes[0].metadata["versions"])
+        self.assertEqual(["1"], nodes[1].metadata["versions"])
+        self.assertEqual(["2"], nodes[2].metadata["versions"])
+
+    def test_process_version(self):
+        fake_nodes = [mock.Mock(), mock.Mock()]
+
+        with (
+            mock.patch.object(self.doc_processor, "_list_files"),
+            mock.patch.object(self.doc_processor, "_load_documents",
+                              return_value=["doc0"]),
+            mock.patch.object(self.doc_processor,
+                              '_filter_out_invalid_nodes'),
+            mock.patch.object(self.doc_processor, "_merge_version",
+                              return_value=fake_nodes) as mock_merge,
+        ):
+            self.doc_processor.process("/fake/path/docs", mock.MagicMock(),
+                                       version="4.16")
+
+        mock_merge.assert_called_once_with(mock.ANY, "4.16")
+        self.assertEqual(fake_nodes, self.doc_processor._good_nodes)
+        self.assertEqual(["4.16"], self.doc_processor._versions)
+
+    def test__list_files(self):
+        with tempfile.TemporaryDirectory() as docs_dir:
+            for path in ["b.md", "a.txt", "sub/c.md", ".hidden.md",
+                         ".git/d.md"]:
+                os.makedirs(os.path.dirname(os.path.join(docs_dir, path)),
+                            exist_ok=True)
+                open(os.path.join(docs_dir, path), "w").close()
+
+            result = self.doc_processor._list_files(docs_dir, [".md"])
+
+        self.assertEqual([os.path.join(docs_dir, "b.md"),
+                          os.path.join(docs_dir, "sub/c.md")], result)
+
+    def test__list_files_selector(self):
+        selector = mock.Mock()
+        selector.select.return_value = (["/fake/docs/a.txt"], {"selected": 1})
+
+        result = self.doc_processor._list_files("/fake/docs", None, selector)
+
+        self.assertEqual(["/fake/docs/a.txt"], result)
+        selector.select.assert_called_once_with("/fake/docs", None)
+        self.assertEqual([{"folder": "docs", "selected": 1}],
+                         self.doc_processor._selection_stats)
+
+    def test__list_files_empty(self):
+        with tempfile.TemporaryDirectory() as docs_dir:
+            self.assertRaises(ValueError, self.doc_processor._list_files,
+                              docs_dir, None)
+
+    def test__load_documents(self):
+        fake_metadata = mock.Mock()
+        fake_metadata.populate.side_effect = lambda path: {"title": path}
+        with tempfile.TemporaryDirectory() as docs_dir:
+            input_files = []
+            for name in ["a.txt", "b.txt"]:
+                input_files.append(os.path.join(docs_dir, name))
+                with open(input_files[-1], "w") as file:
+                    file.write(f"Content of {name}")
+
+            result = self.doc_processor._load_documents(
+                docs_dir, input_files, fake_metadata, None)
+            # Loading the same files again must produce the same IDs
+            result_again = self.doc_processor._load_documents(
+                docs_dir, input_files, fake_metadata, None)
+
+        self.assertEqual(["Content of a.txt", "Content of b.txt"],
+                         [doc.text for doc in result])
+        self.assertEqual([{"title": path} for path in input_files],
+                         [doc.metadata for doc in result])
+        self.assertEqual([doc.id_ for doc in result],
+                         [doc.id_ for doc in result_again])
+        self.assertNotEqual(result[0].id_, result[1].id_)
+
+    def test_stable_id(self):
+        self.assertEqual(document_processor.stable_id("a", "b"),
+                         document_processor.stable_id("a", "b"))
+        self.assertNotEqual(document_processor.stable_id("a", "b"),
+                            document_processor.stable_id("ab"))
+
+    def test__node_id(self):
+        doc = document_processor.Document(text="Fake text", id_="fake-doc")
+
+        self.assertEqual(document_processor.stable_id("fake-doc", "1"),
+                         document_processor._node_id(1, doc))
+
     def test_save(self):
         with (
             mock.patch.object(self.doc_processor, "_save_index") as mock_index,
@@ -139,7 +639,7 @@ class TestMetadataProcessor(unittest.TestCase):
         "POSTGRES_PORT": "15432",
         "POSTGRES_DATABASE": "postgres",
     })
-    @mock.patch("lightspeed_rag_content.document_processor.HuggingFaceEmbedding", new=MockEmbedding)
+    @mock.patch("lightspeed_rag_content.embeddings.HuggingFaceEmbedding", new=MockEmbedding)
     def test_pgvector(self):
         self.patcher.stop()  # Remove the mock on the _get_settings() method
         self.doc_processor = document_processor.DocumentProcessor(
@@ -148,7 +648,7 @@ class TestMetadataProcessor(unittest.TestCase):
             "postgres")
         self.assertIsNotNone(self.doc_processor)
 
-    @mock.patch("lightspeed_rag_content.document_processor.HuggingFaceEmbedding", new=MockEmbedding)
+    @mock.patch("lightspeed_rag_content.embeddings.HuggingFaceEmbedding", new=MockEmbedding)
     def test_invalid_vector_store_type(self):
         self.patcher.stop()  # Remove the mock on the _get_settings() method
         self.assertRaises(RuntimeError,
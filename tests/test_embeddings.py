@@ -0,0 +1,154 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from lightspeed_rag_content import embeddings
+
+
+class FakeBatchEmbedding:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def get_text_embedding_batch(self, texts):
+        return self.vectors[:len(texts)]
+
+
+class TestOnnxEmbedding(unittest.TestCase):
+
+    def setUp(self):
+        self.onnxruntime = mock.MagicMock()
+        self.session = self.onnxruntime.InferenceSession.return_value
+        input_ids = mock.Mock()
+        input_ids.name = "input_ids"
+        attention_mask = mock.Mock()
+        attention_mask.name = "attention_mask"
+        self.session.get_inputs.return_value = [input_ids, attention_mask]
+
+        self.tokenizer = mock.MagicMock()
+        self.tokenizer.model_max_length = 384
+
+        patchers = [
+            mock.patch.object(embeddings, "_import_onnxruntime",
+                              return_value=self.onnxruntime),
+            mock.patch.object(embeddings.AutoTokenizer, "from_pretrained",
+                              return_value=self.tokenizer),
+            mock.patch.object(embeddings, "_read_json", return_value={}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_init(self):
+        model = embeddings.OnnxEmbedding("/fake/model", num_threads=2)
+
+        self.onnxruntime.InferenceSession.assert_called_once_with(
+            "/fake/model/onnx/model.onnx",
+            sess_options=self.onnxruntime.SessionOptions.return_value,
+            providers=["CPUExecutionProvider"])
+        self.assertEqual(2, self.onnxruntime.SessionOptions.return_value
+                         .intra_op_num_threads)
+        self.assertEqual(384, model.max_length)
+        self.assertEqual("mean", model.pooling)
+
+    def test_embed_mean_pooling(self):
+        self.tokenizer.return_value = {
+            "input_ids": np.array([[1, 2, 0]]),
+            "attention_mask": np.array([[1, 1, 0]]),
+        }
+        self.session.run.return_value = [
+            np.array([[[3.0, 0.0], [1.0, 0.0], [100.0, 100.0]]])]
+        model = embeddings.OnnxEmbedding("/fake/model", normalize=False)
+
+        result = model.get_text_embedding("fake text")
+
+        # The padding token must not contribute to the mean
+        self.assertEqual([2.0, 0.0], result)
+        self.assertEqual(["input_ids", "attention_mask"],
+                         list(self.session.run.call_args[0][1]))
+
+    def test_embed_normalize(self):
+        self.tokenizer.return_value = {
+            "input_ids": np.array([[1]]),
+            "attention_mask": np.array([[1]]),
+        }
+        self.session.run.return_value = [np.array([[[3.0, 4.0]]])]
+        model = embeddings.OnnxEmbedding("/fake/model")
+
+        result = model.get_query_embedding("fake query")
+
+        np.testing.assert_allclose([0.6, 0.8], result)
+
+
+class TestEmbeddings(unittest.TestCase):
+
+    @mock.patch.object(embeddings, "HuggingFaceEmbedding")
+    def test_get_embedding_model_torch(self, mock_hf):
+        result = embeddings.get_embedding_model("/fake/model")
+
+        mock_hf.assert_called_once_with(model_name="/fake/model")
+        self.assertEqual(mock_hf.return_value, result)
+
+    @mock.patch.object(embeddings, "OnnxEmbedding")
+    def test_get_embedding_model_onnx(self, mock_onnx):
+        result = embeddings.get_embedding_model(
+            "/fake/model", "onnx", "model_qint8.onnx")
+
+        mock_onnx.assert_called_once_with(
+            "/fake/model", onnx_file="model_qint8.onnx")
+        self.assertEqual(mock_onnx.return_value, result)
+
+    @mock.patch.object(embeddings, "PreparedEmbedding")
+    def test_get_embedding_model_prepared(self, mock_prepared):
+        result = embeddings.get_embedding_model("/fake/model", "prepared")
+
+        mock_prepared.assert_called_once_with("/fake/model")
+        self.assertEqual(mock_prepared.return_value, result)
+
+    def test_embedding_dimension(self):
+        embed_model = mock.Mock()
+        embed_model.get_text_embedding.return_value = [0.0, 0.0, 0.0]
+
+        self.assertEqual(3, embeddings.embedding_dimension(embed_model))
+
+    def test_embedding_dimension_prepared(self):
+        embed_model = mock.Mock(spec=embeddings.PreparedEmbedding)
+        embed_model.dimension = 768
+
+        self.assertEqual(768, embeddings.embedding_dimension(embed_model))
+        embed_model.get_text_embedding.assert_not_called()
+
+    def test_get_embedding_model_unknown(self):
+        self.assertRaises(RuntimeError, embeddings.get_embedding_model,
+                          "/fake/model", "nonexisting")
+
+    def test_check_embedding_parity(self):
+        reference = FakeBatchEmbedding([[1.0, 0.0], [0.0, 1.0]])
+        candidate = FakeBatchEmbedding([[1.0, 0.001], [0.0, 1.0]])
+
+        result = embeddings.check_embedding_parity(
+            reference, candidate, 0.001, texts=["a", "b"])
+
+        self.assertLess(result, 0.001)
+
+    def test_check_embedding_parity_above_tolerance(self):
+        reference = FakeBatchEmbedding([[1.0, 0.0]])
+        candidate = FakeBatchEmbedding([[1.0, 1.0]])
+
+        self.assertRaises(RuntimeError, embeddings.check_embedding_parity,
+                          reference, candidate, 0.001, texts=["a"])
@@ -0,0 +1,126 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+from unittest import mock
+
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+import numpy as np
+
+from lightspeed_rag_content import dimension_reduction
+from lightspeed_rag_content import federated
+
+
+def _results(*scores):
+    return [NodeWithScore(node=TextNode(text=f"Node {score}"), score=score)
+            for score in scores]
+
+
+class TestFederated(unittest.TestCase):
+
+    def _scores(self, results):
+        return [[node.score for node in nodes] for nodes in results]
+
+    def test_normalize_scores(self):
+        result = federated.normalize_scores(
+            [_results(0.9, 0.7, 0.5), _results(0.4, 0.2), []], [2.0, 0.5, 1.0],
+            "minmax")
+
+        np.testing.assert_allclose([2.0, 1.0, 0.0], self._scores(result)[0])
+        self.assertEqual([[0.5, 0.0], []], self._scores(result)[1:])
+
+        result = federated.normalize_scores(
+            [_results(0.9, 0.5)], [2.0], "none")
+
+        self.assertEqual([[1.8, 1.0]], self._scores(result))
+
+    def test_normalize_scores_single_result(self):
+        # Single results cannot be rescaled, the weighted scores are merged
+        result = federated.normalize_scores(
+            [_results(0.9, 0.5), _results(0.4)], [1.0, 0.5], "minmax")
+
+        self.assertEqual([[0.9, 0.5], [0.2]], self._scores(result))
+
+    def test_retriever_top_k_1(self):
+        docs = mock.Mock()
+        docs.retrieve.return_value = _results(0.3)
+        runbooks = mock.Mock()
+        runbooks.retrieve.return_value = _results(0.8)
+        retriever = federated.FederatedRetriever(
+            [federated.FederatedIndex("docs", docs, 1.0, None),
+             federated.FederatedIndex("runbooks", runbooks, 1.0, None)],
+            mock.Mock(), similarity_top_k=1)
+
+        result = retriever.retrieve(QueryBundle("fake query", embedding=[1.0]))
+        retriever.close()
+
+        self.assertEqual(["Node 0.8"], [node.node.text for node in result])
+        self.assertEqual(0.8, result[0].score)
+
+    def test_retriever(self):
+        embed_model = mock.Mock()
+        embed_model.get_query_embedding.return_value = [1.0, 0.0, 0.0]
+        docs = mock.Mock()
+        docs.retrieve.return_value = _results(0.9, 0.5)
+        runbooks = mock.Mock()
+        runbooks.retrieve.return_value = _results(0.3, 0.2)
+        transform = dimension_reduction.fit_transform(
+            "matryoshka", np.eye(3, dtype=np.float32), 2)
+        retriever = federated.FederatedRetriever(
+            [federated.FederatedIndex("docs", docs, 1.0, None),
+             federated.FederatedIndex("runbooks", runbooks, 0.5, transform)],
+            embed_model, similarity_top_k=3)
+
+        result = retriever.retrieve("fake query")
+
+        embed_model.get_query_embedding.assert_called_once_with("fake query")
+        self.assertEqual(["Node 0.9", "Node 0.3", "Node 0.5"],
+                         [node.node.text for node in result])
+        self.assertEqual([1.0, 0.5, 0.0], [node.score for node in result])
+        self.assertEqual([1.0, 0.0, 0.0],
+                         docs.retrieve.call_args[0][0].embedding)
+        self.assertEqual([1.0, 0.0],
+                         runbooks.retrieve.call_args[0][0].embedding)
+
+    def test_retriever_embedded_query(self):
+        embed_model = mock.Mock()
+        docs = mock.Mock()
+        docs.retrieve.return_value = _results(0.9)
+        retriever = federated.FederatedRetriever(
+            [federated.FederatedIndex("docs", docs, 1.0, None)],
+            embed_model, similarity_top_k=3)
+
+        retriever.retrieve(QueryBundle("fake query", embedding=[1.0]))
+
+        embed_model.get_query_embedding.assert_not_called()
+
+    def test_invalid_normalization(self):
+        self.assertRaises(RuntimeError, federated.FederatedRetriever, [],
+                          mock.Mock(), 1, "nonexisting")
+
+    @mock.patch.object(federated.dimension_reduction, "load_transform")
+    @mock.patch.object(federated, "load_index")
+    def test_federated_index(self, mock_load_index, mock_load_transform):
+        result = federated.federated_index("docs", "/fake/path", "fake-index",
+                                           4, 0.5)
+
+        mock_load_index.assert_called_once_with("/fake/path", "fake-index")
+        mock_load_index.return_value.as_retriever.assert_called_once_with(
+            similarity_top_k=4)
+        self.assertEqual(
+            federated.FederatedIndex(
+                "docs", mock_load_index.return_value.as_retriever.return_value,
+                0.5, mock_load_transform.return_value),
+            result)
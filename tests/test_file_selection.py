@@ -0,0 +1,126 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+import unittest
+
+from lightspeed_rag_content import file_selection
+
+TOPIC_MAP = """---
+Name: About
+Dir: welcome
+Distros: openshift-enterprise,openshift-origin
+Topics:
+- Name: Welcome
+  File: index
+- Name: OKE
+  File: oke_about
+  Distros: openshift-origin
+---
+Name: Installing
+Dir: installing
+Distros: openshift-enterprise
+Topics:
+- Name: Overview
+  Dir: overview
+  Topics:
+  - Name: Overview
+    File: index
+- Name: Large
+  File: large
+- Name: Excluded
+  File: excluded
+- Name: Missing
+  File: missing
+---
+Name: Dedicated
+Dir: dedicated
+Distros: openshift-dedicated
+Topics:
+- Name: Index
+  File: index
+"""
+
+
+class TestFileSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.docs_dir = os.path.join(self.tmp_dir.name, "docs")
+        files = {"welcome/index.txt": "Welcome",
+                 "welcome/oke_about.txt": "OKE",
+                 "installing/overview/index.txt": "Overview",
+                 "installing/large.txt": "x" * 100,
+                 "installing/excluded.txt": "Excluded",
+                 "installing/stale.txt": "Stale"}
+        for path, content in files.items():
+            path = os.path.join(self.docs_dir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(content)
+        self.topic_map = os.path.join(self.tmp_dir.name, "_topic_map.yml")
+        with open(self.topic_map, "w") as file:
+            file.write(TOPIC_MAP)
+
+    def _path(self, path):
+        return os.path.join(self.docs_dir, path)
+
+    def test_topic_map_files(self):
+        self.assertEqual(
+            ["welcome/index", "installing/overview/index",
+             "installing/large", "installing/excluded", "installing/missing"],
+            file_selection.topic_map_files(self.topic_map))
+        self.assertEqual(
+            ["welcome/index", "welcome/oke_about"],
+            file_selection.topic_map_files(self.topic_map,
+                                           "openshift-origin"))
+
+    def test_read_exclude_file(self):
+        path = os.path.join(self.tmp_dir.name, "exclude.conf")
+        with open(path, "w") as file:
+            file.write("# Comment\nwelcome/oke_about.txt\n\n  rel*/*.txt\n")
+
+        self.assertEqual(["welcome/oke_about.txt", "rel*/*.txt"],
+                         file_selection.read_exclude_file(path))
+
+    def test_select_topic_map(self):
+        selector = file_selection.FileSelector(
+            file_selection.topic_map_files(self.topic_map),
+            exclude=["installing/excl*"], max_size=50)
+
+        selected, stats = selector.select(self.docs_dir)
+
+        self.assertEqual([self._path("installing/overview/index.txt"),
+                          self._path("welcome/index.txt")], selected)
+        self.assertEqual({"candidates": 5, "selected": 2, "excluded": 1,
+                          "missing": 1, "too-large": 1}, stats)
+
+    def test_select_directory(self):
+        selector = file_selection.FileSelector(exclude=["welcome/*"])
+
+        selected, stats = selector.select(self.docs_dir, [".txt"])
+
+        self.assertEqual([self._path("installing/excluded.txt"),
+                          self._path("installing/large.txt"),
+                          self._path("installing/overview/index.txt"),
+                          self._path("installing/stale.txt")], selected)
+        self.assertEqual({"candidates": 6, "selected": 4, "excluded": 2,
+                          "missing": 0, "too-large": 0}, stats)
+
+        selected, stats = selector.select(self.docs_dir, [".md"])
+
+        self.assertEqual([], selected)
@@ -101,3 +101,43 @@ class TestMetadataProcessor(unittest.TestCase):
         expected_result = {"docs_url": self.url, "title": self.title}
         self.assertEqual(expected_result, result)
         self.assertIn("URL not reachable", log.output[0])
+
+    @mock.patch.object(metadata_processor.MetadataProcessor, "ping_url")
+    @mock.patch.object(metadata_processor.MetadataProcessor, "get_file_title")
+    @mock.patch.object(metadata_processor.MetadataProcessor, "url_function")
+    def test_populate_progress(
+            self, mock_url_func, mock_get_title, mock_ping_url):
+        mock_url_func.return_value = self.url
+        mock_ping_url.side_effect = [True, False]
+        self.md_processor.progress = mock.Mock()
+
+        self.md_processor.populate("/fake/a")
+        with self.assertLogs("lightspeed_rag_content.metadata_processor",
+                             level="WARNING"):
+            self.md_processor.populate("/fake/b")
+
+        self.md_processor.progress.add.assert_has_calls([
+            mock.call("urls-checked"), mock.call("urls-checked"),
+            mock.call("urls-unreachable")])
+
+    @mock.patch.object(metadata_processor.MetadataProcessor, "_populate")
+    def test_prefetch(self, mock_populate):
+        mock_populate.side_effect = lambda path: {"title": path}
+
+        self.md_processor.prefetch(["/fake/a", "/fake/b"])
+
+        self.assertEqual(2, mock_populate.call_count)
+        mock_populate.reset_mock()
+        # populate() must not compute the prefetched metadata again
+        self.assertEqual({"title": "/fake/a"},
+                         self.md_processor.populate("/fake/a"))
+        mock_populate.assert_not_called()
+
+    @mock.patch.object(metadata_processor.MetadataProcessor, "_populate")
+    def test_populate_not_prefetched(self, mock_populate):
+        self.md_processor.prefetch(["/fake/a"])
+
+        result = self.md_processor.populate("/fake/b")
+
+        self.assertEqual(mock_populate.return_value, result)
+        mock_populate.assert_called_with("/fake/b")
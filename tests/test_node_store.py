@@ -0,0 +1,97 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import Document, ImageNode, TextNode
+import numpy as np
+
+from lightspeed_rag_content.node_store import NodeStore
+
+
+def _nodes():
+    docs = [Document(text=f"Sentence {i} of the document. " * 60,
+                     metadata={"title": f"Doc {i}", "docs_url": f"url{i}"},
+                     excluded_embed_metadata_keys=["docs_url"])
+            for i in range(2)]
+    docs.append(Document(text="Unicode tëxt, ✓. " * 20))
+    return SentenceSplitter(chunk_size=64, chunk_overlap=0
+                            ).get_nodes_from_documents(docs)
+
+
+class TestNodeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes = _nodes()
+        self.store = NodeStore()
+        self.store.extend(self.nodes)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.nodes), len(self.store))
+        self.assertEqual([node.dict() for node in self.nodes],
+                         [node.dict() for node in self.store])
+        self.assertEqual(self.nodes[3].hash, self.store[3].hash)
+        self.assertRaises(IndexError, self.store.__getitem__, len(self.nodes))
+
+    def test_shared_attributes(self):
+        # The attributes of the nodes of a document are stored once
+        self.assertEqual(3, len(self.store._shared.values))
+
+        node = self.store[0]
+        node.metadata["title"] = "Modified"
+
+        self.assertEqual("Doc 0", self.store[0].metadata["title"])
+
+    def test_set_metadata(self):
+        position = self.store.position(self.nodes[1].node_id)
+
+        self.store.set_metadata(position, {"title": "New"})
+
+        self.assertEqual({"title": "New"}, self.store[position].metadata)
+        self.assertEqual(["docs_url"],
+                         self.store[position].excluded_embed_metadata_keys)
+        self.assertEqual(self.nodes[0].metadata, self.store[0].metadata)
+
+    def test_embeddings(self):
+        self.assertFalse(self.store.is_embedded(0))
+        self.assertIsNone(self.store[0].embedding)
+        self.assertRaises(RuntimeError, self.store.embeddings)
+
+        for position in range(len(self.store)):
+            self.store.set_embedding(position, [float(position), 0.5])
+
+        self.assertEqual([1.0, 0.5], self.store[1].embedding)
+        self.assertEqual((len(self.nodes), 2), self.store.embeddings().shape)
+
+        self.store.set_embeddings(np.ones((len(self.nodes), 1)))
+
+        self.assertEqual([1.0], self.store[2].embedding)
+        self.assertRaises(RuntimeError, self.store.set_embeddings,
+                          np.ones((1, 1)))
+
+    def test_append_embedded(self):
+        store = NodeStore()
+        for i in range(5):
+            store.append(TextNode(id_=str(i), text=f"Node {i}",
+                                  embedding=[float(i)]))
+
+        np.testing.assert_array_equal([[0.0], [1.0], [2.0], [3.0], [4.0]],
+                                      store.embeddings())
+
+    def test_append_invalid(self):
+        self.assertRaises(RuntimeError, self.store.append, self.nodes[0])
+        self.assertRaises(RuntimeError, self.store.append,
+                          ImageNode(text="Image"))
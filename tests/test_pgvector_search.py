@@ -0,0 +1,141 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import unittest
+from unittest import mock
+
+from llama_index.core.schema import QueryBundle, TextNode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+
+from lightspeed_rag_content import pgvector_search
+
+
+class TestPgVectorSearch(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(pgvector_search.pg_pool,
+                                    "ThreadedConnectionPool")
+        self.mock_pool = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.conn = self.mock_pool.return_value.getconn.return_value
+        self.cursor = self.conn.cursor.return_value.__enter__.return_value
+        self.search = pgvector_search.PgVectorSearch(
+            "ocp_docs", pool_size=2, ef_search=40, host="localhost")
+
+    def _statements(self):
+        return [str(call.args[0]) for call in self.cursor.execute.mock_calls]
+
+    def test_connection_params(self):
+        with mock.patch.dict(os.environ, {"POSTGRES_HOST": "db",
+                                          "POSTGRES_PORT": "5432"}):
+            params = pgvector_search.connection_params()
+
+        self.assertEqual("db", params["host"])
+        self.assertEqual("5432", params["port"])
+        self.mock_pool.assert_called_once_with(1, 2, host="localhost")
+
+    def test_data_table_name(self):
+        search = pgvector_search.PgVectorSearch("OCP_Docs_4_15")
+
+        self.assertEqual("data_ocp_docs_4_15", search.table_name)
+        self.assertEqual("data_ocp_docs_4_15",
+                         pgvector_search.data_table_name("OCP_Docs_4_15"))
+
+    def test_search(self):
+        node = TextNode(id_="node-1", text="", metadata={"title": "Doc"})
+        metadata = node_to_metadata_dict(node, remove_text=True)
+        self.cursor.fetchall.return_value = [
+            ("node-1", "Some text", metadata, 0.9),
+            ("node-2", "Other text", {"title": "Plain"}, 0.5)]
+
+        result = self.search.search([0.5, 1.0], 2, probes=3)
+
+        self.assertEqual(["node-1", "node-2"],
+                         [n.node.node_id for n in result])
+        self.assertEqual(["Some text", "Other text"],
+                         [n.node.text for n in result])
+        self.assertEqual({"title": "Doc"}, result[0].node.metadata)
+        self.assertEqual([0.9, 0.5], [n.score for n in result])
+        self.cursor.execute.assert_any_call(
+            "SET LOCAL hnsw.ef_search = %s", (40,))
+        self.cursor.execute.assert_any_call(
+            "SET LOCAL ivfflat.probes = %s", (3,))
+        self.assertEqual(("[0.5,1.0]", 2),
+                         self.cursor.execute.mock_calls[-1].args[1])
+        self.mock_pool.return_value.putconn.assert_called_once_with(
+            self.conn)
+
+        # The statements are prepared once per connection
+        self.search.search([0.5, 1.0], 2)
+
+        statements = self._statements()
+        self.assertEqual(2, sum("PREPARE" in s for s in statements))
+        self.assertEqual(2, sum("EXECUTE" in s for s in statements))
+
+    def test_search_batch(self):
+        self.cursor.fetchall.return_value = [
+            (1, "node-1", "First", {}, 0.9),
+            (1, "node-2", "Second", {}, 0.8),
+            (3, "node-3", "Third", {}, 0.7)]
+
+        result = self.search.search_batch([[1.0], [0.0], [0.5]], 2)
+
+        self.assertEqual([["node-1", "node-2"], [], ["node-3"]],
+                         [[n.node.node_id for n in nodes] for nodes in result])
+        self.assertEqual(('{"[1.0]","[0.0]","[0.5]"}', 2),
+                         self.cursor.execute.mock_calls[-1].args[1])
+        self.assertEqual([], self.search.search_batch([], 2))
+
+    def test_search_error(self):
+        self.cursor.fetchall.side_effect = RuntimeError("connection lost")
+
+        self.assertRaises(RuntimeError, self.search.search, [1.0], 1)
+        self.conn.rollback.assert_called_once_with()
+        self.mock_pool.return_value.putconn.assert_called_once_with(
+            self.conn)
+
+    def test_create_index(self):
+        self.search.create_index("hnsw")
+
+        self.assertIn("USING", self._statements()[0])
+        self.conn.commit.assert_called_once_with()
+        self.assertRaises(RuntimeError, self.search.create_index, "ivfpq")
+
+    def test_dimension(self):
+        self.cursor.fetchone.return_value = (384,)
+
+        self.assertEqual(384, self.search.dimension())
+        self.assertIn("vector_dims", self._statements()[0])
+
+        self.cursor.fetchone.return_value = None
+
+        self.assertIsNone(self.search.dimension())
+        self.mock_pool.return_value.putconn.assert_called_with(self.conn)
+
+    def test_retriever(self):
+        embed_model = mock.Mock()
+        embed_model.get_query_embedding.return_value = [1.0, 0.0]
+        search = mock.Mock()
+        search.search.return_value = []
+        retriever = pgvector_search.PgVectorRetriever(search, embed_model, 3)
+
+        self.assertEqual([], retriever.retrieve("query"))
+        search.search.assert_called_once_with([1.0, 0.0], 3)
+
+        retriever.retrieve(QueryBundle("query", embedding=[0.0, 1.0]))
+
+        search.search.assert_called_with([0.0, 1.0], 3)
+        embed_model.get_query_embedding.assert_called_once_with("query")
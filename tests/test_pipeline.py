@@ -0,0 +1,74 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from lightspeed_rag_content import pipeline
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_run(self):
+        stages = [
+            pipeline.Stage("double", lambda x: [x, x], workers=3),
+            pipeline.Stage("add", lambda x: [x + 1]),
+        ]
+
+        result = pipeline.Pipeline(stages, queue_size=2).run(range(10))
+
+        self.assertEqual(sorted([x + 1 for x in range(10)] * 2),
+                         sorted(result))
+
+    def test_run_batches(self):
+        batches = []
+
+        def collect(items):
+            batches.append(list(items))
+            return items
+
+        stages = [pipeline.Stage("collect", collect, batch_size=4)]
+
+        result = pipeline.Pipeline(stages).run(range(10))
+
+        self.assertEqual(list(range(10)), result)
+        self.assertEqual([4, 4, 2], [len(batch) for batch in batches])
+
+    def test_run_error(self):
+        def fail(item):
+            if item == 5:
+                raise ValueError("boom")
+            return [item]
+
+        stages = [pipeline.Stage("fail", fail, workers=2),
+                  pipeline.Stage("identity", lambda x: [x])]
+
+        self.assertRaises(ValueError, pipeline.Pipeline(stages).run,
+                          range(1000))
+
+    def test_metrics(self):
+        stages = [pipeline.Stage("identity", lambda x: [x]),
+                  pipeline.Stage("drop", lambda x: [], workers=2)]
+        pipe = pipeline.Pipeline(stages)
+
+        pipe.run(range(5))
+        result = pipe.metrics()
+
+        self.assertEqual(["identity", "drop"],
+                         [stage["stage"] for stage in result])
+        self.assertEqual([5, 5], [stage["processed"] for stage in result])
+        self.assertEqual(2, result[1]["workers"])
+        for stage in result:
+            self.assertGreaterEqual(stage["queue-depth-max"],
+                                    stage["queue-depth-mean"])
@@ -0,0 +1,145 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from safetensors.torch import save_file
+import torch
+import transformers
+
+from lightspeed_rag_content import prepared_model
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "pod", "network",
+         "cluster", "install"]
+
+
+# Modules of a sentence-transformers model are recognized by class name
+class Transformer(object):
+    pass
+
+
+class Pooling(object):
+
+    def __init__(self, pooling_mode):
+        self.pooling_mode = pooling_mode
+
+
+class Normalize(object):
+    pass
+
+
+class TestPreparedModel(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.model_dir = self.tmp_dir.name
+        vocab_file = os.path.join(self.model_dir, "vocab.txt")
+        with open(vocab_file, "w") as file:
+            file.write("\n".join(VOCAB))
+
+        torch.manual_seed(0)
+        self.model = transformers.BertModel(transformers.BertConfig(
+            vocab_size=len(VOCAB), hidden_size=8, num_hidden_layers=1,
+            num_attention_heads=2, intermediate_size=16,
+            max_position_embeddings=32)).eval()
+        self.tokenizer = transformers.BertTokenizerFast(vocab_file)
+
+    def _st_model(self, pooling="mean", modules=None):
+        transformer = Transformer()
+        transformer.auto_model = self.model
+        transformer.tokenizer = self.tokenizer
+        st_model = mock.MagicMock()
+        modules = modules or [transformer, Pooling(pooling), Normalize()]
+        st_model.__iter__.side_effect = lambda: iter(modules)
+        st_model.__getitem__.side_effect = modules.__getitem__
+        st_model.encode.return_value = [0.0] * 8
+        st_model.max_seq_length = 16
+        return st_model
+
+    def _prepare(self, **kwargs):
+        with mock.patch("sentence_transformers.SentenceTransformer",
+                        return_value=self._st_model(**kwargs)):
+            return prepared_model.prepare_model(self.model_dir)
+
+    def _expected(self, texts):
+        encoded = self.tokenizer(texts, padding=True, return_tensors="pt")
+        with torch.inference_mode():
+            tokens = self.model(**encoded)[0]
+        mask = encoded["attention_mask"].unsqueeze(-1).float()
+        return torch.nn.functional.normalize(
+            (tokens * mask).sum(dim=1) / mask.sum(dim=1), dim=1)
+
+    def test_prepare_model(self):
+        result = self._prepare()
+
+        self.assertEqual("BertModel", result["model-class"])
+        self.assertEqual("BertTokenizerFast", result["tokenizer-class"])
+        self.assertEqual(8, result["dimension"])
+        self.assertEqual(16, result["max-length"])
+        self.assertEqual("mean", result["pooling"])
+        with open(os.path.join(self.model_dir, "prepared",
+                               "prepared.json")) as file:
+            self.assertEqual(result, json.load(file))
+
+    def test_prepare_model_unsupported_pooling(self):
+        self.assertRaises(RuntimeError, self._prepare, pooling="max")
+
+    def test_prepare_model_unsupported_module(self):
+        self.assertRaises(RuntimeError, self._prepare,
+                          modules=[Transformer(), Pooling("mean"), object()])
+
+    def test_map_weights(self):
+        path = os.path.join(self.model_dir, "weights.safetensors")
+        tensors = {"a": torch.arange(6, dtype=torch.float32).reshape(2, 3),
+                   "b": torch.tensor([1, 2], dtype=torch.int64),
+                   "empty": torch.zeros(0)}
+        save_file(tensors, path)
+
+        result = prepared_model.map_weights(path)
+
+        self.assertEqual(set(tensors), set(result))
+        for name, tensor in tensors.items():
+            torch.testing.assert_close(tensor, result[name])
+
+    def test_embed(self):
+        self._prepare()
+
+        model = prepared_model.PreparedEmbedding(self.model_dir)
+        result = model.get_text_embedding_batch(
+            ["pod network", "install cluster pod"])
+
+        self.assertEqual(8, model.dimension)
+        torch.testing.assert_close(
+            self._expected(["pod network", "install cluster pod"]),
+            torch.tensor(result))
+        # Non-persistent buffers are loaded too
+        torch.testing.assert_close(self.model.embeddings.position_ids,
+                                   model._model.embeddings.position_ids)
+
+    def test_load_model_missing_tensor(self):
+        settings = self._prepare()
+        settings["aliases"] = {"pooler.dense.weight": "missing"}
+
+        self.assertRaises(RuntimeError, prepared_model.load_model,
+                          self.model_dir, settings)
+
+    def test_read_settings_missing(self):
+        self.assertRaises(RuntimeError, prepared_model.read_settings,
+                          self.model_dir)
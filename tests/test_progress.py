@@ -0,0 +1,119 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lightspeed_rag_content import progress
+
+
+class TestProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "progress")
+
+    def test_disabled(self):
+        result = progress.Progress()
+
+        result.add("files-loaded")
+        result.add_total("files-loaded", 10)
+        result.finish()
+
+        self.assertFalse(result.enabled)
+        self.assertEqual(0, result.snapshot()["counters"]["files-loaded"][
+            "count"])
+
+    def test_invalid_format(self):
+        self.assertRaises(RuntimeError, progress.Progress, self.path, "csv")
+
+    @mock.patch.object(progress.time, "monotonic")
+    def test_snapshot(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        result = progress.Progress(self.path, interval=60.0)
+        result.add_total("nodes-embedded", 100)
+        result.add("nodes-embedded", 0)
+        mock_monotonic.return_value = 110.0
+        result.add("nodes-embedded", 20)
+
+        status = result.snapshot()
+
+        embedded = status["counters"]["nodes-embedded"]
+        self.assertEqual(20, embedded["count"])
+        self.assertEqual(100, embedded["total"])
+        self.assertEqual(2.0, embedded["rate"])
+        self.assertEqual(40.0, status["eta-seconds"])
+        self.assertEqual(10.0, status["elapsed-seconds"])
+        self.assertEqual("running", status["state"])
+        # Not written before the interval
+        self.assertFalse(os.path.exists(self.path))
+
+    @mock.patch.object(progress.time, "monotonic")
+    def test_add_writes_after_interval(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        result = progress.Progress(self.path, interval=5.0)
+        mock_monotonic.return_value = 106.0
+
+        result.add("files-loaded", 3)
+
+        with open(self.path) as file:
+            status = json.load(file)
+        self.assertEqual(3, status["counters"]["files-loaded"]["count"])
+        self.assertEqual([], [name for name in os.listdir(self.tmp_dir.name)
+                              if name != "progress"])
+
+    def test_finish(self):
+        result = progress.Progress(self.path)
+        result.add("urls-checked", 2)
+
+        result.finish()
+
+        with open(self.path) as file:
+            status = json.load(file)
+        self.assertEqual("done", status["state"])
+        self.assertEqual(0.0, status["eta-seconds"])
+        self.assertEqual(2, status["counters"]["urls-checked"]["count"])
+
+    @mock.patch.object(progress, "rss_bytes", return_value=4096)
+    def test_finish_prometheus(self, mock_rss):
+        result = progress.Progress(self.path, "prometheus")
+        result.add_total("nodes-split", 8)
+        result.add("nodes-split", 4)
+
+        result.finish()
+
+        with open(self.path) as file:
+            lines = file.read().splitlines()
+        self.assertIn("lightspeed_build_done 1.0", lines)
+        self.assertIn("lightspeed_build_rss_bytes 4096.0", lines)
+        self.assertIn("lightspeed_build_nodes_split_total 4.0", lines)
+        self.assertIn("lightspeed_build_nodes_split_expected 8.0", lines)
+        self.assertIn("# TYPE lightspeed_build_nodes_split_total counter",
+                      lines)
+        # Counters without a total have no expected value
+        self.assertFalse(any(line.startswith(
+            "lightspeed_build_files_loaded_expected") for line in lines))
+
+    def test_rss_bytes(self):
+        result = progress.rss_bytes()
+
+        if os.path.exists("/proc/self/statm"):
+            self.assertGreater(result, 0)
+        else:
+            self.assertIsNone(result)
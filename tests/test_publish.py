@@ -0,0 +1,167 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lightspeed_rag_content import publish
+from lightspeed_rag_content.checkpoint import CHECKPOINT_DIR
+
+
+def _read(version_dir):
+    with open(os.path.join(version_dir, "index.json")) as file:
+        return file.read()
+
+
+class TestPublish(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.output_dir = os.path.join(self.tmp_dir.name, "index")
+
+    def _build(self, content):
+        staging = publish.prepare_staging(self.output_dir)
+        with open(os.path.join(staging, "index.json"), "w") as file:
+            file.write(content)
+        return staging
+
+    def _publish(self, content, keep_versions=publish.KEEP_VERSIONS):
+        return publish.publish(self._build(content), self.output_dir,
+                               keep_versions)
+
+    def test_prepare_staging(self):
+        staging = self._build("old")
+        os.makedirs(os.path.join(staging, CHECKPOINT_DIR))
+
+        self.assertEqual(staging, publish.prepare_staging(self.output_dir))
+        self.assertEqual([CHECKPOINT_DIR], os.listdir(staging))
+
+    def test_verify(self):
+        staging = self._build("index")
+        manifest = publish.write_manifest(staging)
+
+        self.assertEqual(manifest, publish.verify(staging))
+        self.assertEqual(manifest, publish.write_manifest(staging))
+
+        with open(os.path.join(staging, "index.json"), "w") as file:
+            file.write("modified")
+        self.assertRaises(RuntimeError, publish.verify, staging)
+
+    def test_publish(self):
+        version_dir = self._publish("v1")
+
+        self.assertTrue(os.path.islink(self.output_dir))
+        self.assertEqual(os.path.realpath(version_dir),
+                         os.path.realpath(self.output_dir))
+        self.assertEqual("v1", _read(self.output_dir))
+        self.assertFalse(os.path.isabs(os.readlink(self.output_dir)))
+        self.assertFalse(os.path.exists(
+            os.path.join(publish.versions_dir(self.output_dir),
+                         publish.STAGING_DIR)))
+
+        # An identical build keeps its version
+        self.assertEqual(version_dir, self._publish("v1"))
+
+        self._publish("v2")
+        self.assertEqual("v2", _read(self.output_dir))
+        self.assertEqual("v1", _read(version_dir))
+
+    def test_publish_directory(self):
+        os.makedirs(self.output_dir)
+
+        self.assertRaises(RuntimeError, self._publish, "v1")
+
+    def test_prune(self):
+        versions = []
+        for i in range(4):
+            versions.append(self._publish(f"v{i}", keep_versions=2))
+            # Make sure the versions have distinct modification times
+            os.utime(versions[-1], (i, i))
+
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in versions[2:]),
+            sorted(os.listdir(publish.versions_dir(self.output_dir))))
+
+
+class TestReloadingIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.output_dir = os.path.join(self.tmp_dir.name, "index")
+        self.load = mock.Mock(side_effect=_read)
+
+    def _publish(self, content):
+        staging = publish.prepare_staging(self.output_dir)
+        with open(os.path.join(staging, "index.json"), "w") as file:
+            file.write(content)
+        return publish.publish(staging, self.output_dir)
+
+    def test_reload(self):
+        self._publish("v1")
+        index = publish.ReloadingIndex(self.output_dir, self.load,
+                                       check_interval=0)
+
+        self.assertEqual("v1", index.get())
+        self.assertEqual("v1", index.get())
+        self.load.assert_called_once()
+
+        version_dir = self._publish("v2")
+
+        self.assertEqual("v2", index.get())
+        self.assertEqual(os.path.realpath(version_dir), index.version_dir)
+        self.assertEqual(2, self.load.call_count)
+
+    def test_reload_check_interval(self):
+        self._publish("v1")
+        index = publish.ReloadingIndex(self.output_dir, self.load,
+                                       check_interval=3600)
+        self._publish("v2")
+
+        self.assertEqual("v1", index.get())
+        self.assertTrue(index.check())
+        self.assertEqual("v2", index.get())
+
+    def test_reload_failure(self):
+        self._publish("v1")
+        index = publish.ReloadingIndex(self.output_dir, self.load,
+                                       check_interval=0)
+        version_dir = self._publish("v2")
+        with open(os.path.join(version_dir, "index.json"), "w") as file:
+            file.write("corrupted")
+
+        self.assertFalse(index.check())
+        self.assertEqual("v1", index.get())
+        # The manifest check failed, the version is not loaded nor retried
+        self.load.assert_called_once()
+
+    def test_reload_release_first(self):
+        self._publish("v1")
+        index = publish.ReloadingIndex(self.output_dir, self.load,
+                                       check_interval=0, release_first=True)
+        self._publish("v2")
+        self.load.side_effect = [RuntimeError("out of memory"), "v1"]
+
+        # The released index is loaded again
+        self.assertFalse(index.check())
+        self.assertEqual("v1", index.get())
+        self.assertEqual(3, self.load.call_count)
+
+    def test_initial_load_failure(self):
+        self.assertRaises(OSError, publish.ReloadingIndex,
+                          self.output_dir, self.load)
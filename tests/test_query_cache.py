@@ -0,0 +1,159 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+from lightspeed_rag_content import query_cache
+from lightspeed_rag_content import versions
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "cache", "cache.json")
+
+    def test_get_put(self):
+        cache = query_cache.LRUCache(2)
+        cache.put("a", 1)
+
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(
+            {"size": 1, "hits": 1, "misses": 1, "hit-rate": 0.5},
+            cache.stats())
+
+    def test_eviction(self):
+        cache = query_cache.LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        # "a" becomes the most recently used entry, "b" gets evicted
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+
+    def test_save_and_load(self):
+        cache = query_cache.LRUCache(2, self.path)
+        cache.put("a", [0.5, 0.25])
+        cache.put("b", [1.0])
+        cache.save()
+
+        result = query_cache.LRUCache(1, self.path)
+
+        # Only the most recently used entry fits in the smaller cache
+        self.assertEqual(1, len(result))
+        self.assertEqual([1.0], result.get("b"))
+
+    def test_stats_empty(self):
+        cache = query_cache.LRUCache(2)
+
+        self.assertEqual(0.0, cache.stats()["hit-rate"])
+
+
+class TestCachedQueryEmbedding(unittest.TestCase):
+
+    def test_get_query_embedding(self):
+        embed_model = MockEmbedding(embed_dim=2)
+        cache = query_cache.LRUCache(10)
+        cached_model = query_cache.CachedQueryEmbedding(embed_model, cache)
+
+        with mock.patch.object(MockEmbedding, "get_query_embedding",
+                               return_value=[1.0, 0.0]) as mock_embed:
+            first = cached_model.get_query_embedding("fake query")
+            second = cached_model.get_query_embedding("fake query")
+
+        self.assertEqual([1.0, 0.0], first)
+        self.assertEqual(first, second)
+        mock_embed.assert_called_once_with("fake query")
+        self.assertEqual(1, cache.hits)
+
+    def test_get_query_embedding_backends(self):
+        embed_model = MockEmbedding(embed_dim=2)
+        cache = query_cache.LRUCache(10)
+        torch_model = query_cache.CachedQueryEmbedding(embed_model, cache)
+        onnx_model = query_cache.CachedQueryEmbedding(
+            embed_model, cache, "onnx", "model_qint8.onnx")
+
+        with mock.patch.object(MockEmbedding, "get_query_embedding",
+                               side_effect=[[1.0, 0.0], [0.0, 1.0]]):
+            torch_embedding = torch_model.get_query_embedding("fake query")
+            onnx_embedding = onnx_model.get_query_embedding("fake query")
+
+        self.assertEqual([1.0, 0.0], torch_embedding)
+        self.assertEqual([0.0, 1.0], onnx_embedding)
+        self.assertEqual(2, len(cache))
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_index_fingerprint(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            empty = query_cache.index_fingerprint(persist_dir)
+            with open(os.path.join(persist_dir, "index_store.json"),
+                      "w") as file:
+                file.write("{}")
+
+            result = query_cache.index_fingerprint(persist_dir)
+
+        self.assertNotEqual(empty, result)
+
+    def test_result_cache_key(self):
+        self.assertNotEqual(
+            query_cache.result_cache_key("index", "hash", "query", 1),
+            query_cache.result_cache_key("index", "hash", "query", 2))
+
+    def test_search_key(self):
+        self.assertEqual("float", query_cache.search_key("float"))
+        self.assertEqual("binary:4", query_cache.search_key("binary", 4))
+        self.assertNotEqual(
+            query_cache.result_cache_key(
+                "index", "hash", "query", 1,
+                query_cache.search_key("binary", 4)),
+            query_cache.result_cache_key(
+                "index", "hash", "query", 1,
+                query_cache.search_key("binary", 8)))
+
+    def test_cached_retrieve(self):
+        node = TextNode(id_="node-0", text="Shared")
+        versions.tag_node(node, "4.15", "https://4.15/a")
+        versions.tag_node(node, "4.16", "https://4.16/a")
+        retriever = mock.Mock()
+        retriever.retrieve.return_value = [NodeWithScore(node=node, score=0.5)]
+        docstore = mock.Mock()
+        docstore.get_node.side_effect = lambda node_id: node.copy(deep=True)
+        cache = query_cache.LRUCache(10)
+        query_bundle = QueryBundle("fake query")
+
+        first = query_cache.cached_retrieve(
+            retriever, query_bundle, docstore, cache, "key", "4.16")
+        second = query_cache.cached_retrieve(
+            retriever, query_bundle, docstore, cache, "key", "4.16")
+
+        retriever.retrieve.assert_called_once_with(query_bundle)
+        self.assertEqual("node-0", first[0].node.node_id)
+        self.assertEqual("node-0", second[0].node.node_id)
+        self.assertEqual(0.5, second[0].score)
+        self.assertEqual("https://4.16/a", second[0].node.metadata["docs_url"])
@@ -0,0 +1,111 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from llama_index.core.schema import TextNode
+import numpy as np
+
+from lightspeed_rag_content import benchmark
+from lightspeed_rag_content import sweep
+from lightspeed_rag_content.document_processor import DocumentProcessor
+
+
+class TestEmbeddingCache(unittest.TestCase):
+
+    def test_embed(self):
+        embed_model = mock.Mock(embed_batch_size=2)
+        embed_model.get_text_embedding_batch.side_effect = (
+            lambda texts: [[float(len(text))] for text in texts])
+        cache = sweep.EmbeddingCache(embed_model)
+
+        result, reused = cache.embed(
+            [TextNode(text="a"), TextNode(text="bb"), TextNode(text="a")])
+        result_again, reused_again = cache.embed(
+            [TextNode(text="bb"), TextNode(text="ccc")])
+
+        np.testing.assert_array_equal([[1.0], [2.0], [1.0]], result)
+        self.assertEqual(1, reused)
+        np.testing.assert_array_equal([[2.0], [3.0]], result_again)
+        self.assertEqual(1, reused_again)
+        embed_model.get_text_embedding_batch.assert_has_calls(
+            [mock.call(["a", "bb"]), mock.call(["ccc"])])
+
+
+class TestBuildIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.standard_normal((40, 16)).astype(np.float32)
+        self.embeddings /= np.linalg.norm(self.embeddings, axis=1,
+                                          keepdims=True)
+
+    def test_parse_index_type(self):
+        self.assertEqual(("flat", 0), sweep.parse_index_type("flat"))
+        self.assertEqual(("pca", 8), sweep.parse_index_type("pca:8"))
+        for index_type in ["hnsw", "pca", "flat:8"]:
+            self.assertRaises(RuntimeError, sweep.parse_index_type,
+                              index_type)
+
+    def test_build_index(self):
+        for index_type in ["flat", "binary", "pca:8", "matryoshka:8"]:
+            search, size = sweep.build_index(index_type, self.embeddings)
+
+            result = search(self.embeddings[:3], 2)
+
+            self.assertEqual((3, 2), result.shape)
+            self.assertGreater(size, 0)
+            if index_type == "flat":
+                np.testing.assert_array_equal([0, 1, 2], result[:, 0])
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_run(self):
+        embed_model = benchmark.StubEmbedding(embed_dim=8)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            corpus = benchmark.generate_corpus(tmp_dir, num_files=4,
+                                               num_runbooks=0, depth=0)
+            processor = DocumentProcessor(380, 0, "stub", "",
+                                          embed_model=embed_model)
+            metadata = benchmark.BenchmarkMetadata(corpus["docs-dir"])
+            metadata.ping_url = mock.Mock(return_value=True)
+            fake_sweep = sweep.Sweep(
+                processor, [{"query": "fake query",
+                             "expected": ["doc2.txt"]}], top_k=1)
+            fake_sweep.add_documents(corpus["docs-dir"], metadata)
+
+        # Query with the embedding of the document, with the stub model
+        # only identical texts are similar
+        node = [node for node in fake_sweep._split(4096, 0)
+                if processor.doc_path(node.ref_doc_id) == "doc2.txt"][0]
+        fake_sweep._query_embeddings = np.array(
+            [embed_model.get_text_embedding(node.get_content(
+                metadata_mode=sweep.MetadataMode.EMBED))], dtype=np.float32)
+        result = fake_sweep.run([(4096, 0), (8192, 0)], ["flat", "pca:2"])
+
+        self.assertEqual(4, metadata.ping_url.call_count)
+        self.assertEqual(
+            [(4096, "flat"), (4096, "pca:2"), (8192, "flat"), (8192, "pca:2")],
+            [(r["chunk-size"], r["index"]) for r in result])
+        self.assertEqual(4, result[0]["nodes"])
+        # Whole documents fit in a chunk, the second chunking reuses them
+        self.assertEqual(4, result[0]["reused-embeddings"]
+                         + result[2]["reused-embeddings"])
+        self.assertEqual(1.0, result[0]["recall@1"])
+        self.assertIn("latency-ms", result[0])
@@ -16,7 +16,9 @@
 import argparse
 
 import unittest
+from unittest import mock
 
+from lightspeed_rag_content import embeddings
 from lightspeed_rag_content import utils
 
 
@@ -26,3 +28,13 @@ class TestMetadataProcessor(unittest.TestCase):
         parser = utils.get_common_arg_parser()
 
         self.assertIsInstance(parser, argparse.ArgumentParser)
+
+    def test_get_common_arg_parser_embedding_backends(self):
+        parser = utils.get_common_arg_parser()
+
+        for backend in embeddings.EMBEDDING_BACKENDS:
+            args = parser.parse_args(["--embedding-backend", backend])
+            self.assertEqual(backend, args.embedding_backend)
+        with self.assertRaises(SystemExit), \
+                mock.patch("sys.stderr"):
+            parser.parse_args(["--embedding-backend", "unknown"])
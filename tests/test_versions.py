@@ -0,0 +1,100 @@
+# Copyright 2025 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+from unittest import mock
+
+import faiss
+from llama_index.core.schema import QueryBundle, TextNode
+import numpy as np
+
+from lightspeed_rag_content import versions
+
+
+class TestVersions(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes = {
+            "node-0": TextNode(id_="node-0", text="Runbook"),
+            "node-1": TextNode(id_="node-1", text="Shared"),
+            "node-2": TextNode(id_="node-2", text="Only in 4.16"),
+        }
+        versions.tag_node(self.nodes["node-1"], "4.15", "https://4.15/a")
+        versions.tag_node(self.nodes["node-1"], "4.16", "https://4.16/a")
+        versions.tag_node(self.nodes["node-2"], "4.16", "https://4.16/b")
+
+        self.vector_index = mock.Mock()
+        self.vector_index.index_struct.nodes_dict = {
+            str(i): f"node-{i}" for i in range(3)}
+        self.vector_index.docstore.get_node.side_effect = (
+            lambda node_id: self.nodes[node_id].copy(deep=True))
+        self.vector_index.docstore.get_nodes.side_effect = lambda ids: [
+            self.nodes[node_id].copy(deep=True) for node_id in ids]
+
+    def test_tag_node(self):
+        node = self.nodes["node-1"]
+        versions.tag_node(node, "4.15", "https://4.15/a")
+
+        self.assertEqual(["4.15", "4.16"], node.metadata["versions"])
+        self.assertEqual({"4.15": "https://4.15/a", "4.16": "https://4.16/a"},
+                         node.metadata["version_docs_urls"])
+
+    def test_exclude_version_metadata(self):
+        node = TextNode(text="Text", metadata={"docs_url": "https://a",
+                                               "title": "Title"})
+        versions.tag_node(node, "4.15", "https://a")
+
+        versions.exclude_version_metadata(node)
+        versions.exclude_version_metadata(node)
+
+        self.assertEqual("title: Title\n\nText",
+                         node.get_content(metadata_mode="embed"))
+        self.assertEqual(["versions", "version_docs_urls"],
+                         node.excluded_llm_metadata_keys)
+
+    def test_in_version(self):
+        self.assertTrue(versions.in_version(self.nodes["node-0"], "4.15"))
+        self.assertTrue(versions.in_version(self.nodes["node-1"], "4.15"))
+        self.assertFalse(versions.in_version(self.nodes["node-2"], "4.15"))
+
+    def test_use_version_url(self):
+        node = self.nodes["node-1"]
+
+        versions.use_version_url(node, "4.16")
+        versions.use_version_url(self.nodes["node-0"], "4.16")
+
+        self.assertEqual("https://4.16/a", node.metadata["docs_url"])
+        self.assertNotIn("docs_url", self.nodes["node-0"].metadata)
+
+    def test_version_ids(self):
+        np.testing.assert_array_equal(
+            [0, 1], versions.version_ids(self.vector_index, "4.15"))
+        np.testing.assert_array_equal(
+            [0, 1, 2], versions.version_ids(self.vector_index, "4.16"))
+
+    def test_retriever(self):
+        faiss_index = faiss.IndexFlatIP(3)
+        faiss_index.add(np.eye(3, dtype=np.float32))
+        self.vector_index.vector_store.client = faiss_index
+        retriever = versions.VersionFilteredRetriever(
+            self.vector_index, "4.15", similarity_top_k=3)
+
+        result = retriever.retrieve(QueryBundle(
+            "fake query", embedding=[0.1, 0.2, 0.9]))
+
+        self.assertEqual(["node-1", "node-0"],
+                         [n.node.node_id for n in result])
+        self.assertEqual("https://4.15/a", result[0].node.metadata["docs_url"])
+        self.assertNotIn("docs_url", result[1].node.metadata)